@@ -1,5 +1,6 @@
 import streamlit as st
 import streamlit as st
+from services.snapshot import session_snapshot
 
 st.set_page_config(
     page_title="Data App Olist Ecommerce",
@@ -9,6 +10,12 @@ st.set_page_config(
 st.title("📊 Aplicativo de Análise de Dados")
 st.sidebar.success("Selecione uma página acima.")
 
+# as páginas leem as versões da camada gold fixadas na sessão; o botão passa para a última geração publicada
+gold_path = "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold"
+refresh = st.sidebar.button("🔄 Atualizar dados")
+snapshot = session_snapshot(st.session_state, gold_path, refresh=refresh)
+st.sidebar.caption(f"Geração dos dados: {snapshot.id}")
+
 st.markdown(
     """
 
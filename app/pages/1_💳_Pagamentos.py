@@ -3,7 +3,14 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import duckdb
+import sys
+from pathlib import Path
+
+module_path = str(Path(__file__).parent.parent)
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+from services.snapshot import session_snapshot
 
 st.set_page_config(page_title="Pagamentos", page_icon="💳", layout="wide")
 
@@ -14,12 +21,12 @@ st.caption(
     """
 )
 
+# versões da camada gold fixadas na sessão: todas as consultas leem os mesmos dados, mesmo durante uma execução da pipeline
+snapshot = session_snapshot(st.session_state, "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold")
+
 # Função utilitária
 def execute_query(query: str) -> pd.DataFrame:
-    conn = duckdb.connect()
-    result = conn.sql(query).fetchdf()
-    conn.close()
-    return result
+    return snapshot.query(query)
 
 # ========= SEÇÂO PAGAMENTOS KPIS =========
 st.subheader("Pagamentos")
@@ -1,15 +1,23 @@
 import streamlit as st
-import duckdb
 import pandas as pd
 import plotly.express as px
-import datetime
+import sys
+from pathlib import Path
+
+module_path = str(Path(__file__).parent.parent)
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+from services.sales_cube import query_sales_cube
+from services.catalog import column_domain
+from services.snapshot import session_snapshot
+
+# versões da camada gold fixadas na sessão: todas as consultas leem os mesmos dados, mesmo durante uma execução da pipeline
+snapshot = session_snapshot(st.session_state, "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold")
 
 # Função utilitária
 def execute_query(query: str) -> pd.DataFrame:
-    conn = duckdb.connect()
-    result = conn.sql(query).fetchdf()
-    conn.close()
-    return result
+    return snapshot.query(query)
 
 # Layout e título
 st.set_page_config(page_title="Dashboard de Vendas", page_icon="💲", layout="wide")
@@ -20,59 +28,52 @@ st.sidebar.success("Selecione uma página acima.")
 # Filtros Globais
 # -----------------------
 
-# Datas padrão
-hoje = datetime.date.today()
-inicio_padrao = datetime.date(2016, 1, 1)
-fim_padrao = datetime.date(2025, 1, 31)
-
-# Filtro de data
-data_inicio, data_fim = st.date_input(
-    "📅 Intervalo de Datas",
-    (inicio_padrao, fim_padrao),
-    min_value=datetime.date(2016, 1, 1),
-    max_value=datetime.date(2025, 12, 31),
-    format="DD/MM/YYYY"
+# cubo de vendas pré-agregado (grão mensal): cada combinação de filtros lê apenas as linhas do seu grouping set
+cube_path = "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/sales_cube"
+# vendas diárias particionadas por mês: o filtro em order_purchase_month descarta as partições fora do intervalo
+daily_path = "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/sales_daily"
+
+# Filtro de período em meses completos: KPIs e ranking vêm do cubo mensal (pedidos distintos exatos
+# por mês), então o gráfico diário usa os mesmos meses
+meses_disponiveis = [mes for mes in column_domain(daily_path, "order_purchase_month", conn=snapshot) if mes]
+if not meses_disponiveis:
+    st.warning("Nenhuma venda encontrada.")
+    st.stop()
+meses = st.select_slider(
+    "📅 Intervalo de Meses",
+    options=meses_disponiveis,
+    value=(meses_disponiveis[0], meses_disponiveis[-1]),
+    help="Todos os indicadores consideram os meses completos do intervalo.",
 )
 
-# Consulta para pegar os dados com filtros aplicados
-query_geo = f"""
-    SELECT 
-        customer_city, 
-        customer_state, 
-        total_revenue, 
-        total_orders
-    FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/geo_sales')
-    LIMIT 10;
-"""
-geo_sales_df = execute_query(query_geo)
-
 # UF e Cidade dinâmicas
-ufs = ["Todos"] + sorted(geo_sales_df["customer_state"].unique())
+localidades_df = query_sales_cube(cube_path, group_by=["customer_state", "customer_city"], conn=snapshot)
+ufs = ["Todos"] + sorted(localidades_df["customer_state"].dropna().unique())
 uf_selecionada = st.selectbox("UF", ufs)
 
 if uf_selecionada != "Todos":
-    cidades = ["Todas"] + sorted(geo_sales_df[geo_sales_df["customer_state"] == uf_selecionada]["customer_city"].unique())
+    cidades = ["Todas"] + sorted(localidades_df[localidades_df["customer_state"] == uf_selecionada]["customer_city"].dropna().unique())
 else:
-    cidades = ["Todas"] + sorted(geo_sales_df["customer_city"].unique())
+    cidades = ["Todas"] + sorted(localidades_df["customer_city"].dropna().unique())
 
 cidade_selecionada = st.selectbox("Cidade", cidades)
 
 # -----------------------
-# Aplicação de filtros no DataFrame
+# Aplicação de filtros no cubo
 # -----------------------
-df_filtrado = geo_sales_df.copy()
-
-if uf_selecionada != "Todos":
-    df_filtrado = df_filtrado[df_filtrado["customer_state"] == uf_selecionada]
-
-if cidade_selecionada != "Todas":
-    df_filtrado = df_filtrado[df_filtrado["customer_city"] == cidade_selecionada]
+filtros = {
+    "customer_state": uf_selecionada if uf_selecionada != "Todos" else None,
+    "customer_city": cidade_selecionada if cidade_selecionada != "Todas" else None,
+}
+df_filtrado = query_sales_cube(cube_path, group_by=["customer_city", "customer_state"], filters=filtros, months=meses, conn=snapshot)
+df_filtrado = df_filtrado[["customer_city", "customer_state", "total_revenue", "total_orders"]]
 
 # -----------------------
 # KPIs
 # -----------------------
-receita_total = df_filtrado["total_revenue"].sum()
-qtd_total_pedidos = df_filtrado["total_orders"].sum()
+kpis = query_sales_cube(cube_path, filters=filtros, months=meses, conn=snapshot)
+receita_total = kpis["total_revenue"].fillna(0).iloc[0]
+qtd_total_pedidos = int(kpis["total_orders"].fillna(0).iloc[0])
 ticket_medio = receita_total / qtd_total_pedidos if qtd_total_pedidos else 0
 
 col1, col2, col3 = st.columns(3)
@@ -85,6 +86,36 @@ with col3:
 
 st.divider()
 
+# -----------------------
+# Gráfico: Receita Diária
+# -----------------------
+st.subheader("📈 Receita Diária")
+
+condicoes = ["order_purchase_month BETWEEN ? AND ?"]
+parametros = list(meses)
+for coluna, valor in filtros.items():
+    if valor:
+        condicoes.append(f"{coluna} = ?")
+        parametros.append(valor)
+
+diario_df = snapshot.query(f"""
+    SELECT order_purchase_date, SUM(total_revenue) AS total_revenue
+    FROM delta_scan('{daily_path}')
+    WHERE {' AND '.join(condicoes)}
+    GROUP BY order_purchase_date
+    ORDER BY order_purchase_date
+""", parametros)
+
+fig_diario = px.line(
+    diario_df.round(2),
+    x="order_purchase_date",
+    y="total_revenue",
+    title="Receita por Dia",
+    labels={"total_revenue": "Receita (R$)", "order_purchase_date": "Data"},
+)
+with st.container(border=True):
+    st.plotly_chart(fig_diario, use_container_width=True)
+
 # -----------------------
 # Tabela Ranking de Vendas
 # -----------------------
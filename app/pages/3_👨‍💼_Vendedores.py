@@ -1,19 +1,26 @@
 import streamlit as st
-import duckdb
 import pandas as pd
 import requests
 import json
 import plotly.express as px
 import plotly.graph_objects as go
 import altair as alt
+import sys
+from pathlib import Path
+
+module_path = str(Path(__file__).parent.parent)
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+from services.snapshot import session_snapshot
+
+# versões da camada gold fixadas na sessão: todas as consultas leem os mesmos dados, mesmo durante uma execução da pipeline
+snapshot = session_snapshot(st.session_state, "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold")
 
 
 # ---------- FUNÇÃO DE CONSULTA ----------
 def execute_query(query: str) -> pd.DataFrame:
-    conn = duckdb.connect()
-    result = conn.sql(query).fetchdf()
-    conn.close()
-    return result
+    return snapshot.query(query)
 
 def load_data():
     """Carrega todas as tabelas em um dicionário"""
@@ -1,16 +1,24 @@
 import streamlit as st
-import duckdb
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
+import sys
+from pathlib import Path
+
+module_path = str(Path(__file__).parent.parent)
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+from services.catalog import column_domain
+from services.snapshot import session_snapshot
+
+# versões da camada gold fixadas na sessão: todas as consultas leem os mesmos dados, mesmo durante uma execução da pipeline
+snapshot = session_snapshot(st.session_state, "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold")
 
 # Função utilitária
 def execute_query(query: str) -> pd.DataFrame:
-    conn = duckdb.connect()
-    result = conn.sql(query).fetchdf()
-    conn.close()
-    return result
+    return snapshot.query(query)
 
 # Layout e título
 st.set_page_config(page_title="Dashboard de Produtos", page_icon="🛒", layout="wide")
@@ -51,7 +59,7 @@ if 'first_load' not in st.session_state:
 top_n_categories = st.sidebar.slider("Mostrar Top N Categorias", min_value=5, max_value=20, value=10, step=1)
 
 # Filtro de categorias (agora permite múltipla seleção)
-all_categories = list(freight_analysis['product_category_name'].unique())
+all_categories = column_domain('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/freight_analysis', 'product_category_name', conn=snapshot)  # catálogo de estatísticas da pipeline
 default_categories = sorted(freight_analysis.groupby('product_category_name')['total_revenue'].sum().nlargest(3).index.tolist())
 
 # Opção para selecionar todas as categorias
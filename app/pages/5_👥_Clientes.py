@@ -1,39 +1,42 @@
 import streamlit as st
-import duckdb
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
+
+module_path = str(Path(__file__).parent.parent)
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+from services.geo_grid import GRID_LEVELS, GRID_MAP_ZOOM, query_geo_grid
+from services.sketches import query_distinct_counts
+from services.catalog import column_domain
+from services.snapshot import session_snapshot
+
+# versões da camada gold fixadas na sessão: todas as consultas leem os mesmos dados, mesmo durante uma execução da pipeline
+snapshot = session_snapshot(st.session_state, "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold")
 
 # Função utilitária
 def execute_query(query: str) -> pd.DataFrame:
-    conn = duckdb.connect()
-    result = conn.sql(query).fetchdf()
-    conn.close()
-    return result
+    return snapshot.query(query)
 
 # Layout e título
 st.set_page_config(page_title="Dashboard de Clientes", page_icon="👥", layout="wide")
 st.title("👥 Dashboard de Clientes")
 
+# grade espacial pré-agregada de clientes e vendedores (mapas)
+grid_path = "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/geo_grid"
+regional_path = "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/regional_demand_supply_balance"
+
 # Sidebar para filtros
 st.sidebar.header("Filtros")
 
-# Obter dados para filtros
-states_query = """
-SELECT DISTINCT customer_state 
-FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/regional_demand_supply_balance')
-ORDER BY customer_state
-"""
-states = execute_query(states_query)
-
-cities_query = """
-SELECT DISTINCT customer_city, customer_state
-FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/regional_demand_supply_balance')
-ORDER BY customer_state, customer_city
-"""
-cities = execute_query(cities_query)
+# Obter dados para filtros (catálogo de estatísticas gravado pela pipeline, sem ler a tabela)
+states = pd.DataFrame({"customer_state": column_domain(regional_path, "customer_state", conn=snapshot)})
+cities = pd.DataFrame(column_domain(regional_path, "customer_state", "customer_city", conn=snapshot), columns=["customer_state", "customer_city"])
 
 # Filtros
 selected_states = st.sidebar.multiselect(
@@ -83,6 +86,16 @@ if state_filter or city_filter:
     if city_filter:
         where_clause += f" AND {city_filter}" if state_filter else city_filter
 
+# clientes e vendedores distintos por estado juntando os sketches HLL dos CEPs
+# (a soma das contagens de cada CEP conta o mesmo cliente/vendedor várias vezes)
+distintos_por_estado = query_distinct_counts(
+    regional_path,
+    ["customers_sketch", "sellers_sketch"],
+    group_by=["customer_state"],
+    filters={"customer_state": selected_states, "customer_city": selected_cities},
+    conn=snapshot
+).set_index("customer_state").round().astype(int)
+
 # Principal - KPIs no topo em 4 colunas
 st.markdown("## 📊 Indicadores Principais")
 kpi_col1, kpi_col2, kpi_col3, kpi_col4 = st.columns(4)
@@ -136,13 +149,13 @@ with chart_col1:
     SELECT customer_state, 
            AVG(CAST(avg_latitude AS FLOAT)) as latitude,
            AVG(CAST(avg_longitude AS FLOAT)) as longitude,
-           ROUND(SUM(total_sales_value), 2) as total_sales,
-           SUM(total_customers) as customers_count
+           ROUND(SUM(total_sales_value), 2) as total_sales
     FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/regional_demand_supply_balance')
     {where_clause}
     GROUP BY customer_state
     """
     sales_by_state = execute_query(sales_by_state_query)
+    sales_by_state["customers_count"] = sales_by_state["customer_state"].map(distintos_por_estado["distinct_customers"]).fillna(0).astype(int)
     
     # Scatter map com interatividade
     fig_sales_map = px.scatter_mapbox(
@@ -212,14 +225,14 @@ with chart_col3:
     demand_supply_query = f"""
     SELECT customer_state, 
            ROUND(AVG(demand_supply_ratio), 2) as avg_ratio,
-           SUM(total_orders) as total_orders,
-           SUM(distinct_sellers) as total_sellers
+           SUM(total_orders) as total_orders
     FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/regional_demand_supply_balance')
     {where_clause}
     GROUP BY customer_state
     ORDER BY avg_ratio DESC
     """
     demand_supply = execute_query(demand_supply_query)
+    demand_supply["total_sellers"] = demand_supply["customer_state"].map(distintos_por_estado["distinct_sellers"]).fillna(0).astype(int)
     
     fig_demand = px.scatter(
         demand_supply,
@@ -337,87 +350,65 @@ with metrics_col1:
     )
     st.plotly_chart(fig_frequency, use_container_width=True)
 
-# Gráfico 7: Distribuição Geográfica dos Clientes Gold - COM ZOOM DINÂMICO
+# Gráfico 7: Distribuição Geográfica - grade espacial pré-agregada (toda a base, sem limite de pontos)
 with metrics_col2:
-    geo_gold_query = f"""
-    SELECT 
-        g.customer_id,
-        g.avg_latitude,
-        g.avg_longitude,
-        g.total_spent,
-        g.avg_ticket,
-        r.customer_city,
-        r.customer_state
-    FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/gold_customers_segmented') g
-    JOIN delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/regional_demand_supply_balance') r ON g.customer_cep = r.customer_cep
-    WHERE g.avg_latitude IS NOT NULL AND g.avg_longitude IS NOT NULL
-    {'' if not where_clause else where_clause.replace('WHERE', 'AND')}
-    LIMIT 500
-    """
-    geo_gold_data = execute_query(geo_gold_query)
-    
-    # Mapa interativo com zoom avançado
-    fig_geo = px.scatter_mapbox(
-        geo_gold_data,
-        lat="avg_latitude",
-        lon="avg_longitude",
-        color="avg_ticket",
-        size="total_spent",
-        hover_name="customer_id",
-        hover_data={
-            "customer_city": True, 
-            "customer_state": True, 
-            "total_spent": True, 
-            "avg_ticket": True,
-            "avg_latitude": False,
-            "avg_longitude": False
-        },
-        color_continuous_scale="Viridis",
-        size_max=15,
-        zoom=4,
-        mapbox_style="carto-positron",
-        title="Distribuição Geográfica dos Clientes Gold (Com Zoom Dinâmico)"
+    entidade = st.radio("Mapa de", ["Clientes", "Vendedores"], horizontal=True)
+    nivel = st.select_slider(
+        "Nível de detalhe do mapa",
+        options=list(GRID_LEVELS),
+        value=2,
+        format_func=lambda n: f"células de {GRID_LEVELS[n]:g}°"
     )
-    
-    # Habilitando zoom dinâmico e melhorando interatividade
-    fig_geo.update_layout(
-        margin={"r": 0, "t": 40, "l": 0, "b": 0},
-        mapbox=dict(
-            bearing=0,
-            pitch=0,
-            zoom=4,
-            center=dict(
-                lat=geo_gold_data["avg_latitude"].mean(),
-                lon=geo_gold_data["avg_longitude"].mean()
-            )
-        ),
-        # Adicionando controles de zoom
-        updatemenus=[
-            dict(
-                type = "buttons",
-                direction = "left",
-                buttons=[
-                    dict(
-                        args=[{"mapbox.zoom": 3}],
-                        label="Zoom Out",
-                        method="relayout"
-                    ),
-                    dict(
-                        args=[{"mapbox.zoom": 7}],
-                        label="Zoom In",
-                        method="relayout"
-                    )
-                ],
-                pad={"r": 10, "t": 10},
-                showactive=False,
-                x=0.1,
-                xanchor="left",
-                y=1.1,
-                yanchor="top"
-            )
-        ]
+    geo_grid_data = query_geo_grid(
+        grid_path,
+        entity="customer" if entidade == "Clientes" else "seller",
+        zoom_level=nivel,
+        filters={"state": selected_states, "city": selected_cities},
+        conn=snapshot
     )
-    st.plotly_chart(fig_geo, use_container_width=True)
+    geo_grid_data["avg_ticket"] = (geo_grid_data["total_revenue"] / geo_grid_data["total_orders"].where(geo_grid_data["total_orders"] > 0)).round(2)
+
+    if geo_grid_data.empty:
+        st.info("Nenhuma localização encontrada para os filtros selecionados.")
+    else:
+        fig_geo = px.scatter_mapbox(
+            geo_grid_data,
+            lat="center_latitude",
+            lon="center_longitude",
+            color="avg_ticket",
+            size="entity_count",
+            hover_data={
+                "entity_count": True,
+                "total_revenue": ":.2f",
+                "total_orders": True,
+                "avg_ticket": True,
+                "center_latitude": False,
+                "center_longitude": False
+            },
+            labels={
+                "entity_count": entidade,
+                "total_revenue": "Receita (R$)",
+                "total_orders": "Pedidos",
+                "avg_ticket": "Ticket Médio (R$)"
+            },
+            color_continuous_scale="Viridis",
+            size_max=25,
+            zoom=GRID_MAP_ZOOM[nivel],
+            mapbox_style="carto-positron",
+            title=f"Distribuição Geográfica dos {entidade}"
+        )
+        fig_geo.update_layout(
+            margin={"r": 0, "t": 40, "l": 0, "b": 0},
+            mapbox=dict(
+                bearing=0,
+                pitch=0,
+                center=dict(
+                    lat=geo_grid_data["center_latitude"].mean(),
+                    lon=geo_grid_data["center_longitude"].mean()
+                )
+            )
+        )
+        st.plotly_chart(fig_geo, use_container_width=True)
 
 # Tabela com principais informações regionais - ADICIONANDO RECURSOS INTERATIVOS
 st.markdown("## 📋 Detalhamento Regional")
@@ -426,10 +417,8 @@ regional_summary_query = f"""
 SELECT 
     customer_state as Estado,
     COUNT(DISTINCT customer_city) as Cidades,
-    SUM(total_customers) as TotalClientes,
     SUM(total_orders) as TotalPedidos,
     ROUND(SUM(total_sales_value), 2) as ReceitaTotal,
-    ROUND(SUM(total_orders) / SUM(total_customers), 2) as PedidosPorCliente,
     ROUND(SUM(total_sales_value) / SUM(total_orders), 2) as TicketMedio,
     ROUND(AVG(demand_supply_ratio), 2) as IndiceDemandaOferta
 FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/regional_demand_supply_balance')
@@ -438,6 +427,8 @@ GROUP BY customer_state
 ORDER BY ReceitaTotal DESC
 """
 regional_summary = execute_query(regional_summary_query)
+regional_summary.insert(2, "TotalClientes", regional_summary["Estado"].map(distintos_por_estado["distinct_customers"]).fillna(0).astype(int))
+regional_summary.insert(5, "PedidosPorCliente", (regional_summary["TotalPedidos"] / regional_summary["TotalClientes"].replace(0, np.nan)).round(2))
 
 formatted_values = [
     regional_summary[col] if col not in ["ReceitaTotal", "PedidosPorCliente", "TicketMedio", "IndiceDemandaOferta"]
@@ -1,17 +1,25 @@
 import streamlit as st
-import duckdb
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
 import calendar
 
+module_path = str(Path(__file__).parent.parent)
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+from services.catalog import column_domain, column_range
+from services.snapshot import session_snapshot
+
+# versões da camada gold fixadas na sessão: todas as consultas leem os mesmos dados, mesmo durante uma execução da pipeline
+snapshot = session_snapshot(st.session_state, "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold")
+
 # Função utilitária
 def execute_query(query: str) -> pd.DataFrame:
-    conn = duckdb.connect()
-    result = conn.sql(query).fetchdf()
-    conn.close()
-    return result
+    return snapshot.query(query)
 
 # Layout e título
 st.set_page_config(page_title="Dashboard Leads", page_icon="🤝", layout="wide")
@@ -20,16 +28,10 @@ st.title("🤝 Dashboard de Análise de Leads Qualificados")
 # Sidebar com filtros
 st.sidebar.header("Filtros")
 
-# Consulta para obter as datas mínima e máxima
-date_range = execute_query("""
-    SELECT 
-        MIN(first_contact_date) AS min_date,
-        MAX(first_contact_date) AS max_date
-    FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/gold_qualified_leads_priority')
-""")
+leads_path = "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/gold_qualified_leads_priority"
 
-min_date = pd.to_datetime(date_range['min_date'].iloc[0])
-max_date = pd.to_datetime(date_range['max_date'].iloc[0])
+# datas mínima e máxima do catálogo de estatísticas (log Delta), sem ler a tabela
+min_date, max_date = (pd.to_datetime(value) for value in column_range(leads_path, "first_contact_date", conn=snapshot))
 
 # Filtro de data
 start_date = st.sidebar.date_input(
@@ -46,11 +48,11 @@ end_date = st.sidebar.date_input(
 )
 
 # Filtro de origem
-origem_options = execute_query("SELECT DISTINCT came_from FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/gold_qualified_leads_priority')").came_from.tolist()
+origem_options = column_domain(leads_path, "came_from", conn=snapshot)
 origem_selected = st.sidebar.multiselect("Origem", origem_options, default=origem_options)
 
 # Filtro de prioridade
-prioridade_options = execute_query("SELECT DISTINCT priority FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/gold_qualified_leads_priority')").priority.tolist()
+prioridade_options = column_domain(leads_path, "priority", conn=snapshot)
 prioridade_selected = st.sidebar.multiselect("Prioridade", prioridade_options, default=prioridade_options)
 
 # Construir a condição WHERE para os filtros
@@ -1,17 +1,25 @@
 import streamlit as st
-import duckdb
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
+import sys
 from datetime import datetime
+from pathlib import Path
+
+module_path = str(Path(__file__).parent.parent)
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+from services.catalog import column_domain
+from services.snapshot import session_snapshot
+
+# versões da camada gold fixadas na sessão: todas as consultas leem os mesmos dados, mesmo durante uma execução da pipeline
+snapshot = session_snapshot(st.session_state, "/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold")
 
 # Função utilitária
 def execute_query(query: str) -> pd.DataFrame:
-    conn = duckdb.connect()
-    result = conn.sql(query).fetchdf()
-    conn.close()
-    return result
+    return snapshot.query(query)
 
 # Layout e título
 st.set_page_config(page_title="Dashboard Logística", page_icon="📦", layout="wide")
@@ -20,9 +28,9 @@ st.title("📦 Dashboard de Análise Logística")
 # Sidebar para filtros
 st.sidebar.header("Filtros")
 
-# Carregar dados das tabelas
+# Carregar dados das tabelas (o id do snapshot é a chave do cache: muda só com uma nova geração publicada)
 @st.cache_data
-def load_data():
+def load_data(snapshot_id: str):
     # Carregar dados da tabela freight_analysis
     freight_query = """
     SELECT * FROM delta_scan('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/freight_analysis');
@@ -38,23 +46,25 @@ def load_data():
     return freight_data, regional_data
 
 try:
-    freight_df, regional_df = load_data()
+    freight_df, regional_df = load_data(snapshot.id)
     
-    # Filtros
+    # Filtros (opções do catálogo de estatísticas gravado pela pipeline)
+    category_options = column_domain('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/freight_analysis', 'product_category_name', conn=snapshot)
     selected_categories = st.sidebar.multiselect(
         "Categoria de Produto",
-        options=freight_df['product_category_name'].unique(),
-        default=freight_df['product_category_name'].unique()[:3]
+        options=category_options,
+        default=category_options[:3]
     )
 except Exception as e:
     st.error(f"Erro ao carregar os dados: {e}")
     st.info("Verifique se as tabelas 'freight_analysis' e 'regional_demand_supply_balance' estão disponíveis no banco de dados.")
     st.stop()
 
+state_options = column_domain('/media/gabriel/HD_Storage/Engenharia_de_Dados/olist_data_project/delta_lake/gold/regional_demand_supply_balance', 'customer_state', conn=snapshot)
 selected_states = st.sidebar.multiselect(
     "Estado",
-    options=regional_df['customer_state'].unique(),
-    default=regional_df['customer_state'].unique()
+    options=state_options,
+    default=state_options
 )
 
 # Filtragem dos dados
@@ -0,0 +1,80 @@
+import os
+import json
+from services import database
+from services.snapshot import Snapshot
+
+# catálogo gravado pela pipeline em cada camada (pipelines/catalog.py)
+CATALOG_FILE = "_catalog.json"
+
+_catalogs = {}  # caminho do catálogo -> (mtime, conteúdo)
+
+
+def _catalog(table_path: str, conn=None) -> dict:
+    """Entrada da tabela no catálogo da camada ({} se não catalogada). O arquivo só é relido quando muda.
+
+    Com um Snapshot em `conn`, a entrada só vale se for da versão fixada na sessão (o catálogo guarda
+    apenas a última versão de cada tabela); caso contrário retorna {} e os dados vêm do snapshot.
+    """
+    table_path = table_path.rstrip("/")
+    catalog_path = os.path.join(os.path.dirname(table_path), CATALOG_FILE)
+    try:
+        mtime = os.stat(catalog_path).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _catalogs.get(catalog_path)
+    if cached is None or cached[0] != mtime:
+        with open(catalog_path, "r", encoding="utf-8") as file:
+            cached = (mtime, json.load(file))
+        _catalogs[catalog_path] = cached
+    entry = cached[1].get(os.path.basename(table_path), {})
+    if isinstance(conn, Snapshot) and entry and entry.get("version") != conn.version(table_path):
+        return {}
+    return entry
+
+
+def _execute(query: str, conn=None) -> list:
+    if conn is not None:
+        return conn.execute(query).fetchall()
+    return database.execute(query).fetchall()
+
+
+def table_stats(table_path: str, conn=None) -> dict:
+    """Estatísticas da tabela no catálogo: version, row_count, files, size_bytes, columns e domains.
+
+    {} se ausente ou, com um Snapshot em `conn`, se o catálogo não é da versão fixada.
+    """
+    return _catalog(table_path, conn)
+
+
+def column_domain(table_path: str, *columns: str, conn=None) -> list:
+    """Valores distintos ordenados de uma coluna (ou pares/tuplas de valores, com várias colunas).
+
+    Lidos do catálogo (domínios declarados com `-- @domains:` e colunas de partição); sem entrada
+    no catálogo (ou com catálogo de outra versão que a fixada no Snapshot), consulta a tabela.
+
+    Args:
+        table_path (str): Caminho da tabela Delta
+        columns (str): Uma ou mais colunas (ex.: 'customer_state', 'customer_city')
+        conn: Snapshot ou conexão DuckDB usada na consulta de fallback (cursor da instância compartilhada do dashboard se não informada)
+
+    Returns:
+        list: Valores (uma coluna) ou tuplas de valores (várias colunas)
+    """
+    values = _catalog(table_path, conn).get("domains", {}).get("+".join(columns))
+    if values is not None:
+        return values if len(columns) == 1 else [tuple(value) for value in values]
+
+    quoted = ", ".join(f'"{column}"' for column in columns)
+    rows = _execute(f"SELECT DISTINCT {quoted} FROM delta_scan('{table_path}') ORDER BY {quoted} NULLS LAST", conn)
+    return [row[0] for row in rows] if len(columns) == 1 else [tuple(row) for row in rows]
+
+
+def column_range(table_path: str, column: str, conn=None) -> tuple:
+    """(mínimo, máximo) da coluna a partir das estatísticas do log Delta; sem catálogo da versão lida, consulta a tabela.
+
+    Valores de data/hora e decimais vêm do catálogo como texto ISO / número em texto.
+    """
+    stats = _catalog(table_path, conn).get("columns", {}).get(column, {})
+    if stats.get("min") is not None and stats.get("max") is not None:
+        return stats["min"], stats["max"]
+    return tuple(_execute(f'SELECT MIN("{column}"), MAX("{column}") FROM delta_scan(\'{table_path}\')', conn)[0])
@@ -0,0 +1,78 @@
+import os
+import logging
+import tempfile
+import threading
+import duckdb
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# configuração da instância DuckDB compartilhada pelas páginas (uma por processo do Streamlit)
+DUCKDB_THREADS = int(os.getenv("DASHBOARD_DUCKDB_THREADS", os.cpu_count() or 1))
+DUCKDB_MEMORY_LIMIT = os.getenv("DASHBOARD_DUCKDB_MEMORY_LIMIT")  # ex.: "4GB"
+DUCKDB_TEMP_DIRECTORY = os.getenv("DASHBOARD_DUCKDB_TEMP_DIRECTORY", os.path.join(tempfile.gettempdir(), "olist_dashboard_duckdb"))
+DUCKDB_EXTENSIONS = ("delta",)
+
+_lock = threading.Lock()
+_local = threading.local()
+_database = None
+
+
+def _load_extension(conn, extension: str):
+    try:
+        conn.execute(f"LOAD {extension}")
+    except duckdb.Error:
+        try:
+            conn.execute(f"INSTALL {extension}")
+            conn.execute(f"LOAD {extension}")
+        except duckdb.Error as e:
+            logger.warning(f"Extensão DuckDB '{extension}' indisponível: {str(e)}")
+
+
+def database() -> duckdb.DuckDBPyConnection:
+    """Instância DuckDB do processo, criada na primeira consulta com as extensões já carregadas."""
+    global _database
+    with _lock:
+        if _database is None:
+            conn = duckdb.connect()
+            conn.execute(f"SET threads = {DUCKDB_THREADS}")
+            if DUCKDB_MEMORY_LIMIT:
+                conn.execute(f"SET memory_limit = '{DUCKDB_MEMORY_LIMIT}'")
+            # operadores que excedem o memory_limit gravam no disco em vez de falhar
+            os.makedirs(DUCKDB_TEMP_DIRECTORY, exist_ok=True)
+            conn.execute(f"SET temp_directory = '{DUCKDB_TEMP_DIRECTORY}'")
+            for extension in DUCKDB_EXTENSIONS:
+                _load_extension(conn, extension)
+            _database = conn
+        return _database
+
+
+def cursor() -> duckdb.DuckDBPyConnection:
+    """Cursor da thread atual sobre a instância do processo (cada sessão do Streamlit roda em sua thread).
+
+    O resultado de uma consulta vale até a próxima consulta da mesma thread: busque-o (fetchdf,
+    fetchall...) antes de executar outra.
+    """
+    conn = getattr(_local, "cursor", None)
+    if conn is None:
+        conn = database().cursor()
+        _local.cursor = conn
+    return conn
+
+
+def register(name: str, relation):
+    """Registra um objeto Arrow/DataFrame no cursor da thread (não repete o registro do mesmo objeto)."""
+    registered = _local.__dict__.setdefault("registered", {})
+    if registered.get(name) is not relation:
+        cursor().register(name, relation)
+        registered[name] = relation
+
+
+def execute(query: str, params: list | None = None):
+    """Executa a query no cursor da thread e retorna o resultado DuckDB."""
+    conn = cursor()
+    return conn.execute(query, params) if params is not None else conn.execute(query)
+
+
+def query(query: str, params: list | None = None) -> pd.DataFrame:
+    return execute(query, params).fetchdf()
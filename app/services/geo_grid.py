@@ -0,0 +1,67 @@
+import pandas as pd
+from services.database import execute
+
+# níveis da grade do modelo pipelines/models/gold/geo_grid.sql: tamanho da célula em graus
+GRID_LEVELS = {0: 4.0, 1: 1.0, 2: 0.25, 3: 0.0625}
+# zoom do mapa (mapbox) a partir do qual cada nível é usado
+GRID_MAP_ZOOM = {0: 3, 1: 5, 2: 7, 3: 9}
+GRID_ENTITIES = ("customer", "seller")
+
+
+def grid_level(map_zoom: float) -> int:
+    """Nível da grade adequado ao zoom do mapa: o mais detalhado cujo zoom mínimo foi atingido."""
+    return max((level for level, zoom in GRID_MAP_ZOOM.items() if map_zoom >= zoom), default=0)
+
+
+def query_geo_grid(grid_path: str, entity: str = "customer", zoom_level: int = 0, filters: dict | None = None, bounds: tuple | None = None, conn=None) -> pd.DataFrame:
+    """Células pré-agregadas da grade espacial para o nível de zoom, filtros e área visível do mapa.
+
+    Args:
+        grid_path (str): Caminho da tabela Delta gold/geo_grid
+        entity (str): 'customer' ou 'seller'
+        zoom_level (int): Nível da grade (ver GRID_LEVELS)
+        filters (dict): {'state' | 'city': valor ou lista de valores}; valores vazios/None são ignorados
+        bounds (tuple): Área visível (lat_min, lng_min, lat_max, lng_max); None retorna todas as células
+        conn: Conexão DuckDB (cursor da instância compartilhada do dashboard se não informada)
+
+    Returns:
+        DataFrame: Uma linha por célula com o centro, entity_count, total_revenue e total_orders
+    """
+    if entity not in GRID_ENTITIES:
+        raise ValueError(f"Entidade inexistente na grade: {entity}")
+    if zoom_level not in GRID_LEVELS:
+        raise ValueError(f"Nível de zoom inexistente na grade: {zoom_level}")
+
+    where, params = ["entity = ?", "zoom_level = ?"], [entity, zoom_level]
+    for column, value in (filters or {}).items():
+        if column not in ("state", "city"):
+            raise ValueError(f"Filtro inexistente na grade: {column}")
+        if value in (None, "", [], ()):
+            continue
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        where.append(f"{column} IN ({', '.join('?' for _ in values)})")
+        params += values
+    if bounds:
+        where.append("center_latitude BETWEEN ? AND ? AND center_longitude BETWEEN ? AND ?")
+        lat_min, lng_min, lat_max, lng_max = bounds
+        params += [lat_min, lat_max, lng_min, lng_max]
+
+    # uma célula pode ter linhas de várias UFs/cidades: soma as linhas que passaram nos filtros
+    # (clientes com mais de um endereço contam uma vez em cada célula/cidade onde aparecem)
+    query = f"""
+        SELECT
+            cell_row,
+            cell_col,
+            ANY_VALUE(center_latitude) AS center_latitude,
+            ANY_VALUE(center_longitude) AS center_longitude,
+            SUM(entity_count) AS entity_count,
+            SUM(total_revenue) AS total_revenue,
+            SUM(total_orders) AS total_orders
+        FROM delta_scan('{grid_path}')
+        WHERE {' AND '.join(where)}
+        GROUP BY cell_row, cell_col
+    """
+
+    if conn is not None:
+        return conn.execute(query, params).fetchdf()
+    return execute(query, params).fetchdf()
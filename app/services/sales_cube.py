@@ -0,0 +1,73 @@
+import pandas as pd
+from services.database import execute
+
+# dimensões e grouping sets do modelo pipelines/models/gold/sales_cube.sql
+CUBE_DIMENSIONS = ("customer_state", "customer_city", "product_category", "order_purchase_month")
+CUBE_MEASURES = ("total_revenue", "total_freight", "total_items", "total_orders", "total_customers")
+CUBE_GRAINS = {
+    (),
+    ("customer_state",),
+    ("customer_state", "customer_city"),
+    ("product_category",),
+    ("order_purchase_month",),
+    ("customer_state", "product_category"),
+    ("customer_state", "order_purchase_month"),
+    ("customer_state", "customer_city", "order_purchase_month"),
+    ("product_category", "order_purchase_month"),
+    ("customer_state", "product_category", "order_purchase_month"),
+}
+
+
+def cube_grain(dimensions) -> tuple:
+    """Dimensões na ordem do cubo; cidade sempre junto da UF (há cidades homônimas em UFs diferentes)."""
+    dimensions = set(dimensions)
+    unknown = dimensions - set(CUBE_DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Dimensões inexistentes no cubo: {', '.join(sorted(unknown))}")
+    if "customer_city" in dimensions:
+        dimensions.add("customer_state")
+    grain = tuple(dimension for dimension in CUBE_DIMENSIONS if dimension in dimensions)
+    if grain not in CUBE_GRAINS:
+        raise ValueError(f"Combinação não disponível no cubo: {', '.join(grain)}")
+    return grain
+
+
+def query_sales_cube(cube_path: str, group_by: list | None = None, filters: dict | None = None, months: tuple | None = None, conn=None) -> pd.DataFrame:
+    """Responde uma combinação de filtros do dashboard a partir das linhas pré-agregadas do cubo de vendas.
+
+    Lê apenas as linhas do grouping set que contém as dimensões agrupadas e filtradas.
+    Receita, frete e itens podem ser somados entre linhas; pedidos e clientes são exatos
+    quando cada dimensão filtrada tem um único valor e podem contar o mesmo pedido/cliente
+    mais de uma vez ao somar várias categorias ou meses.
+
+    Args:
+        cube_path (str): Caminho da tabela Delta gold/sales_cube
+        group_by (list): Dimensões do resultado (ex.: ["customer_state"]); vazio retorna uma única linha
+        filters (dict): {dimensão: valor ou lista de valores}; valores vazios/None são ignorados
+        months (tuple): Intervalo (primeiro, último) de meses no formato 'YYYY-MM'
+        conn: Conexão DuckDB (cursor da instância compartilhada do dashboard se não informada)
+
+    Returns:
+        DataFrame: Dimensões de group_by + medidas do cubo
+    """
+    group_by = list(group_by or [])
+    filters = {dimension: value for dimension, value in (filters or {}).items() if value not in (None, "", [], ())}
+    grain = cube_grain(set(group_by) | set(filters) | ({"order_purchase_month"} if months else set()))
+
+    where, params = ["grain = ?"], [",".join(grain)]
+    for dimension, value in filters.items():
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        where.append(f"{dimension} IN ({', '.join('?' for _ in values)})")
+        params += values
+    if months:
+        where.append("order_purchase_month BETWEEN ? AND ?")
+        params += list(months)
+
+    measures = ", ".join(f"SUM({measure}) AS {measure}" for measure in CUBE_MEASURES)
+    query = f"SELECT {', '.join(group_by + [measures])} FROM delta_scan('{cube_path}') WHERE {' AND '.join(where)}"
+    if group_by:
+        query += f" GROUP BY {', '.join(group_by)}"
+
+    if conn is not None:
+        return conn.execute(query, params).fetchdf()
+    return execute(query, params).fetchdf()
@@ -0,0 +1,85 @@
+import pandas as pd
+from services.database import execute
+
+# sketches HLL gravados na gold (pipelines/sketches.py): lista de registradores índice * 64 + rho
+HLL_PRECISION = 12
+HLL_REGISTERS = 2 ** HLL_PRECISION
+HLL_ALPHA = 0.7213 / (1 + 1.079 / HLL_REGISTERS)
+
+
+def _estimate_sql() -> str:
+    """Estimativa HyperLogLog sobre os registradores juntados (contagem linear quando há muitos registradores vazios)."""
+    raw = f"CAST({HLL_ALPHA * HLL_REGISTERS ** 2} AS DOUBLE) / (SUM(pow(2, -rho)) + {HLL_REGISTERS} - COUNT(*))"
+    empty = f"({HLL_REGISTERS} - COUNT(*))"
+    return f"""
+        CASE
+            WHEN {raw} <= 2.5 * {HLL_REGISTERS} AND {empty} > 0 THEN {HLL_REGISTERS} * ln({HLL_REGISTERS} / {empty})
+            ELSE {raw}
+        END
+    """
+
+
+def query_distinct_counts(table_path: str, sketches: list, group_by: list | None = None, filters: dict | None = None, conn=None) -> pd.DataFrame:
+    """Contagens distintas aproximadas juntando os sketches das linhas de cada grupo.
+
+    Ao contrário da soma das contagens distintas de cada linha, um cliente/vendedor presente
+    em vários CEPs da mesma UF conta uma única vez (erro padrão ~1,6%).
+
+    Args:
+        table_path (str): Caminho da tabela Delta gold com as colunas de sketch (ex.: regional_demand_supply_balance)
+        sketches (list): Colunas de sketch (ex.: ["customers_sketch", "sellers_sketch"])
+        group_by (list): Colunas do resultado (ex.: ["customer_state"]); vazio retorna uma única linha
+        filters (dict): {coluna: valor ou lista de valores}; valores vazios/None são ignorados
+        conn: Conexão DuckDB (cursor da instância compartilhada do dashboard se não informada)
+
+    Returns:
+        DataFrame: Colunas de group_by + distinct_<nome> para cada sketch (customers_sketch -> distinct_customers)
+    """
+    group_by = list(group_by or [])
+    where, params = [], []
+    for column, value in (filters or {}).items():
+        if value in (None, "", [], ()):
+            continue
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        where.append(f"{column} IN ({', '.join('?' for _ in values)})")
+        params += values
+
+    keys = ", ".join(group_by + ["sketch"])
+    registers = " UNION ALL ".join(
+        f"SELECT {', '.join(group_by + [f'{sketch!r} AS sketch'])}, UNNEST({sketch}) AS register FROM filtered"
+        for sketch in sketches
+    )
+    columns = ", ".join(
+        [f"g.{column}" for column in group_by]
+        + [f"COALESCE(MAX(e.estimate) FILTER (WHERE e.sketch = {sketch!r}), 0) AS distinct_{sketch.removesuffix('_sketch')}" for sketch in sketches]
+    )
+    # grupos sem nenhum valor (sketches vazios) também aparecem no resultado, com contagem 0
+    join = " AND ".join(f"g.{column} IS NOT DISTINCT FROM e.{column}" for column in group_by) or "TRUE"
+    query = f"""
+        WITH filtered AS (
+            SELECT * FROM delta_scan('{table_path}') {'WHERE ' + ' AND '.join(where) if where else ''}
+        ),
+        registers AS (
+            -- junta os sketches: maior rho de cada registrador (sketches gravados como [NULL] não contam)
+            SELECT {keys}, register // 64 AS register_index, MAX(register % 64) AS rho
+            FROM ({registers})
+            WHERE register IS NOT NULL
+            GROUP BY ALL
+        ),
+        estimates AS (
+            SELECT {keys}, {_estimate_sql()} AS estimate
+            FROM registers
+            GROUP BY {keys}
+        ),
+        groups AS (
+            {f"SELECT DISTINCT {', '.join(group_by)} FROM filtered" if group_by else 'SELECT 1 AS total'}
+        )
+        SELECT {columns}
+        FROM groups g
+        LEFT JOIN estimates e ON {join}
+        {'GROUP BY ' + ', '.join(f'g.{column}' for column in group_by) if group_by else ''}
+    """
+
+    if conn is not None:
+        return conn.execute(query, params).fetchdf()
+    return execute(query, params).fetchdf()
@@ -0,0 +1,120 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+from deltalake import DeltaTable
+from services import database
+
+# geração publicada pela pipeline ao fim da camada gold (pipelines/snapshot.py)
+SNAPSHOT_FILE = "_snapshot.json"
+SESSION_KEY = "gold_snapshot"
+
+DELTA_SCAN_PATTERN = re.compile(r"delta_scan\(\s*'([^']+)'\s*\)")
+
+# datasets Arrow por (tabela, versão), compartilhados entre sessões e gerações (o log é lido uma vez por versão)
+MAX_DATASETS = 64
+_datasets = OrderedDict()
+_snapshots = {}  # geração -> Snapshot
+_lock = threading.Lock()
+
+
+def _dataset(table_path: str, version: int):
+    key = (table_path, version)
+    with _lock:
+        if key in _datasets:
+            _datasets.move_to_end(key)
+            return _datasets[key]
+    dataset = DeltaTable(table_path, version=version).to_pyarrow_dataset()
+    with _lock:
+        _datasets[key] = dataset
+        while len(_datasets) > MAX_DATASETS:
+            _datasets.popitem(last=False)
+    return dataset
+
+
+class Snapshot:
+    """Conjunto fixo de versões das tabelas gold lido por todas as consultas de uma sessão.
+
+    As consultas usam delta_scan('<gold>/<tabela>') como antes; as tabelas da camada são lidas na
+    versão fixada (time travel), então uma execução da pipeline em andamento não altera a sessão.
+    `id` identifica as versões e serve de chave de cache (ex.: argumento de funções @st.cache_data).
+    Pode ser passado como `conn` para os serviços (query_sales_cube, query_geo_grid, ...).
+    """
+
+    def __init__(self, gold_path: str, versions: dict, generation: str | None = None):
+        self.gold_path = os.path.normpath(gold_path)
+        self.versions = dict(versions)
+        self.generation = generation
+        self.id = generation or hashlib.sha256(json.dumps(self.versions, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def _table(self, path: str) -> str | None:
+        path = os.path.normpath(path)
+        if os.path.dirname(path) == self.gold_path and os.path.basename(path) in self.versions:
+            return os.path.basename(path)
+        return None
+
+    def version(self, table_path: str) -> int | None:
+        """Versão fixada da tabela (None se não pertence à camada gold do snapshot)."""
+        table = self._table(table_path)
+        return self.versions[table] if table is not None else None
+
+    def execute(self, query: str, params: list | None = None):
+        """Executa a query com as tabelas gold nas versões fixadas e retorna o resultado DuckDB (fetchdf, fetchall...).
+
+        O resultado vale até a próxima consulta da mesma thread (ver services.database.cursor).
+        """
+        relations = {}
+        for path in dict.fromkeys(DELTA_SCAN_PATTERN.findall(query)):
+            table = self._table(path)
+            if table is None:
+                continue  # fora da camada gold: lida na versão atual
+            name = f"snapshot__{table}"
+            # registrado no cursor da thread (instância compartilhada): visível só para esta sessão
+            database.register(name, _dataset(os.path.join(self.gold_path, table), self.versions[table]))
+            relations[path] = name
+        query = DELTA_SCAN_PATTERN.sub(lambda match: relations.get(match.group(1), match.group(0)), query)
+        return database.execute(query, params)
+
+    def query(self, query: str, params: list | None = None) -> pd.DataFrame:
+        return self.execute(query, params).fetchdf()
+
+
+def latest_snapshot(gold_path: str) -> Snapshot:
+    """Última geração publicada pela pipeline; sem publicação, as versões atuais de todas as tabelas da camada."""
+    snapshot_path = os.path.join(gold_path, SNAPSHOT_FILE)
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, "r", encoding="utf-8") as file:
+            published = json.load(file)
+        with _lock:
+            key = (os.path.normpath(gold_path), published["generation"])
+            if key not in _snapshots:
+                _snapshots[key] = Snapshot(gold_path, published["tables"], published["generation"])
+            return _snapshots[key]
+
+    versions = {}
+    for name in sorted(os.listdir(gold_path)):
+        table_path = os.path.join(gold_path, name)
+        if os.path.isdir(table_path) and DeltaTable.is_deltatable(table_path):
+            versions[name] = DeltaTable(table_path).version()
+    return Snapshot(gold_path, versions)
+
+
+def session_snapshot(session_state, gold_path: str, refresh: bool = False) -> Snapshot:
+    """Snapshot fixado na sessão do usuário (st.session_state): todas as páginas e reruns leem as mesmas versões.
+
+    Args:
+        session_state: Estado da sessão (st.session_state ou dict)
+        gold_path (str): Diretório da camada gold
+        refresh (bool): Passa a ler a última geração publicada
+
+    Returns:
+        Snapshot: Versões fixadas da sessão
+    """
+    snapshot = session_state.get(SESSION_KEY)
+    if refresh or snapshot is None or snapshot.gold_path != os.path.normpath(gold_path):
+        snapshot = latest_snapshot(gold_path)
+        session_state[SESSION_KEY] = snapshot
+    return snapshot
@@ -0,0 +1,185 @@
+import os
+import time
+import shutil
+import logging
+import argparse
+import statistics
+import threading
+import duckdb
+import psutil
+import pandas as pd
+from deltalake import DeltaTable
+from synthetic_data import generate_dataset
+from workflows import OlistPipeline, Config
+
+# Configuração do logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+MODELS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "models"))
+
+# consultas representativas das páginas do dashboard ({gold} = caminho da camada gold)
+DASHBOARD_QUERIES = {
+    "vendas_geo_sales": """
+        SELECT customer_city, customer_state, total_revenue, total_orders
+        FROM delta_scan('{gold}geo_sales')
+        WHERE customer_state = 'SP'
+    """,
+    "vendas_sales_by_category": """
+        SELECT product_category, total_revenue, total_quantity_sold, average_price_per_item
+        FROM delta_scan('{gold}sales_by_category')
+        ORDER BY total_revenue DESC
+        LIMIT 10
+    """,
+    "pagamentos_top_method": """
+        SELECT payment_type, total_orders,
+               total_orders * 100.0 / (SELECT SUM(total_orders) FROM delta_scan('{gold}gold_payment_performance')) AS percentage
+        FROM delta_scan('{gold}gold_payment_performance')
+        ORDER BY total_orders DESC
+        LIMIT 1
+    """,
+    "vendedores_shipments": "SELECT * FROM delta_scan('{gold}gold_sellers_shipment_metrics')",
+    "vendedores_performance": "SELECT * FROM delta_scan('{gold}seller_performance') ORDER BY total_revenue DESC LIMIT 20",
+    "produtos_profitability": "SELECT * FROM delta_scan('{gold}gold_product_profitability_analysis') ORDER BY avg_price DESC LIMIT 50",
+    "logistica_freight": "SELECT * FROM delta_scan('{gold}freight_analysis')",
+    "leads_priority": "SELECT * FROM delta_scan('{gold}gold_qualified_leads_priority')",
+}
+
+
+class _Measure:
+    """Tempo de parede e pico de memória (RSS) do processo durante um bloco."""
+
+    def __enter__(self):
+        self._process = psutil.Process()
+        self.peak_rss = self._process.memory_info().rss
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        self._start = time.perf_counter()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(0.05):
+            self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._start
+        self._stop.set()
+        self._sampler.join()
+        return False
+
+
+def _layer_rows(layer_path: str) -> tuple:
+    """Total de linhas e bytes das tabelas Delta de uma camada."""
+    rows, size = 0, 0
+    if not os.path.isdir(layer_path):
+        return rows, size
+    for table_name in os.listdir(layer_path):
+        table_path = os.path.join(layer_path, table_name)
+        if os.path.isdir(table_path) and DeltaTable.is_deltatable(table_path):
+            actions = DeltaTable(table_path).get_add_actions()
+            rows += sum(value or 0 for value in actions.column("num_records").to_pylist())
+            size += sum(actions.column("size_bytes").to_pylist())
+    return rows, size
+
+
+def _run_dashboard_queries(gold_path: str, repeat: int = 3) -> list:
+    results = []
+    with duckdb.connect() as conn:
+        for name, query in DASHBOARD_QUERIES.items():
+            timings, error = [], None
+            try:
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    conn.execute(query.format(gold=gold_path)).fetchall()
+                    timings.append(time.perf_counter() - start)
+            except Exception as e:
+                error = str(e).splitlines()[0]
+                logger.error(f"\033[31m[ERROR]\033[0m Consulta do dashboard '{name}': {error}")
+            results.append({"stage": f"dashboard:{name}", "seconds": statistics.median(timings) if timings else None, "error": error})
+    return results
+
+
+def run_benchmark(scale_factors: list, workdir: str = "../benchmark", source_path: str = "../data", seed: int = 42, regenerate: bool = False) -> pd.DataFrame:
+    """Gera os dados em cada fator de escala e mede as camadas bronze, silver e gold e as consultas do dashboard.
+
+    Cada escala roda em um diretório próprio (<workdir>/sf<escala>/{data,delta_lake,pipelines}), já
+    que os modelos leem as tabelas de '../delta_lake/<camada>' relativo ao diretório de execução.
+    As métricas por modelo ficam na tabela de métricas da pipeline de cada escala.
+
+    Returns:
+        DataFrame: Uma linha por escala/etapa com tempo, linhas, throughput e pico de memória
+    """
+    source_path = os.path.abspath(source_path)
+    os.makedirs(workdir, exist_ok=True)
+    cwd = os.getcwd()
+    settings = ["DATA_PATH", "BRONZE_PATH_OUT", "SILVER_PATH_OUT", "GOLD_PATH_OUT", "METRICS_PATH_OUT", "MODELS_PATH"]
+    defaults = {name: getattr(Config, name) for name in settings}
+    results = []
+
+    for scale_factor in scale_factors:
+        workspace = os.path.abspath(os.path.join(workdir, f"sf{scale_factor:g}"))
+        data_path = os.path.join(workspace, "data")
+        if regenerate or not os.path.exists(os.path.join(data_path, "olist.sqlite")):
+            with _Measure() as measure:
+                generate_dataset(data_path, scale_factor, source_path=source_path, seed=seed)
+            results.append({"scale_factor": scale_factor, "stage": "generate", "seconds": measure.seconds, "peak_rss_mb": measure.peak_rss / 1024 ** 2})
+
+        # lake limpo a cada execução: mede a carga completa sem cache de build
+        shutil.rmtree(os.path.join(workspace, "delta_lake"), ignore_errors=True)
+        os.makedirs(os.path.join(workspace, "pipelines"), exist_ok=True)
+        os.chdir(os.path.join(workspace, "pipelines"))
+        try:
+            Config.DATA_PATH = "../data"
+            Config.BRONZE_PATH_OUT = "../delta_lake/bronze"
+            Config.SILVER_PATH_OUT = "../delta_lake/silver/"
+            Config.GOLD_PATH_OUT = "../delta_lake/gold/"
+            Config.METRICS_PATH_OUT = "../delta_lake/metrics/pipeline_runs"
+            Config.MODELS_PATH = MODELS_PATH
+            pipeline = OlistPipeline(force=True)
+
+            input_bytes = sum(entry.stat().st_size for entry in os.scandir(data_path) if entry.is_file())
+            for stage, layer_path in [("bronze", Config.BRONZE_PATH_OUT), ("silver", Config.SILVER_PATH_OUT), ("gold", Config.GOLD_PATH_OUT)]:
+                logger.info(f"Benchmark sf={scale_factor:g}: camada {stage}")
+                with _Measure() as measure:
+                    pipeline.run_pipeline(stage)
+                rows, size = _layer_rows(layer_path)
+                results.append({
+                    "scale_factor": scale_factor,
+                    "stage": stage,
+                    "seconds": measure.seconds,
+                    "rows_out": rows,
+                    "bytes_out": size,
+                    "rows_per_s": rows / measure.seconds if measure.seconds else None,
+                    "mb_in_per_s": input_bytes / 1024 ** 2 / measure.seconds if stage == "bronze" and measure.seconds else None,
+                    "peak_rss_mb": measure.peak_rss / 1024 ** 2,
+                })
+
+            gold_path = os.path.abspath(Config.GOLD_PATH_OUT) + os.sep
+            with _Measure() as measure:
+                dashboard = _run_dashboard_queries(gold_path)
+            for result in dashboard:
+                results.append({"scale_factor": scale_factor, **result})
+            results.append({"scale_factor": scale_factor, "stage": "dashboard", "seconds": measure.seconds, "peak_rss_mb": measure.peak_rss / 1024 ** 2})
+        finally:
+            os.chdir(cwd)
+            for name, value in defaults.items():
+                setattr(Config, name, value)
+
+    report = pd.DataFrame(results)
+    report.to_csv(os.path.join(workdir, "benchmark_results.csv"), index=False)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da pipeline Olist em dados sintéticos")
+    parser.add_argument("--scale-factors", type=float, nargs="+", default=[1, 10], help="fatores de escala (ex.: 1 10 100)")
+    parser.add_argument("--workdir", default="../benchmark", help="diretório dos dados e lakes gerados")
+    parser.add_argument("--source-path", default="../data", help="diretório com os .csv reais de produtos/vendedores")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--regenerate", action="store_true", help="gera os dados novamente mesmo se já existirem")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.scale_factors, args.workdir, args.source_path, args.seed, args.regenerate)
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(report.round(3).to_string(index=False))
@@ -0,0 +1,54 @@
+import os
+import json
+import hashlib
+from deltalake import DeltaTable
+from deltalake.exceptions import TableNotFoundError
+from state import read_state, update_state
+
+BUILD_CACHE_FILE = "_build_cache.json"
+
+# commits que não alteram os dados da tabela (manutenção): não invalidam os modelos que a leem
+MAINTENANCE_OPERATIONS = {"OPTIMIZE", "VACUUM START", "VACUUM END", "SET TBLPROPERTIES"}
+
+
+def data_version(dt: DeltaTable) -> int:
+    """Versão do último commit que alterou os dados da tabela (ignora compactação, vacuum, etc.)."""
+    for commit in dt.history():
+        if commit.get("operation") not in MAINTENANCE_OPERATIONS:
+            return commit["version"]
+    return dt.version()
+
+
+def input_versions(model, session=None) -> dict:
+    """Versão atual de cada tabela Delta lida pelo modelo ({caminho: versão}, None se não existir)."""
+    versions = {}
+    paths = session.resolve(model.sql)[0] if session else [path for _, _, path in model.refs]
+    for path in paths:
+        try:
+            versions[path] = data_version(session.table(path) if session else DeltaTable(path))
+        except TableNotFoundError:
+            versions[path] = None
+    return versions
+
+
+def model_fingerprint(model, write_options: dict, session=None) -> str:
+    """Impressão digital do modelo: texto SQL (e das views lidas) + versões das entradas + opções de escrita."""
+    payload = {
+        "sql": model.sql,
+        "inputs": input_versions(model, session),
+        "write_options": write_options,
+    }
+    views = session.resolve(model.sql)[1] if session else {}
+    if views:
+        payload["views"] = views
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def is_up_to_date(cache_dir: str, model, fingerprint: str, table_path: str) -> bool:
+    """True se a última execução bem-sucedida do modelo teve a mesma impressão digital."""
+    cached = read_state(os.path.join(cache_dir, BUILD_CACHE_FILE)).get(model.name)
+    return cached == fingerprint and DeltaTable.is_deltatable(table_path)
+
+
+def record_fingerprint(cache_dir: str, model, fingerprint: str):
+    update_state(os.path.join(cache_dir, BUILD_CACHE_FILE), model.name, fingerprint)
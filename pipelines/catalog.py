@@ -0,0 +1,136 @@
+import os
+import logging
+from datetime import datetime, timezone
+import duckdb
+import pyarrow.compute as pc
+from deltalake import DeltaTable
+from state import read_state, update_state
+
+# Configuração do logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# catálogo de estatísticas das tabelas de uma camada, gravado junto às tabelas e lido pelo dashboard
+# (app/services/catalog.py) para montar os filtros sem ler as tabelas:
+#   {tabela: {"version", "row_count", "files", "size_bytes", "updated_at",
+#             "columns": {coluna: {"min", "max", "null_count"}},
+#             "domains": {coluna ou "col_a+col_b": [valores distintos ordenados]}}}
+# (colunas de partição sempre têm domínio, lido do log; as demais são declaradas com `-- @domains:`)
+CATALOG_FILE = "_catalog.json"
+
+# domínios maiores que o limite não são gravados (o dashboard volta a consultar a tabela)
+MAX_DOMAIN_VALUES = 10000
+
+
+def _quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def column_stats(dt: DeltaTable) -> dict:
+    """Min/max e nulos por coluna a partir das estatísticas dos arquivos no log Delta (sem ler os Parquet).
+
+    Colunas sem estatística em algum arquivo ficam com min/max None. Colunas de partição usam os
+    valores das partições.
+    """
+    actions = dt.get_add_actions(flatten=True)
+    num_records = actions.column("num_records")
+    names = set(actions.column_names)
+    partition_columns = dt.metadata().partition_columns
+    stats = {}
+    for field in dt.schema().fields:
+        column = field.name
+        if column in partition_columns:
+            values = actions.column(f"partition.{column}")
+            nulls = pc.sum(pc.if_else(pc.is_null(values), num_records, 0)).as_py() or 0
+            min_max = pc.min_max(values)
+            stats[column] = {"min": min_max["min"].as_py(), "max": min_max["max"].as_py(), "null_count": nulls}
+            continue
+        if not {f"null_count.{column}", f"min.{column}", f"max.{column}"} <= names:
+            stats[column] = {"min": None, "max": None, "null_count": None}
+            continue
+        null_count = actions.column(f"null_count.{column}")
+        minimum, maximum = actions.column(f"min.{column}"), actions.column(f"max.{column}")
+        # arquivo sem estatística: null_count ausente ou min nulo com valores não nulos no arquivo
+        complete = null_count.null_count == 0 and not pc.any(
+            pc.and_(pc.is_null(minimum), pc.less(null_count, num_records))
+        ).as_py()
+        stats[column] = {
+            "min": pc.min(minimum).as_py() if complete else None,
+            "max": pc.max(maximum).as_py() if complete else None,
+            "null_count": (pc.sum(null_count).as_py() or 0) if null_count.null_count == 0 else None,
+        }
+    return stats
+
+
+def column_domains(dt: DeltaTable, domains: list, max_values: int = MAX_DOMAIN_VALUES, threads: int | None = None) -> dict:
+    """Valores distintos das colunas declaradas em uma única leitura (apenas as colunas usadas).
+
+    Args:
+        dt (DeltaTable): Tabela Delta
+        domains (list): Colunas ou combinações 'col_a+col_b' (pares de valores, ex.: UF e cidade)
+        max_values (int): Domínios maiores são descartados (None no catálogo)
+        threads (int): Threads do DuckDB
+
+    Returns:
+        dict: {domínio: lista ordenada de valores (ou de listas, nas combinações) ou None}
+    """
+    if not domains:
+        return {}
+    dataset = dt.to_pyarrow_dataset()
+    result = {}
+    with duckdb.connect() as conn:
+        if threads:
+            conn.execute(f"SET threads = {threads}")
+        conn.register("data", dataset)
+        for domain in domains:
+            columns = ", ".join(_quote(column.strip()) for column in domain.split("+"))
+            rows = conn.execute(f"SELECT DISTINCT {columns} FROM data ORDER BY {columns} NULLS LAST LIMIT {max_values + 1}").fetchall()
+            if len(rows) > max_values:
+                logger.warning(f"Domínio '{domain}' com mais de {max_values} valores: não será gravado no catálogo.")
+                result[domain] = None
+            else:
+                result[domain] = [row[0] if len(row) == 1 else list(row) for row in rows]
+    return result
+
+
+def partition_domains(dt: DeltaTable) -> dict:
+    """Valores distintos das colunas de partição, lidos do log Delta."""
+    actions = dt.get_add_actions(flatten=True)
+    return {
+        column: sorted(pc.unique(actions.column(f"partition.{column}")).to_pylist(), key=lambda value: (value is None, value))
+        for column in dt.metadata().partition_columns
+    }
+
+
+def table_catalog(table_path: str, domains: list | None = None, threads: int | None = None) -> dict:
+    """Entrada do catálogo de uma tabela Delta: contagens e min/max do log e os domínios declarados."""
+    dt = DeltaTable(table_path)
+    actions = dt.get_add_actions(flatten=True)
+    partitions = dt.metadata().partition_columns
+    return {
+        "version": dt.version(),
+        "row_count": pc.sum(actions.column("num_records")).as_py() or 0,
+        "files": actions.num_rows,
+        "size_bytes": pc.sum(actions.column("size_bytes")).as_py() or 0,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "columns": column_stats(dt),
+        "domains": {**partition_domains(dt), **column_domains(dt, [d for d in domains or [] if d not in partitions], threads=threads)},
+    }
+
+
+def catalog_version(layer_path: str, table_name: str) -> int | None:
+    """Versão da tabela registrada no catálogo da camada (None se ainda não catalogada)."""
+    entry = read_state(os.path.join(layer_path, CATALOG_FILE)).get(table_name)
+    return entry["version"] if entry else None
+
+
+def record_catalog(layer_path: str, table_name: str, domains: list | None = None, threads: int | None = None) -> bool:
+    """Atualiza a entrada da tabela no catálogo da camada. Erros não interrompem a pipeline."""
+    try:
+        entry = table_catalog(os.path.join(layer_path, table_name), domains, threads)
+        update_state(os.path.join(layer_path, CATALOG_FILE), table_name, entry)
+        logger.info(f"\033[32m[OK]\033[0m Catálogo de '{table_name}' atualizado: {entry['row_count']} linhas, versão {entry['version']}.")
+        return True
+    except Exception as e:
+        logger.error(f"\033[31m[ERROR]\033[0m Erro ao atualizar o catálogo de '{table_name}': {str(e)}")
+        return False
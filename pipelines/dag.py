@@ -0,0 +1,196 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Configuração do logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def build_dependencies(models: dict) -> dict:
+    """Monta o grafo {modelo: {modelos dos quais depende}} a partir dos delta_scan de cada modelo.
+
+    Tabelas lidas que não são produzidas por nenhum modelo (ex.: camada bronze) são
+    tratadas como fontes externas e não entram no grafo.
+    """
+    dependencies = {}
+    for name, model in models.items():
+        dependencies[name] = {
+            table for _, table, _ in model.refs if table in models and table != name
+        }
+    return dependencies
+
+
+def topological_order(dependencies: dict) -> list:
+    """Ordena os modelos respeitando as dependências. Levanta ValueError se houver ciclo."""
+    order = []
+    done = set()
+    pending = dict(dependencies)
+    while pending:
+        ready = sorted(name for name, deps in pending.items() if deps <= done)
+        if not ready:
+            raise ValueError(f"Dependência cíclica entre os modelos: {', '.join(sorted(pending))}")
+        for name in ready:
+            order.append(name)
+            done.add(name)
+            del pending[name]
+    return order
+
+
+def _reachable(start: set, edges: dict) -> set:
+    """Todos os modelos alcançáveis a partir de start seguindo as arestas {modelo: {vizinhos}}."""
+    found = set()
+    stack = list(start)
+    while stack:
+        for neighbor in edges.get(stack.pop(), ()):
+            if neighbor not in found:
+                found.add(neighbor)
+                stack.append(neighbor)
+    return found
+
+
+def select_models(models: dict, selectors: list) -> dict:
+    """Filtra os modelos pelos seletores (união dos resultados de cada seletor).
+
+    Seletores:
+        nome: apenas o modelo
+        +nome: o modelo e todos os modelos dos quais ele depende
+        nome+: o modelo e todos os modelos que dependem dele
+        tag:vendas: os modelos com a tag (`-- @tags:` no modelo), também aceita +tag:vendas e tag:vendas+
+
+    Levanta ValueError para modelos ou tags inexistentes.
+    """
+    dependencies = build_dependencies(models)
+    dependents = {name: set() for name in models}
+    for name, deps in dependencies.items():
+        for dep in deps:
+            dependents[dep].add(name)
+
+    selected = set()
+    for selector in selectors:
+        base = selector.strip("+")
+        if base.startswith("tag:"):
+            tag = base[len("tag:"):]
+            nodes = {name for name, model in models.items() if tag in model.tags}
+            if not nodes:
+                raise ValueError(f"Nenhum modelo com a tag '{tag}'")
+        elif base in models:
+            nodes = {base}
+        else:
+            raise ValueError(f"Modelo não encontrado: '{base}'")
+        selected |= nodes
+        if selector.startswith("+"):
+            selected |= _reachable(nodes, dependencies)
+        if selector.endswith("+"):
+            selected |= _reachable(nodes, dependents)
+    return {name: model for name, model in models.items() if name in selected}
+
+
+def threads_per_worker(max_workers: int) -> int:
+    """Divide os núcleos da máquina entre os workers para não sobrecarregar o DuckDB."""
+    return max(1, (os.cpu_count() or 1) // max(1, max_workers))
+
+
+def run_dag(models: dict, run_model, max_workers: int = 4) -> dict:
+    """Executa os modelos em paralelo assim que todas as suas dependências terminarem.
+
+    Args:
+        models (dict): Modelos indexados pelo nome da tabela (ver models.load_models)
+        run_model (callable): Função que recebe um Model e retorna True em caso de sucesso
+        max_workers (int): Número máximo de modelos executados ao mesmo tempo
+
+    Returns:
+        dict: {nome do modelo: True (sucesso) | False (erro ou dependência com erro)}
+    """
+    dependencies = build_dependencies(models)
+    topological_order(dependencies)  # valida ciclos antes de iniciar
+
+    results = {}
+    running = {}
+    pending = dict(dependencies)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dag") as executor:
+        while pending or running:
+            for name in sorted(pending):
+                deps = pending[name]
+                failed = [d for d in deps if results.get(d) is False]
+                if failed:
+                    logger.error(f"\033[31m[ERROR]\033[0m Modelo '{name}' ignorado: dependência com erro ({', '.join(sorted(failed))}).")
+                    results[name] = False
+                    del pending[name]
+                elif all(d in results for d in deps) and len(running) < max_workers:
+                    running[executor.submit(run_model, models[name])] = name
+                    del pending[name]
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result() is not False
+                except Exception as e:
+                    logger.error(f"\033[31m[ERROR]\033[0m Erro inesperado ao executar o modelo '{name}': {str(e)}")
+                    results[name] = False
+
+    return results
+
+
+def _run_with_retries(name: str, run_task, retries: int, retry_delay: float) -> bool:
+    """Executa a tarefa repetindo em caso de falha (espera exponencial entre as tentativas)."""
+    for attempt in range(retries + 1):
+        try:
+            if run_task(name) is not False:
+                return True
+        except Exception as e:
+            logger.error(f"\033[31m[ERROR]\033[0m Erro inesperado ao executar '{name}': {str(e)}")
+        if attempt < retries:
+            delay = retry_delay * 2 ** attempt
+            logger.warning(f"Tentativa {attempt + 1} de '{name}' falhou, nova tentativa em {delay:g}s.")
+            time.sleep(delay)
+    return False
+
+
+def run_pool(tasks: dict, run_task, max_workers: int = 4, memory_budget: int | None = None, retries: int = 0, retry_delay: float = 1.0) -> dict:
+    """Executa tarefas independentes em paralelo dentro de um orçamento de memória.
+
+    As tarefas são admitidas da maior para a menor estimativa (a maior começa primeiro e o
+    tempo total tende ao da maior tarefa); uma tarefa só inicia se a soma das estimativas
+    em execução couber no orçamento. Uma tarefa maior que o orçamento roda sozinha.
+
+    Args:
+        tasks (dict): {nome da tarefa: memória estimada em bytes}
+        run_task (callable): Função que recebe o nome da tarefa e retorna True em caso de sucesso
+        max_workers (int): Número máximo de tarefas executadas ao mesmo tempo
+        memory_budget (int): Memória total (bytes) reservada para as tarefas em execução; None sem limite
+        retries (int): Novas tentativas de cada tarefa em caso de falha
+        retry_delay (float): Espera (segundos) antes da primeira nova tentativa, dobrada a cada falha
+
+    Returns:
+        dict: {nome da tarefa: True (sucesso) | False (erro após todas as tentativas)}
+    """
+    results = {}
+    running = {}
+    reserved = 0
+    pending = sorted(tasks, key=lambda name: tasks[name], reverse=True)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pool") as executor:
+        while pending or running:
+            for name in list(pending):
+                if len(running) >= max_workers:
+                    break
+                if running and memory_budget is not None and reserved + tasks[name] > memory_budget:
+                    continue
+                running[executor.submit(_run_with_retries, name, run_task, retries, retry_delay)] = name
+                reserved += tasks[name]
+                pending.remove(name)
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                reserved -= tasks[name]
+                results[name] = future.result()
+
+    return results
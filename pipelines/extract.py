@@ -1,44 +1,224 @@
 import duckdb
-from deltalake import write_deltalake
+import pyarrow.compute as pc
+from deltalake import DeltaTable
+from state import read_state, update_state
+from incremental import merge_delta, CDF_CONFIGURATION
+from writer import write_query
+from profiler import RunProfiler
+from schemas import csv_source
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # config logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-def extract_func_csv(source_path_csv: str, bronze_delta_path: str, name_table: str, mode: str = "overwrite"):
+WATERMARKS_FILE = "_watermarks.json"
+SQLITE_PROGRESS_FILE = "_sqlite_progress.json" # faixas de rowid já gravadas de cada extração SQLite em andamento
+SQLITE_CHUNK_ROWS = int(os.getenv("SQLITE_CHUNK_ROWS", 250_000)) # rowids por faixa na extração SQLite (0 desativa)
+
+def _load_bronze(conn, source: str, table_path: str, name_table: str, mode: str, watermark_column: str | None, merge_keys: list | None, state_path: str, lookback_days: int | None = None, run: RunProfiler | None = None):
+    """Lê a fonte (inteira ou apenas as linhas acima do watermark) e grava na tabela Delta bronze.
+
+    Modos de escrita:
+        overwrite: reescreve a tabela inteira (padrão); com watermark_column, regrava o watermark
+                   com o máximo lido, ponto de partida da próxima carga incremental
+        append: adiciona as linhas novas ao final da tabela
+        merge: atualiza as linhas existentes pela chave (merge_keys) e insere as novas; com
+               lookback_days relê também as linhas dos últimos dias antes do watermark (fontes
+               sem coluna de alteração, cujas linhas mudam depois de criadas)
+
+    Com `run` o profile do DuckDB cobre apenas a leitura/gravação da fonte.
+    """
+    where = ""
+    params = []
+    table_exists = DeltaTable.is_deltatable(table_path)
+    watermark = read_state(state_path).get(name_table) if watermark_column and mode != "overwrite" else None
+
+    if watermark is not None and table_exists:
+        if lookback_days and mode == "merge":
+            where = f" WHERE {watermark_column} > CAST(? AS TIMESTAMP) - to_days(CAST(? AS INTEGER))"
+            params += [watermark, lookback_days]
+            logger.info(f"Carga incremental de '{name_table}': {watermark_column} > {watermark} - {lookback_days} dias")
+        else:
+            where = f" WHERE {watermark_column} > ?"
+            params.append(watermark)
+            logger.info(f"Carga incremental de '{name_table}': {watermark_column} > {watermark}")
+
+    query = f"SELECT * FROM {source}{where}"
+    os.makedirs(table_path, exist_ok=True)
+    if run:
+        run.attach(conn)
+    if mode == "merge" and table_exists:
+        dataframe = conn.execute(query, params).arrow()
+        stats = None
+        if dataframe.num_rows:
+            merge_delta(table_path, dataframe, merge_keys)
+            stats = {"rows": dataframe.num_rows, "max": None}
+            if watermark_column in dataframe.column_names:
+                stats["max"] = pc.max(dataframe[watermark_column]).as_py()
+    else:
+        # primeira carga (sem watermark) reescreve a tabela para não duplicar linhas
+        write_mode = "overwrite" if mode == "merge" or (watermark_column and not where) else mode
+        stats = write_query(
+            conn, query, table_path, mode=write_mode, params=params, configuration=CDF_CONFIGURATION,
+            track_column=watermark_column, skip_empty=bool(where)
+        )
+    if run:
+        run.detach(conn) # o profile fica com a leitura da fonte, não com as consultas do watermark
+
+    if stats is None:
+        logger.info(f"Nenhuma linha nova para '{name_table}'.")
+        return
+
+    # o watermark só avança depois que a escrita na tabela Delta foi concluída
+    if watermark_column:
+        new_watermark = stats["max"]
+        if new_watermark is None:  # pseudo-colunas como o rowid do SQLite não vêm no SELECT *
+            new_watermark = conn.execute(f"SELECT MAX({watermark_column}) FROM {source}{where}", params).fetchone()[0]
+        # carga completa: o watermark anterior não vale para a tabela reescrita (None se ficou vazia)
+        if new_watermark is not None or mode == "overwrite":
+            update_state(state_path, name_table, new_watermark)
+
+def _rowid_ranges(conn, source: str, start: int | None, chunk_rows: int) -> list:
+    """Divide a tabela em faixas contíguas de rowid [(início, fim), ...] a partir de start."""
+    where, params = (" WHERE rowid >= ?", [start]) if start is not None else ("", [])
+    low, high = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {source}{where}", params).fetchone()
+    if low is None:
+        return []
+    return [[first, min(first + chunk_rows - 1, high)] for first in range(low, high + 1, chunk_rows)]
+
+def _load_sqlite_ranges(conn, source: str, table_path: str, name_table: str, mode: str, watermark_column: str | None, state_path: str, workers: int, run: RunProfiler | None = None):
+    """Extrai a tabela SQLite em faixas de rowid lidas em paralelo, cada uma gravada em streaming na tabela Delta.
+
+    A primeira faixa cria (ou reescreve) a tabela e as demais são anexadas por cursores
+    independentes. As faixas concluídas ficam no arquivo de progresso: se a extração falhar,
+    a próxima tentativa retoma a partir delas, desde que as faixas da fonte não tenham mudado.
+    Com watermark no rowid a carga incremental também é feita em faixas, a partir do último rowid gravado.
+    Na carga completa (overwrite) o watermark anterior é ignorado e regravado ao final.
+    """
+    watermark = read_state(state_path).get(name_table) if watermark_column and mode != "overwrite" else None
+    start = None
+    if watermark is not None and DeltaTable.is_deltatable(table_path):
+        start = watermark + 1
+        logger.info(f"Carga incremental de '{name_table}': rowid > {watermark}")
+    first_mode = "overwrite" if mode == "merge" or (watermark_column and start is None) else mode
+
+    ranges = _rowid_ranges(conn, source, start, SQLITE_CHUNK_ROWS)
+    if not ranges:
+        logger.info(f"Nenhuma linha nova para '{name_table}'.")
+        return
+
+    progress_path = os.path.join(os.path.dirname(state_path), SQLITE_PROGRESS_FILE)
+    progress = read_state(progress_path).get(name_table)
+    if not (progress and progress["ranges"] == ranges and DeltaTable.is_deltatable(table_path)):
+        progress = {"ranges": ranges, "done": [], "rows": 0}
+    elif progress["done"]:
+        logger.info(f"Retomando '{name_table}': {len(progress['done'])}/{len(ranges)} faixas de rowid já gravadas.")
+
+    def write_range(rowid_range: list, write_mode: str):
+        with conn.cursor() as cursor:
+            if run:
+                run.attach(cursor) # um profile por faixa; as consultas de controle na conexão principal ficam de fora
+            return write_query(
+                cursor, f"SELECT * FROM {source} WHERE rowid BETWEEN ? AND ?", table_path, mode=write_mode,
+                params=rowid_range, configuration=CDF_CONFIGURATION, skip_empty=write_mode != "overwrite",
+            )
+
+    def complete(rowid_range: list, stats: dict | None):
+        # o progresso é gravado logo após o commit da faixa na tabela Delta
+        progress["done"].append(rowid_range[0])
+        progress["rows"] += stats["rows"] if stats else 0
+        update_state(progress_path, name_table, progress)
+        logger.info(f"'{name_table}': {len(progress['done'])}/{len(ranges)} faixas de rowid gravadas ({progress['rows']} linhas).")
+
+    pending = [rowid_range for rowid_range in ranges if rowid_range[0] not in progress["done"]]
+    if not progress["done"]:
+        complete(pending[0], write_range(pending[0], first_mode))
+        pending = pending[1:]
+
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=name_table) as executor:
+        futures = {executor.submit(write_range, rowid_range, "append"): rowid_range for rowid_range in pending}
+        for future in as_completed(futures):
+            try:
+                complete(futures[future], future.result())
+            except Exception as e:
+                errors.append(e)
+    if errors:
+        raise errors[0]
+
+    # o watermark só avança depois que todas as faixas foram gravadas
+    if watermark_column:
+        if watermark_column == "rowid":
+            new_watermark = ranges[-1][1]
+        else:
+            new_watermark = conn.execute(f"SELECT MAX({watermark_column}) FROM {source} WHERE rowid >= ?", [ranges[0][0]]).fetchone()[0]
+        if new_watermark is not None or mode == "overwrite":
+            update_state(state_path, name_table, new_watermark)
+    update_state(progress_path, name_table, None)
+
+def _connect(threads: int | None = None, memory_limit: str | None = None):
+    """Conexão DuckDB da extração, limitada quando várias fontes são extraídas em paralelo."""
     conn = duckdb.connect()
-    
+    if threads:
+        conn.execute(f"SET threads = {threads}")
+    if memory_limit:
+        conn.execute(f"SET memory_limit = '{memory_limit}'")
+    return conn
+
+def extract_func_csv(source_path_csv: str, bronze_delta_path: str, name_table: str, mode: str = "overwrite", watermark_column: str | None = None, merge_keys: list | None = None, threads: int | None = None, memory_limit: str | None = None, lookback_days: int | None = None) -> bool:
+    conn = _connect(threads, memory_limit)
+
     try:
-        logger.info(f"Iniciando extração do arquivo {source_path_csv}")        
-        dataframe = conn.sql(f"SELECT * FROM read_csv_auto('{source_path_csv}')").arrow()
+        logger.info(f"Iniciando extração do arquivo {source_path_csv}")
         table_path = os.path.join(bronze_delta_path, name_table)
-        os.makedirs(table_path, exist_ok=True)
-        write_deltalake(table_path, dataframe, mode=mode)
+        with RunProfiler("bronze", name_table, table_path) as run:
+            _load_bronze(
+                conn, csv_source(source_path_csv), table_path, name_table, mode,
+                watermark_column, merge_keys, os.path.join(bronze_delta_path, WATERMARKS_FILE), lookback_days, run
+            )
         logger.info(f"\033[32m[OK]\033[0m Processo de extração do .CSV {source_path_csv} foi concluído.")
+        return True
 
     except Exception as e:
         logger.error(f"\033[031m[ERROR]\033[0m Erro ao processar {source_path_csv}: {str(e)}")
+        return False
 
     finally:
         conn.close() # evita o problema de leaks memory ao duckdb
 
-def extract_func_sqlite(db_path: str, sqlite_table: str, bronze_delta_path: str, name_table: str, mode: str = "overwrite"):
-    conn = duckdb.connect()
-    
+def extract_func_sqlite(db_path: str, sqlite_table: str, bronze_delta_path: str, name_table: str, mode: str = "overwrite", watermark_column: str | None = None, merge_keys: list | None = None, threads: int | None = None, memory_limit: str | None = None) -> bool:
+    conn = _connect(threads, memory_limit)
+
     try:
         logger.info(f"Iniciando extração da tabela SQLite - {sqlite_table}")
         # conectar com sqlite usando duckdb
         conn.execute(f"ATTACH '{db_path}' AS sqlite_db;")
-        dataframe = conn.sql(f"SELECT * FROM sqlite_db.{sqlite_table}").arrow()  # converte para PyArrow Table
         table_path = os.path.join(bronze_delta_path, name_table)
-        os.makedirs(table_path, exist_ok=True)
-        write_deltalake(table_path, dataframe, mode=mode)
+        state_path = os.path.join(bronze_delta_path, WATERMARKS_FILE)
+        watermark = read_state(state_path).get(name_table) if watermark_column and mode != "overwrite" else None
+        table_exists = DeltaTable.is_deltatable(table_path)
+        # merge e watermark em colunas que não o rowid continuam com a leitura única do _load_bronze
+        by_ranges = SQLITE_CHUNK_ROWS > 0 and not (table_exists and (mode == "merge" or (watermark is not None and watermark_column != "rowid")))
+        with RunProfiler("bronze", name_table, table_path) as run:
+            if by_ranges:
+                _load_sqlite_ranges(
+                    conn, f"sqlite_db.{sqlite_table}", table_path, name_table, mode,
+                    watermark_column, state_path, threads or os.cpu_count() or 1, run
+                )
+            else:
+                _load_bronze(
+                    conn, f"sqlite_db.{sqlite_table}", table_path, name_table, mode,
+                    watermark_column, merge_keys, state_path, run=run
+                )
         logger.info(f"\033[32m[OK]\033[0m Extração da tabela {sqlite_table} concluída e salva em {table_path}.")
+        return True
 
     except Exception as e:
         logger.error(f"\033[031m[ERROR]\033[0m Erro ao processar {sqlite_table}: {str(e)}")
+        return False
 
     finally:
         conn.close()
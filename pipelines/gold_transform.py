@@ -1,29 +1,126 @@
 import os
+import json
+import hashlib
 import logging
 import duckdb
-from deltalake import write_deltalake
+from deltalake import DeltaTable
+from state import read_state, update_state
+from incremental import changed_values, CDF_CONFIGURATION
+from writer import write_query
+from sketches import register_sketch_macros
+from lineage import record_lineage, base_input_versions
+from profiler import RunProfiler, read_input_versions
 
 # Configuração do logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-def gold_pipeline_sql(query: str, gold_table_name: str, mode: str = "overwrite", gold_path_out: str = "../delta_lake/gold/"):
-    """Executa uma query SQL sobre um Delta Table Silver e salva o resultado na camada Gold."""
+REFRESH_STATE_FILE = "_refresh_state.json"
+
+def _partition_predicate(column: str, values: list) -> str:
+    """Predicado SQL (válido no DuckDB e no replaceWhere do Delta) que seleciona as partições informadas"""
+    literals = ", ".join("'" + str(value).replace("'", "''") + "'" for value in values if value is not None)
+    conditions = [f"{column} IN ({literals})"] if literals else []
+    if None in values:
+        conditions.append(f"{column} IS NULL")
+    return " OR ".join(conditions)
+
+def _refresh_state(query: str, partition_by: list, refresh_source: str, input_versions: dict) -> dict:
+    """Estado salvo após cada execução de um modelo com refresh por partição: definição + versões consumidas das origens
+
+    `input_versions` são as versões das origens por trás das entradas da query (ver lineage.base_input_versions).
+    """
+    definition = json.dumps({"query": query, "partition_by": partition_by, "refresh_source": refresh_source}, sort_keys=True)
+    inputs = {os.path.normpath(path): version for path, version in input_versions.items()}
+    version = inputs.get(os.path.normpath(refresh_source))
+    return {
+        "definition": hashlib.sha256(definition.encode("utf-8")).hexdigest(),
+        "version": version if version is not None else DeltaTable(refresh_source).version(),
+        "inputs": inputs,
+    }
+
+def _other_inputs(inputs: dict, refresh_source: str) -> dict:
+    """Versões das origens da query exceto a origem do refresh"""
+    return {path: version for path, version in inputs.items() if path != os.path.normpath(refresh_source)}
+
+def _refresh_predicate(gold_table_name: str, gold_path_delta: str, partition_by: list, refresh_source: str, state: dict, state_path: str) -> str | None:
+    """Predicado das partições afetadas pelas mudanças em `refresh_source` desde a última execução.
+
+    Retorna None quando a tabela precisa ser reconstruída por completo (primeira execução, modelo
+    alterado, origem reescrita, sem Change Data Feed ou outra origem da query alterada, já que
+    uma mudança nela pode afetar qualquer partição) e "" quando nenhuma partição foi afetada.
+    """
+    last_state = read_state(state_path).get(gold_table_name)
+    if (
+        not last_state
+        or last_state.get("definition") != state["definition"]
+        or "inputs" not in last_state
+        or not isinstance(state["version"], int)
+        or _other_inputs(last_state["inputs"], refresh_source) != _other_inputs(state["inputs"], refresh_source)
+        or len(partition_by) != 1
+        or not DeltaTable.is_deltatable(gold_path_delta)
+    ):
+        return None
+    if last_state["version"] == state["version"]:
+        return ""
+
+    values = changed_values(refresh_source, last_state["version"], state["version"], partition_by[0])
+    if values is None:
+        return None
+    logger.info(f"Refresh de '{gold_table_name}' nas partições {partition_by[0]}: {', '.join(map(str, values)) or 'nenhuma'}")
+    return _partition_predicate(partition_by[0], values)
+
+def gold_pipeline_sql(query: str, gold_table_name: str, mode: str = "overwrite", gold_path_out: str = "../delta_lake/gold/", threads: int | None = None, session=None, partition_by: list | None = None, refresh_source: str | None = None, full_refresh: bool = False) -> bool:
+    """Executa uma query SQL sobre um Delta Table Silver e salva o resultado na camada Gold.
+
+    Com `session` (LayerSession) a query roda na sessão DuckDB compartilhada da camada.
+    `partition_by` define as colunas de partição da tabela. Com `refresh_source` (tabela Delta
+    com Change Data Feed, ex.: pedidos) apenas as partições com linhas alteradas na origem desde
+    a última execução são recalculadas e reescritas (replaceWhere); a coluna de partição deve
+    existir na origem.
+    `full_refresh` reconstrói a tabela inteira mesmo assim.
+    """
     
     gold_path = gold_path_out
     gold_path_delta = f"{gold_path}{gold_table_name}"
+    state_path = os.path.join(gold_path, REFRESH_STATE_FILE)
     os.makedirs(gold_path, exist_ok=True) # cria o diretório se não existir
 
     try:
-        with duckdb.connect() as conn:
+        input_versions = read_input_versions(query, session)
+        state = None
+        replace_where = None  # overwrite parcial: só as partições alteradas na origem
+        if refresh_source:
+            # versão lida antes da transformação: commits concorrentes na origem entram na próxima execução
+            state = _refresh_state(query, partition_by or [], refresh_source, base_input_versions(input_versions, stop=(refresh_source,)))
+            predicate = None if full_refresh else _refresh_predicate(gold_table_name, gold_path_delta, partition_by or [], refresh_source, state, state_path)
+            if predicate == "":
+                logger.info(f"\033[32m[OK]\033[0m Nenhuma partição de '{gold_table_name}' alterada na origem.")
+                update_state(state_path, gold_table_name, state)
+                return True
+            if predicate:
+                # o filtro na partição chega às entradas (pruning) e o overwrite reescreve só essas partições
+                query = f"SELECT * FROM (\n{query.strip().rstrip(';')}\n) WHERE {predicate}"
+                replace_where = predicate
+        conn, query = session.prepare(query) if session else (duckdb.connect(), query)
+        with conn, RunProfiler("gold", gold_table_name, gold_path_delta, input_versions) as run:
             logger.info(f"Executando transformação na tabela '{gold_table_name}' para a camada GOLD")
-            df_transformed_gold = conn.sql(query).arrow()
-            write_deltalake(gold_path_delta, df_transformed_gold, mode=mode)
+            if threads and not session:
+                conn.execute(f"SET threads = {threads}") # limita o paralelismo interno quando há vários modelos rodando
+            if not session:
+                register_sketch_macros(conn) # a sessão já cria as macros na conexão compartilhada
+            run.attach(conn)
+            write_query(conn, query, gold_path_delta, mode=mode, configuration=CDF_CONFIGURATION, partition_by=partition_by, predicate=replace_where)
+            if state:
+                update_state(state_path, gold_table_name, state)
+            record_lineage(gold_path_delta, input_versions)
             logger.info(f"\033[32m[OK]\033[0m Tabela '{gold_table_name}' processada com sucesso.")
+            return True
 
     except Exception as e:
         logger.error(f"\033[31m[ERROR]\033[0m Erro inesperado ao processar '{gold_table_name}': {str(e)}")
+        return False
 
     finally:
-        if conn:
-            conn.close()
\ No newline at end of file
+        if session:
+            session.invalidate(gold_path_delta)
@@ -0,0 +1,51 @@
+import os
+from deltalake import DeltaTable
+from state import read_state, update_state
+
+# versões das entradas consumidas por cada tabela gerada pela pipeline, gravadas junto às tabelas da camada:
+#   {tabela: {"version": versão gravada, "inputs": {caminho da entrada: versão lida}}}
+LINEAGE_FILE = "_lineage.json"
+
+
+def _lineage_path(table_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.normpath(table_path)), LINEAGE_FILE)
+
+
+def record_lineage(table_path: str, input_versions: dict):
+    """Registra as versões das entradas lidas para gerar a versão atual da tabela."""
+    table_path = os.path.normpath(table_path)
+    entry = {
+        "version": DeltaTable(table_path).version(),
+        "inputs": {os.path.normpath(path): version for path, version in input_versions.items()},
+    }
+    update_state(_lineage_path(table_path), os.path.basename(table_path), entry)
+
+
+def _merge_version(result: dict, path: str, version):
+    """Junta a versão de uma origem já vista por outro caminho (versões diferentes viram uma lista ordenada)."""
+    if path not in result or result[path] == version:
+        result[path] = version
+        return
+    versions = set(result[path] if isinstance(result[path], list) else [result[path]])
+    versions |= set(version if isinstance(version, list) else [version])
+    result[path] = sorted(versions)
+
+
+def base_input_versions(input_versions: dict, stop: tuple = ()) -> dict:
+    """Versões das tabelas de origem por trás das entradas, seguindo a linhagem das tabelas geradas pela pipeline.
+
+    Uma entrada é substituída pelas entradas registradas da sua versão atual (recursivamente);
+    entradas sem linhagem registrada para essa versão, e as listadas em `stop`, são mantidas.
+    Uma origem lida em versões diferentes por caminhos distintos fica com a lista das versões.
+    """
+    stop = tuple(os.path.normpath(path) for path in stop)
+    result = {}
+    for path, version in input_versions.items():
+        path = os.path.normpath(path)
+        entry = read_state(_lineage_path(path)).get(os.path.basename(path)) if path not in stop else None
+        if not entry or entry["version"] != version:
+            _merge_version(result, path, version)
+            continue
+        for base_path, base_version in base_input_versions(entry["inputs"], stop).items():
+            _merge_version(result, base_path, base_version)
+    return result
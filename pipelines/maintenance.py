@@ -0,0 +1,86 @@
+import os
+import logging
+from deltalake import DeltaTable
+from writer import TARGET_FILE_SIZE
+
+# Configuração do logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def table_stats(dt: DeltaTable) -> dict:
+    """Quantidade e tamanho total dos arquivos Parquet ativos da versão atual da tabela."""
+    sizes = dt.get_add_actions().column("size_bytes").to_pylist()
+    return {"files": len(sizes), "bytes": sum(sizes)}
+
+
+def optimize_table(table_path: str, zorder_by: list | None = None, target_size: int = TARGET_FILE_SIZE, vacuum_retention_hours: int | None = None) -> dict | None:
+    """Compacta os arquivos pequenos da tabela Delta e, opcionalmente, reordena os dados em Z-order.
+
+    Args:
+        table_path (str): Caminho da tabela Delta
+        zorder_by (list): Colunas usadas no Z-order (ex.: colunas de filtro e de join); sem colunas faz só a compactação
+        target_size (int): Tamanho alvo (bytes) dos arquivos reescritos
+        vacuum_retention_hours (int): Se informado, remove do disco os arquivos fora do log mais antigos que o período
+
+    Returns:
+        dict: {"before": {"files", "bytes"}, "after": {"files", "bytes"}} ou None se a tabela não existe
+    """
+    if not DeltaTable.is_deltatable(table_path):
+        logger.warning(f"Tabela '{table_path}' não encontrada, manutenção ignorada.")
+        return None
+
+    dt = DeltaTable(table_path)
+    before = table_stats(dt)
+
+    # colunas de partição não entram no Z-order: o optimize já atua dentro de cada partição
+    partition_columns = dt.metadata().partition_columns
+    zorder_by = [column for column in zorder_by or [] if column not in partition_columns]
+
+    if dt.history(1)[0].get("operation") == "OPTIMIZE":
+        # nenhum dado gravado desde a última manutenção: a tabela já está compactada/ordenada
+        zorder_by = []
+    elif zorder_by:
+        dt.optimize.z_order(zorder_by, target_size=target_size)
+    elif before["files"] > 1:
+        dt.optimize.compact(target_size=target_size)
+
+    if vacuum_retention_hours is not None:
+        dt.vacuum(retention_hours=vacuum_retention_hours, enforce_retention_duration=False, dry_run=False)
+
+    after = table_stats(DeltaTable(table_path))
+    zorder_info = f" (Z-order: {', '.join(zorder_by)})" if zorder_by else ""
+    logger.info(
+        f"\033[92m[OK]\033[0m Manutenção de '{table_path}'{zorder_info}: "
+        f"{before['files']} -> {after['files']} arquivos, "
+        f"{before['bytes'] / 1024 ** 2:.1f} MB -> {after['bytes'] / 1024 ** 2:.1f} MB"
+    )
+    return {"before": before, "after": after}
+
+
+def optimize_layer(layer_path: str, zorder_by: dict | None = None, target_size: int = TARGET_FILE_SIZE, vacuum_retention_hours: int | None = None) -> dict:
+    """Executa optimize_table em todas as tabelas Delta de uma camada.
+
+    Args:
+        layer_path (str): Diretório da camada (ex.: '../delta_lake/silver/')
+        zorder_by (dict): Colunas de Z-order por tabela ({tabela: [colunas]})
+        target_size (int): Tamanho alvo (bytes) dos arquivos reescritos
+        vacuum_retention_hours (int): Retenção do vacuum (None não executa o vacuum)
+
+    Returns:
+        dict: Estatísticas antes/depois por tabela
+    """
+    zorder_by = zorder_by or {}
+    report = {}
+    if not os.path.isdir(layer_path):
+        return report
+
+    for table_name in sorted(os.listdir(layer_path)):
+        table_path = os.path.join(layer_path, table_name)
+        if not os.path.isdir(table_path) or not DeltaTable.is_deltatable(table_path):
+            continue
+        try:
+            report[table_name] = optimize_table(table_path, zorder_by.get(table_name), target_size, vacuum_retention_hours)
+        except Exception as e:
+            logger.error(f"\033[91m[ERROR]\033[0m Falha na manutenção da tabela '{table_name}': {str(e)}")
+    return report
@@ -0,0 +1,151 @@
+import os
+import re
+
+# referências a tabelas Delta dentro dos modelos: delta_scan('../delta_lake/<camada>/<tabela>')
+DELTA_SCAN_PATTERN = re.compile(r"delta_scan\(\s*'([^']+)'\s*\)")
+
+# configuração do modelo declarada no topo do arquivo .sql, uma por linha:
+#   -- @materialized: incremental
+#   -- @unique_key: order_id, order_item_id
+#   -- @tags: vendas, clientes
+#   -- @domains: came_from, customer_state+customer_city  (valores distintos gravados no catálogo da camada)
+CONFIG_PATTERN = re.compile(r"^--\s*@(\w+)\s*:\s*(.*?)\s*$")
+
+# comentários do topo do modelo seguidos de um WITH opcional: os CTEs dos modelos ephemeral entram ali
+HEADER_PATTERN = re.compile(r"^((?:\s*--[^\n]*\n)*)\s*(WITH\s+(?:RECURSIVE\s+)?)?", re.IGNORECASE)
+
+# como o modelo é materializado:
+#   table: reescreve a tabela Delta a cada execução (padrão)
+#   incremental: aplica MERGE na tabela Delta com as linhas alteradas na origem (requer unique_key)
+#                (gold: com refresh_source e partition_by, reescreve só as partições alteradas na origem)
+#   view: não é gravado; vira uma view do DuckDB sobre as entradas nos modelos que o leem
+#   ephemeral: não é gravado; é incorporado como CTE nos modelos que o leem
+MATERIALIZATIONS = ("table", "incremental", "view", "ephemeral")
+VIRTUAL_MATERIALIZATIONS = ("view", "ephemeral")
+
+
+class Model:
+    """Modelo SQL da pipeline, carregado de um arquivo em models/<camada>/<tabela>.sql"""
+
+    def __init__(self, name: str, layer: str, file_path: str, sql: str):
+        self.name = name
+        self.layer = layer
+        self.file_path = file_path
+        self.sql = sql
+        self.refs = parse_refs(sql)
+        self.config = parse_config(sql)
+
+    @property
+    def materialized(self) -> str:
+        materialized = self.config.get("materialized", "table")
+        if materialized not in MATERIALIZATIONS:
+            raise ValueError(f"Materialização '{materialized}' inválida no modelo '{self.name}' (opções: {', '.join(MATERIALIZATIONS)})")
+        return materialized
+
+    @property
+    def virtual(self) -> bool:
+        """True para modelos que não são gravados em tabela Delta (view e ephemeral)."""
+        return self.materialized in VIRTUAL_MATERIALIZATIONS
+
+    @property
+    def tags(self) -> list:
+        return self.config_list("tags")
+
+    def config_list(self, key: str) -> list:
+        """Valor de configuração separado por vírgulas como lista (ex.: unique_key)."""
+        value = self.config.get(key, "")
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    def __repr__(self):
+        return f"Model({self.layer}.{self.name})"
+
+
+def parse_refs(sql: str) -> list:
+    """Retorna as tabelas lidas pelo modelo como uma lista de tuplas (camada, tabela, caminho)."""
+    refs = []
+    for path in DELTA_SCAN_PATTERN.findall(sql):
+        parts = [p for p in path.replace("\\", "/").split("/") if p]
+        table = parts[-1]
+        layer = parts[-2] if len(parts) > 1 else ""
+        ref = (layer, table, path)
+        if ref not in refs:
+            refs.append(ref)
+    return refs
+
+
+def replace_refs(sql: str, relations: dict) -> str:
+    """Substitui os delta_scan('<caminho>') do SQL pelas relações informadas em {caminho: relação}."""
+    return DELTA_SCAN_PATTERN.sub(lambda match: relations.get(match.group(1), match.group(0)), sql)
+
+
+def compile_sql(sql: str, models: dict) -> str:
+    """Incorpora como CTEs os modelos ephemeral lidos pela query (inclusive os lidos por outros ephemeral)."""
+    ctes = {}
+    visiting = set()
+
+    def inline(query: str) -> str:
+        relations = {}
+        for _, table, path in parse_refs(query):
+            model = models.get(table)
+            if model is None or model.materialized != "ephemeral":
+                continue
+            name = f"ephemeral__{table}"
+            if name not in ctes:
+                if table in visiting:
+                    raise ValueError(f"Dependência cíclica entre modelos ephemeral: '{table}'")
+                visiting.add(table)
+                ctes[name] = inline(model.sql).strip().rstrip(";")  # dependências entram antes
+                visiting.discard(table)
+            relations[path] = name
+        return replace_refs(query, relations)
+
+    query = inline(sql)
+    if not ctes:
+        return sql
+    definitions = ",\n".join(f"{name} AS (\n{body}\n)" for name, body in ctes.items())
+    match = HEADER_PATTERN.match(query)
+    header, with_clause, body = match.group(1), match.group(2), query[match.end():]
+    if with_clause:
+        return f"{header}{with_clause}{definitions},\n{body}"
+    return f"{header}WITH {definitions}\n{body}"
+
+
+def compile_model(model: Model, models: dict) -> Model:
+    """Modelo com os ephemeral incorporados ao SQL (o próprio modelo se não ler nenhum)."""
+    sql = compile_sql(model.sql, models)
+    if sql == model.sql:
+        return model
+    return Model(name=model.name, layer=model.layer, file_path=model.file_path, sql=sql)
+
+
+def parse_config(sql: str) -> dict:
+    """Lê o bloco de comentários `-- @chave: valor` do início do modelo."""
+    config = {}
+    for line in sql.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = CONFIG_PATTERN.match(line)
+        if not match:
+            break
+        config[match.group(1)] = match.group(2)
+    return config
+
+
+def load_models(models_path: str = "./models", layer: str | None = None) -> dict:
+    """Carrega os modelos .sql de uma camada (ou de todas) indexados pelo nome da tabela."""
+    layers = [layer] if layer else sorted(
+        d for d in os.listdir(models_path) if os.path.isdir(os.path.join(models_path, d))
+    )
+    models = {}
+    for layer_name in layers:
+        layer_dir = os.path.join(models_path, layer_name)
+        for file_name in sorted(os.listdir(layer_dir)):
+            if not file_name.endswith(".sql"):
+                continue
+            file_path = os.path.join(layer_dir, file_name)
+            with open(file_path, "r", encoding="utf-8") as file:
+                sql = file.read()
+            name = os.path.splitext(file_name)[0]
+            models[name] = Model(name=name, layer=layer_name, file_path=file_path, sql=sql)
+    return models
@@ -1,14 +1,14 @@
+-- @tags: vendedores
+-- @zorder_by: seller_id
 WITH pedidos_por_vendedor AS (
     SELECT 
-        oi.seller_id,
-        o.order_id,
-        o.order_status,
-        o.order_purchase_timestamp,
-        o.order_delivered_customer_date,
-        o.order_estimated_delivery_date
-    FROM delta_scan('../delta_lake/silver/order_items_silver') oi
-    JOIN delta_scan('../delta_lake/silver/orders_full_data_silver') o 
-        ON o.order_id = oi.order_id
+        f.seller_id,
+        f.order_id,
+        f.order_status,
+        f.order_purchase_timestamp,
+        f.order_delivered_customer_date,
+        f.order_estimated_delivery_date
+    FROM delta_scan('../delta_lake/silver/order_items_fact') f
 ),
 
 reviews_por_vendedor AS (
@@ -0,0 +1,76 @@
+-- @tags: clientes, vendedores
+-- @partition_by: zoom_level
+-- @zorder_by: state, city
+-- grade espacial hierárquica para os mapas: clientes e vendedores agregados em células de
+-- latitude/longitude em 4 níveis de zoom (cada célula se divide em 4x4 células no nível seguinte).
+-- uma linha por entidade, nível, célula, UF e cidade: os mapas filtram por UF/cidade e somam as
+-- células, sem enviar um ponto por cliente ao navegador.
+WITH levels AS (
+    SELECT * FROM (VALUES (0, 4.0), (1, 1.0), (2, 0.25), (3, 0.0625)) AS l(zoom_level, cell_size)
+),
+
+customer_sales AS (
+    SELECT
+        customer_id,
+        SUM(price) AS total_revenue,
+        COUNT(DISTINCT order_id) AS total_orders
+    FROM delta_scan('../delta_lake/silver/order_items_fact')
+    GROUP BY customer_id
+),
+
+seller_sales AS (
+    SELECT
+        seller_id,
+        SUM(price) AS total_revenue,
+        COUNT(DISTINCT order_id) AS total_orders
+    FROM delta_scan('../delta_lake/silver/order_items_fact')
+    GROUP BY seller_id
+),
+
+points AS (
+    SELECT
+        'customer' AS entity,
+        c.customer_unique_id AS entity_id,
+        c.customer_state AS state,
+        c.customer_city AS city,
+        c.avg_latitude AS latitude,
+        c.avg_longitude AS longitude,
+        s.total_revenue,
+        s.total_orders
+    FROM delta_scan('../delta_lake/silver/aggregated_customers_silver') c
+    LEFT JOIN customer_sales s ON s.customer_id = c.customer_id
+    WHERE c.avg_latitude IS NOT NULL
+
+    UNION ALL
+
+    SELECT
+        'seller' AS entity,
+        se.seller_id AS entity_id,
+        se.seller_state AS state,
+        se.seller_city AS city,
+        g.latitude,
+        g.longitude,
+        s.total_revenue,
+        s.total_orders
+    FROM delta_scan('../delta_lake/silver/sellers_silver') se
+    JOIN delta_scan('../delta_lake/silver/cep_centroids_silver') g ON g.cep = se.seller_cep
+    LEFT JOIN seller_sales s ON s.seller_id = se.seller_id
+)
+
+SELECT
+    p.entity,
+    l.zoom_level,
+    l.cell_size,
+    CAST(FLOOR(p.latitude / l.cell_size) AS INTEGER) AS cell_row,
+    CAST(FLOOR(p.longitude / l.cell_size) AS INTEGER) AS cell_col,
+    (FLOOR(p.latitude / l.cell_size) + 0.5) * l.cell_size AS center_latitude,
+    (FLOOR(p.longitude / l.cell_size) + 0.5) * l.cell_size AS center_longitude,
+    p.state,
+    p.city,
+    COUNT(DISTINCT p.entity_id) AS entity_count,
+    COALESCE(SUM(p.total_revenue), 0) AS total_revenue,
+    COALESCE(SUM(p.total_orders), 0) AS total_orders
+FROM points p
+CROSS JOIN levels l
+GROUP BY ALL
+ORDER BY entity, state, city
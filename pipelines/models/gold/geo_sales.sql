@@ -1,13 +1,13 @@
+-- @tags: vendas
+-- @partition_by: customer_state
 SELECT 
-    c.customer_city,
-    c.customer_state,
-    SUM(oi.price) AS total_revenue,
-    COUNT(o.order_id) AS total_orders
+    f.customer_city,
+    f.customer_state,
+    SUM(f.price) AS total_revenue,
+    COUNT(f.order_id) AS total_orders
 FROM 
-    delta_scan('../delta_lake/silver/orders_full_data_silver') o
-JOIN 
-    delta_scan('../delta_lake/silver/order_items_silver') oi ON o.order_id = oi.order_id
-JOIN 
-    delta_scan('../delta_lake/silver/customers_silver') c ON o.customer_id = c.customer_id
+    delta_scan('../delta_lake/silver/order_items_fact') f
+WHERE 
+    f.customer_state IS NOT NULL
 GROUP BY 
-    c.customer_city, c.customer_state;
\ No newline at end of file
+    f.customer_city, f.customer_state;
\ No newline at end of file
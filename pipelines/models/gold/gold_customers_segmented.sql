@@ -1,3 +1,5 @@
+-- @tags: clientes
+-- @zorder_by: customer_cep
 WITH customer_orders AS (
     SELECT
         o.customer_id,
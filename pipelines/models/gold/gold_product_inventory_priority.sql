@@ -1,14 +1,16 @@
+-- @tags: produtos
 SELECT 
-  p.product_id,
-  p.product_category,
-  SUM(oi.price) AS total_sales,
-  COUNT(oi.order_id) AS sales_count,
-  ROUND(SUM(oi.price) / COUNT(oi.order_id), 2) AS avg_price_per_sale, 
-  RANK() OVER (ORDER BY SUM(oi.price) DESC) AS sales_priority -- ranking de prioridade em ordem
+  f.product_id,
+  f.product_category,
+  SUM(f.price) AS total_sales,
+  COUNT(f.order_id) AS sales_count,
+  ROUND(SUM(f.price) / COUNT(f.order_id), 2) AS avg_price_per_sale, 
+  RANK() OVER (ORDER BY SUM(f.price) DESC) AS sales_priority -- ranking de prioridade em ordem
 FROM 
-  delta_scan('../delta_lake/silver/products_silver') p
-  JOIN delta_scan('../delta_lake/silver/order_items_silver') oi ON p.product_id = oi.product_id
+  delta_scan('../delta_lake/silver/order_items_fact') f
+WHERE 
+  f.product_category IS NOT NULL -- apenas itens com produto cadastrado
 GROUP BY 
-  p.product_id, p.product_category
+  f.product_id, f.product_category
 ORDER BY 
   total_sales DESC;
\ No newline at end of file
@@ -1,3 +1,5 @@
+-- @tags: leads
+-- @domains: came_from, priority
 WITH leads_origin AS (
   SELECT 
     came_from,
@@ -1,15 +1,17 @@
+-- @tags: vendedores
+-- @zorder_by: seller_id
 SELECT 
-    s.seller_id,
-    s.seller_city,
-    s.seller_state,
+    f.seller_id,
+    f.seller_city,
+    f.seller_state,
     ROUND(AVG(orv.review_score), 2) AS avg_score_review
 FROM 
-    delta_scan('../delta_lake/silver/sellers_silver') s
+    delta_scan('../delta_lake/silver/order_items_fact') f
 JOIN 
-    delta_scan('../delta_lake/silver/order_items_silver') oi ON s.seller_id = oi.seller_id
-JOIN 
-    delta_scan('../delta_lake/silver/order_reviews') orv ON oi.order_id = orv.order_id
+    delta_scan('../delta_lake/silver/order_reviews') orv ON f.order_id = orv.order_id
+WHERE 
+    f.seller_state IS NOT NULL -- apenas itens com vendedor cadastrado
 GROUP BY 
-    s.seller_id, s.seller_city, s.seller_state
+    f.seller_id, f.seller_city, f.seller_state
 HAVING 
     AVG(orv.review_score) < 3;
\ No newline at end of file
@@ -1,10 +1,14 @@
+-- @tags: clientes, logistica
+-- @domains: customer_state+customer_city
+-- @partition_by: customer_state
+-- @zorder_by: customer_cep
 SELECT
-    ac.customer_cep,
-    ac.customer_city,
-    ac.customer_state,
-    ac.avg_latitude,
-    ac.avg_longitude,
-    COUNT(DISTINCT ac.customer_unique_id) AS total_customers,
+    c.customer_cep,
+    c.customer_city,
+    c.customer_state,
+    g.latitude AS avg_latitude,
+    g.longitude AS avg_longitude,
+    COUNT(DISTINCT c.customer_unique_id) AS total_customers,
     COUNT(DISTINCT o.order_id) AS total_orders,
     COUNT(DISTINCT oi.seller_id) AS distinct_sellers,
     SUM(p.payment_value) AS total_sales_value,
@@ -14,15 +18,20 @@ SELECT
             CAST(COUNT(DISTINCT o.order_id) AS FLOAT) / COUNT(DISTINCT oi.seller_id),
             2
         )
-    END AS demand_supply_ratio
-FROM delta_scan('../delta_lake/silver/aggregated_customers') ac
-LEFT JOIN delta_scan('../delta_lake/silver/orders_full_data_silver') o ON ac.customer_id = o.customer_id
+    END AS demand_supply_ratio,
+    -- sketches HLL: contagens distintas somáveis por cidade/UF (ver app/services/sketches.py)
+    hll_sketch(c.customer_unique_id) AS customers_sketch,
+    hll_sketch(o.order_id) AS orders_sketch,
+    hll_sketch(oi.seller_id) AS sellers_sketch
+FROM delta_scan('../delta_lake/silver/customers_silver') c
+LEFT JOIN delta_scan('../delta_lake/silver/cep_centroids_silver') g ON g.cep = c.customer_cep
+LEFT JOIN delta_scan('../delta_lake/silver/orders_full_data_silver') o ON c.customer_id = o.customer_id
 LEFT JOIN delta_scan('../delta_lake/silver/order_items_silver') oi ON o.order_id = oi.order_id
 LEFT JOIN delta_scan('../delta_lake/silver/payments_silver') p ON o.order_id = p.order_id
 GROUP BY
-    ac.customer_cep,
-    ac.customer_city,
-    ac.customer_state,
-    ac.avg_latitude,
-    ac.avg_longitude
+    c.customer_cep,
+    c.customer_city,
+    c.customer_state,
+    g.latitude,
+    g.longitude
 ORDER BY total_orders DESC;
\ No newline at end of file
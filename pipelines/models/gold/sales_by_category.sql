@@ -1,11 +1,12 @@
+-- @tags: vendas
 SELECT 
-    p.product_category,
-    ROUND(SUM(oi.price), 2) AS total_revenue,
-    COUNT(oi.order_id) AS total_quantity_sold,
-    ROUND(AVG(oi.price), 2) AS average_price_per_item
+    f.product_category,
+    ROUND(SUM(f.price), 2) AS total_revenue,
+    COUNT(f.order_id) AS total_quantity_sold,
+    ROUND(AVG(f.price), 2) AS average_price_per_item
 FROM 
-    delta_scan('../delta_lake/silver/order_items_silver') oi
-JOIN 
-    delta_scan('../delta_lake/silver/products_silver') p ON oi.product_id = p.product_id
+    delta_scan('../delta_lake/silver/order_items_fact') f
+WHERE 
+    f.product_category IS NOT NULL -- apenas itens com produto cadastrado
 GROUP BY 
-    p.product_category;
\ No newline at end of file
+    f.product_category;
\ No newline at end of file
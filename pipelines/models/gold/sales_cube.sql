@@ -0,0 +1,34 @@
+-- @tags: vendas, clientes, logistica
+-- cubo de vendas pré-agregado para os filtros do dashboard (UF, cidade, categoria e mês da compra).
+-- `grain` lista as dimensões agrupadas na linha ('' = total geral); as demais dimensões ficam NULL.
+-- receita, frete e itens são aditivos; pedidos e clientes são distintos dentro de cada linha.
+SELECT
+    concat_ws(',',
+        CASE WHEN GROUPING(customer_state) = 0 THEN 'customer_state' END,
+        CASE WHEN GROUPING(customer_city) = 0 THEN 'customer_city' END,
+        CASE WHEN GROUPING(product_category) = 0 THEN 'product_category' END,
+        CASE WHEN GROUPING(order_purchase_month) = 0 THEN 'order_purchase_month' END
+    ) AS grain,
+    customer_state,
+    customer_city,
+    product_category,
+    order_purchase_month,
+    SUM(price) AS total_revenue,
+    SUM(freight_value) AS total_freight,
+    COUNT(*) AS total_items,
+    COUNT(DISTINCT order_id) AS total_orders,
+    COUNT(DISTINCT customer_unique_id) AS total_customers
+FROM delta_scan('../delta_lake/silver/order_items_fact')
+GROUP BY GROUPING SETS (
+    (),
+    (customer_state),
+    (customer_state, customer_city),
+    (product_category),
+    (order_purchase_month),
+    (customer_state, product_category),
+    (customer_state, order_purchase_month),
+    (customer_state, customer_city, order_purchase_month),
+    (product_category, order_purchase_month),
+    (customer_state, product_category, order_purchase_month)
+)
+ORDER BY grain, customer_state, customer_city, product_category, order_purchase_month
\ No newline at end of file
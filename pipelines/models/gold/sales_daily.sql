@@ -0,0 +1,21 @@
+-- @tags: vendas
+-- @materialized: incremental
+-- @partition_by: order_purchase_month
+-- @refresh_source: ../delta_lake/silver/orders_full_data_silver
+-- vendas diárias por UF, cidade, categoria e vendedor, particionadas pelo mês da compra.
+-- a cada execução só os meses com pedidos novos/alterados são recalculados; mudanças em itens,
+-- produtos, vendedores ou clientes (outras origens de order_items_fact) reconstroem a tabela inteira.
+SELECT
+    order_purchase_month,
+    CAST(order_purchase_timestamp AS DATE) AS order_purchase_date,
+    customer_state,
+    customer_city,
+    product_category,
+    seller_id,
+    SUM(price) AS total_revenue,
+    SUM(freight_value) AS total_freight,
+    COUNT(*) AS total_items,
+    COUNT(DISTINCT order_id) AS total_orders
+FROM delta_scan('../delta_lake/silver/order_items_fact')
+GROUP BY ALL
+ORDER BY order_purchase_date, customer_state, customer_city
@@ -0,0 +1,21 @@
+-- @tags: vendas
+-- @materialized: incremental
+-- @partition_by: order_purchase_month
+-- @refresh_source: ../delta_lake/gold/sales_daily
+-- vendas mensais no mesmo grão de sales_daily, somadas a partir dela (cada pedido tem uma única
+-- data de compra, então a soma dos pedidos distintos por dia é exata no mês).
+-- o refresh segue os meses reescritos em sales_daily; uma reconstrução completa de sales_daily
+-- (overwrite sem predicado) reconstrói também este modelo.
+SELECT
+    order_purchase_month,
+    customer_state,
+    customer_city,
+    product_category,
+    seller_id,
+    SUM(total_revenue) AS total_revenue,
+    SUM(total_freight) AS total_freight,
+    SUM(total_items) AS total_items,
+    SUM(total_orders) AS total_orders
+FROM delta_scan('../delta_lake/gold/sales_daily')
+GROUP BY ALL
+ORDER BY customer_state, customer_city
@@ -1,10 +1,12 @@
+-- @tags: vendedores
+-- @zorder_by: seller_id
 SELECT
-    s.seller_id,
-    SUM(oi.price) AS total_revenue,
-    COUNT(oi.order_id) AS total_sales
+    f.seller_id,
+    SUM(f.price) AS total_revenue,
+    COUNT(f.order_id) AS total_sales
 FROM
-    delta_scan('../delta_lake/silver/order_items_silver') oi
-JOIN 
-    delta_scan('../delta_lake/silver/sellers_silver') s ON oi.seller_id = s.seller_id
+    delta_scan('../delta_lake/silver/order_items_fact') f
+WHERE
+    f.seller_state IS NOT NULL -- apenas itens com vendedor cadastrado
 GROUP BY
-    s.seller_id;
\ No newline at end of file
+    f.seller_id;
\ No newline at end of file
@@ -0,0 +1,14 @@
+-- @zorder_by: cep
+-- centróide de cada prefixo de CEP, calculado uma única vez a partir dos pontos de geolocalização
+-- (a origem repete muitos pontos por CEP). Clientes, vendedores e regiões fazem join 1:1 por CEP.
+-- o espalhamento (desvio padrão em graus) e a quantidade de pontos indicam a confiabilidade do centróide.
+SELECT
+    geolocation_cep AS cep,
+    AVG(geolocation_lat) AS latitude,
+    AVG(geolocation_lng) AS longitude,
+    COUNT(*) AS points_count,
+    COUNT(DISTINCT (geolocation_lat, geolocation_lng)) AS distinct_points,
+    STDDEV_POP(geolocation_lat) AS latitude_stddev,
+    STDDEV_POP(geolocation_lng) AS longitude_stddev
+FROM delta_scan('../delta_lake/silver/geolocation_silver')
+GROUP BY geolocation_cep
@@ -1,3 +1,4 @@
+-- @zorder_by: customer_cep
 SELECT
     customer_id,
     customer_unique_id,
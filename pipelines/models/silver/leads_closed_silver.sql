@@ -1,3 +1,5 @@
+-- @materialized: incremental
+-- @unique_key: mql_id
 SELECT 
     mql_id,
     seller_id,
@@ -0,0 +1,30 @@
+-- @zorder_by: seller_id, product_id
+-- fato no grão do item do pedido: junta uma única vez os itens com pedidos, produtos, vendedores e
+-- clientes, apenas com as colunas usadas pelos modelos gold. Itens sem pedido ficam de fora; produtos,
+-- vendedores e clientes sem correspondência ficam com os atributos NULL.
+SELECT
+    oi.order_id,
+    oi.order_item_id,
+    oi.product_id,
+    oi.seller_id,
+    o.customer_id,
+    c.customer_unique_id,
+    o.order_status,
+    o.order_purchase_timestamp,
+    o.order_purchase_month,
+    o.order_delivered_customer_date,
+    o.order_estimated_delivery_date,
+    oi.price,
+    oi.freight_value,
+    p.product_category,
+    p.product_weight_g,
+    s.seller_city,
+    s.seller_state,
+    c.customer_city,
+    c.customer_state
+FROM delta_scan('../delta_lake/silver/order_items_silver') oi
+JOIN delta_scan('../delta_lake/silver/orders_full_data_silver') o ON o.order_id = oi.order_id
+LEFT JOIN delta_scan('../delta_lake/silver/products_silver') p ON p.product_id = oi.product_id
+LEFT JOIN delta_scan('../delta_lake/silver/sellers_silver') s ON s.seller_id = oi.seller_id
+LEFT JOIN delta_scan('../delta_lake/silver/customers_silver') c ON c.customer_id = o.customer_id
+ORDER BY oi.seller_id, oi.product_id -- arquivos ordenados: min/max por row group seletivos nos filtros por vendedor/produto
\ No newline at end of file
@@ -1,9 +1,12 @@
+-- @materialized: incremental
+-- @unique_key: order_id, order_item_id
+-- @zorder_by: seller_id, order_id
 SELECT 
     order_id,
     order_item_id,
     product_id,
     seller_id,
-    CAST(shipping_limit_date AS TIMESTAMP) AS shipping_limit_date,
-    CAST(price AS DOUBLE) AS price,
-    CAST(freight_value AS DOUBLE) AS freight_value
+    shipping_limit_date,
+    price,
+    freight_value
 FROM delta_scan('../delta_lake/bronze/order_items_bronze')
\ No newline at end of file
@@ -1,11 +1,12 @@
+-- @materialized: view
 SELECT
-    CAST(order_id AS VARCHAR) AS order_id,
-    CAST(customer_id AS VARCHAR) AS customer_id,
-    CAST(order_status AS VARCHAR) AS order_status,
-    CAST(order_purchase_timestamp AS TIMESTAMP) AS order_purchase_timestamp,
-    CAST(order_approved_at AS TIMESTAMP) AS order_approved_at,
-    CAST(order_delivered_carrier_date AS TIMESTAMP) AS order_delivered_carrier_date,
-    CAST(order_delivered_customer_date AS TIMESTAMP) AS order_delivered_customer_date,
-    CAST(order_estimated_delivery_date AS TIMESTAMP) AS order_estimated_delivery_date
-FROM delta_scan('../delta_lake/bronze/orders_bronze')
+    order_id,
+    customer_id,
+    order_status,
+    order_purchase_timestamp,
+    order_approved_at,
+    order_delivered_carrier_date,
+    order_delivered_customer_date,
+    order_estimated_delivery_date
+FROM delta_scan('../delta_lake/silver/orders_full_data_silver')
 WHERE order_status = 'delivered'
\ No newline at end of file
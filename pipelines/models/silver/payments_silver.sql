@@ -1,3 +1,5 @@
+-- @materialized: incremental
+-- @unique_key: order_id, payment_sequential
 SELECT 
     order_id,
     payment_sequential,
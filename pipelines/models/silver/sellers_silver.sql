@@ -1,3 +1,4 @@
+-- @zorder_by: seller_id
 SELECT
     seller_id,
     seller_zip_code_prefix AS seller_cep,
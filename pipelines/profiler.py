@@ -0,0 +1,231 @@
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+import threading
+from datetime import datetime, timezone
+import duckdb
+import psutil
+import pyarrow as pa
+from deltalake import DeltaTable, write_deltalake
+from models import parse_refs
+
+# Configuração do logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# cada extração/modelo executado gera um registro na tabela de métricas da pipeline
+PROFILING_ENABLED = os.getenv("PIPELINE_PROFILING", "true").lower() == "true"
+RSS_SAMPLE_INTERVAL = 0.05 # segundos entre as amostras de memória
+
+METRICS_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("layer", pa.string()),
+    ("model", pa.string()),
+    ("status", pa.string()),
+    ("started_at", pa.timestamp("us", tz="UTC")),
+    ("wall_time_s", pa.float64()),
+    ("cpu_time_s", pa.float64()),
+    ("peak_rss_mb", pa.float64()),
+    ("rows_in", pa.int64()),
+    ("rows_out", pa.int64()),
+    ("output_rows", pa.int64()),
+    ("bytes_written", pa.int64()),
+    ("files_written", pa.int64()),
+    ("output_files", pa.int64()),
+    ("input_versions", pa.string()),
+    ("profile", pa.string()),
+])
+
+_runs = []
+_runs_lock = threading.Lock()
+
+
+def read_input_versions(query: str, session=None) -> dict:
+    """Versão atual de cada tabela Delta lida pela query: {caminho: versão}"""
+    if session:
+        return {path: session.table(path).version() for path in session.resolve(query)[0]}
+    return {path: DeltaTable(path).version() for _, _, path in parse_refs(query) if DeltaTable.is_deltatable(path)}
+
+
+def _active_files(table_path: str) -> dict:
+    """Arquivos ativos da tabela Delta: {caminho: (bytes, linhas)}"""
+    if not DeltaTable.is_deltatable(table_path):
+        return {}
+    actions = DeltaTable(table_path).get_add_actions().select(["path", "size_bytes", "num_records"]).to_pylist()
+    return {action["path"]: (action["size_bytes"], action["num_records"] or 0) for action in actions}
+
+
+def _scanned_rows(node: dict) -> int:
+    """Linhas lidas pelos operadores de scan do plano (folhas TABLE_SCAN do profile do DuckDB)."""
+    if node.get("operator_type") == "TABLE_SCAN":
+        return node.get("operator_cardinality", 0)
+    return sum(_scanned_rows(child) for child in node.get("children", []))
+
+
+class RunProfiler:
+    """Mede uma extração ou modelo e registra o resultado na lista de execuções da pipeline.
+
+    Tempo de CPU e pico de memória (RSS) são do processo inteiro durante a execução: com
+    modelos rodando em paralelo os valores incluem o trabalho dos modelos simultâneos.
+
+    Uso:
+        with RunProfiler("silver", "customers_silver", table_path) as run:
+            run.attach(conn)  # habilita o EXPLAIN ANALYZE (profile JSON) da query no DuckDB
+            ...               # query principal
+            run.detach(conn)  # consultas auxiliares seguintes não entram no profile
+    """
+
+    def __init__(self, layer: str, name: str, table_path: str, input_versions: dict | None = None):
+        self.layer = layer
+        self.name = name
+        self.table_path = table_path
+        self.input_versions = input_versions or {}
+        self.profile_paths = []
+        self._profile_lock = threading.Lock()
+
+    def attach(self, conn):
+        """Grava o profile (JSON) da última query executada na conexão/cursor até o detach.
+
+        Cada conexão/cursor usa um arquivo próprio (ex.: faixas gravadas em paralelo); as contagens
+        de linhas da execução somam os profiles de todas.
+        """
+        if not PROFILING_ENABLED:
+            return
+        fd, profile_path = tempfile.mkstemp(prefix=f"{self.name}_", suffix=".json")
+        os.close(fd)
+        with self._profile_lock:
+            self.profile_paths.append(profile_path)
+        conn.execute("PRAGMA enable_profiling = 'json'")
+        conn.execute(f"SET profiling_output = '{profile_path}'")
+
+    def detach(self, conn):
+        """Desabilita o profile na conexão/cursor: o arquivo mantém o profile da última query antes do detach."""
+        if PROFILING_ENABLED:
+            conn.execute("PRAGMA disable_profiling")
+
+    def _sample_rss(self):
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+    def __enter__(self):
+        if not PROFILING_ENABLED:
+            return self
+        self._files_before = _active_files(self.table_path)
+        self._process = psutil.Process()
+        self.peak_rss = self._process.memory_info().rss
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+        self._sampler.start()
+        self.started_at = datetime.now(timezone.utc)
+        self._cpu_start = sum(self._process.cpu_times()[:2])
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not PROFILING_ENABLED:
+            return False
+        wall_time = time.perf_counter() - self._wall_start
+        cpu_time = sum(self._process.cpu_times()[:2]) - self._cpu_start
+        self._stop.set()
+        self._sampler.join()
+
+        profiles = []
+        for profile_path in self.profile_paths:
+            if os.path.getsize(profile_path):
+                with open(profile_path, "r", encoding="utf-8") as file:
+                    profiles.append(json.load(file))
+            os.remove(profile_path)
+
+        files_after = _active_files(self.table_path)
+        written = [files_after[path] for path in files_after.keys() - self._files_before.keys()]
+        record = {
+            "layer": self.layer,
+            "model": self.name,
+            "status": "error" if exc_type else "success",
+            "started_at": self.started_at,
+            "wall_time_s": wall_time,
+            "cpu_time_s": cpu_time,
+            "peak_rss_mb": self.peak_rss / 1024 ** 2,
+            "rows_in": sum(_scanned_rows(profile) for profile in profiles) if profiles else None,
+            "rows_out": sum(profile.get("rows_returned", 0) for profile in profiles) if profiles else None,
+            "output_rows": sum(rows for _, rows in files_after.values()),
+            "bytes_written": sum(size for size, _ in written),
+            "files_written": len(written),
+            "output_files": len(files_after),
+            "input_versions": json.dumps(self.input_versions, sort_keys=True),
+            "profile": json.dumps(profiles[0] if len(profiles) == 1 else profiles) if profiles else None,
+        }
+        with _runs_lock:
+            _runs.append(record)
+        return False
+
+
+def write_runs(metrics_path: str, run_id: str) -> int:
+    """Grava na tabela Delta de métricas as execuções registradas desde a última gravação."""
+    with _runs_lock:
+        runs = list(_runs)
+        _runs.clear()
+    if not runs:
+        return 0
+    data = pa.Table.from_pylist([{"run_id": run_id, **run} for run in runs], schema=METRICS_SCHEMA)
+    write_deltalake(metrics_path, data, mode="append")
+    return len(runs)
+
+
+def slowest_models_report(metrics_path: str, limit: int = 10, last_runs: int = 5):
+    """Ranking dos modelos mais lentos na última execução e tendência nas execuções anteriores.
+
+    Args:
+        metrics_path (str): Caminho da tabela Delta de métricas
+        limit (int): Quantidade de modelos no ranking
+        last_runs (int): Execuções anteriores usadas na média de comparação
+
+    Returns:
+        DataFrame: layer, model, wall_time_s, avg_previous_s, trend_pct, cpu_time_s, peak_rss_mb, rows_out, runs
+    """
+    with duckdb.connect() as conn:
+        conn.register("runs", DeltaTable(metrics_path).to_pyarrow_dataset())
+        return conn.execute("""
+            WITH ranked AS (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY layer, model ORDER BY started_at DESC) AS run_number
+                FROM runs
+                WHERE status = 'success'
+            ),
+            summary AS (
+                SELECT
+                    layer,
+                    model,
+                    MAX(wall_time_s) FILTER (WHERE run_number = 1) AS wall_time_s,
+                    AVG(wall_time_s) FILTER (WHERE run_number > 1) AS avg_previous_s,
+                    MAX(cpu_time_s) FILTER (WHERE run_number = 1) AS cpu_time_s,
+                    MAX(peak_rss_mb) FILTER (WHERE run_number = 1) AS peak_rss_mb,
+                    MAX(rows_out) FILTER (WHERE run_number = 1) AS rows_out,
+                    COUNT(*) AS runs
+                FROM ranked
+                WHERE run_number <= ? + 1
+                GROUP BY layer, model
+            )
+            SELECT
+                layer,
+                model,
+                ROUND(wall_time_s, 3) AS wall_time_s,
+                ROUND(avg_previous_s, 3) AS avg_previous_s,
+                ROUND(100 * (wall_time_s - avg_previous_s) / NULLIF(avg_previous_s, 0), 1) AS trend_pct,
+                ROUND(cpu_time_s, 3) AS cpu_time_s,
+                ROUND(peak_rss_mb, 1) AS peak_rss_mb,
+                rows_out,
+                runs
+            FROM summary
+            ORDER BY wall_time_s DESC
+            LIMIT ?
+        """, [last_runs, limit]).df()
+
+
+if __name__ == "__main__":
+    # python profiler.py [caminho_da_tabela_de_metricas] [limite]
+    metrics_path = sys.argv[1] if len(sys.argv) > 1 else "../tests/metrics/pipeline_runs"
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print(slowest_models_report(metrics_path, limit).to_string(index=False))
@@ -0,0 +1,211 @@
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+import duckdb
+import pyarrow as pa
+from deltalake import DeltaTable, write_deltalake
+from dag import run_pool, threads_per_worker
+
+# Configuração do logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# regras de qualidade por tabela: {nome da regra: expressão SQL que toda linha deve atender}.
+# linhas em que a expressão é falsa ou NULL contam como violação
+QUALITY_RULES = {
+    "customers_bronze": {
+        "customer_id_not_null": "customer_id IS NOT NULL",
+        "customer_state_uf": "length(customer_state) = 2",
+    },
+    "geolocation_bronze": {
+        # limites aproximados do território brasileiro
+        "geolocation_lat_brasil": "geolocation_lat BETWEEN -34 AND 6",
+        "geolocation_lng_brasil": "geolocation_lng BETWEEN -74 AND -34",
+    },
+    "order_items_bronze": {
+        "price_positive": "price > 0",
+        "freight_value_not_negative": "freight_value >= 0",
+    },
+    "payments_bronze": {
+        "payment_value_not_negative": "payment_value >= 0",
+        "payment_installments_not_negative": "payment_installments >= 0",
+    },
+    "reviews_bronze": {
+        "review_score_1_5": "review_score BETWEEN 1 AND 5",
+        "review_creation_date_not_null": "review_creation_date IS NOT NULL",
+        "review_answer_timestamp_not_null": "review_answer_timestamp IS NOT NULL",
+    },
+    "orders_bronze": {
+        "order_status_valid": "order_status IN ('created', 'approved', 'invoiced', 'processing', 'shipped', 'delivered', 'unavailable', 'canceled')",
+        "approved_after_purchase": "order_approved_at IS NULL OR order_approved_at >= order_purchase_timestamp",
+        "delivered_has_delivery_date": "order_status <> 'delivered' OR order_delivered_customer_date IS NOT NULL",
+    },
+    "products_bronze": {
+        "product_category_name_not_null": "product_category_name IS NOT NULL",
+        "product_weight_g_not_negative": "product_weight_g >= 0",
+    },
+    "sellers_bronze": {
+        "seller_state_uf": "length(seller_state) = 2",
+    },
+    "leads_qualified_bronze": {
+        "first_contact_date_not_null": "first_contact_date IS NOT NULL",
+    },
+    "leads_closed_bronze": {
+        "seller_id_not_null": "seller_id IS NOT NULL",
+    },
+}
+
+# chaves que não podem ter valores nulos ou repetidos (verificadas na mesma leitura)
+QUALITY_UNIQUE_KEYS = {
+    "customers_bronze": ["customer_id"],
+    "order_items_bronze": ["order_id", "order_item_id"],
+    "payments_bronze": ["order_id", "payment_sequential"],
+    "orders_bronze": ["order_id"],
+    "products_bronze": ["product_id"],
+    "sellers_bronze": ["seller_id"],
+    "product_category_name_translation_bronze": ["product_category_name"],
+    "leads_qualified_bronze": ["mql_id"],
+    "leads_closed_bronze": ["mql_id"],
+}
+
+TOP_K = 5
+
+QUALITY_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("checked_at", pa.timestamp("us", tz="UTC")),
+    ("table_name", pa.string()),
+    ("table_version", pa.int64()),
+    ("row_count", pa.int64()),
+    ("check_type", pa.string()),  # 'column' (estatísticas) ou 'rule' (regra de qualidade)
+    ("name", pa.string()),        # coluna ou regra
+    ("null_count", pa.int64()),
+    ("min_value", pa.string()),
+    ("max_value", pa.string()),
+    ("approx_distinct", pa.int64()),
+    ("top_values", pa.string()),        # JSON: valores mais frequentes (aproximado)
+    ("length_histogram", pa.string()),  # JSON: {comprimento até (potência de 2): linhas}, colunas texto
+    ("expression", pa.string()),
+    ("failed_rows", pa.int64()),
+    ("passed", pa.bool_()),
+])
+
+
+def _quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def profile_query(schema: pa.Schema, rules: dict | None = None, unique_key: list | None = None, top_k: int = TOP_K) -> str:
+    """Query de agregação única (uma leitura da tabela `data`) com as estatísticas de todas as colunas e as regras."""
+    aggregates = ["COUNT(*) AS row_count"]
+    for i, field in enumerate(schema):
+        column = _quote(field.name)
+        aggregates += [
+            f"COUNT(*) FILTER (WHERE {column} IS NULL) AS c{i}_nulls",
+            f"CAST(MIN({column}) AS VARCHAR) AS c{i}_min",
+            f"CAST(MAX({column}) AS VARCHAR) AS c{i}_max",
+            f"approx_count_distinct({column}) AS c{i}_distinct",
+            f"list_transform(approx_top_k({column}, {top_k}), value -> CAST(value AS VARCHAR)) AS c{i}_top",
+        ]
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            # comprimentos agrupados em potências de 2 (0, 1, 2, 4, 8, ...)
+            aggregates.append(
+                f"histogram(CASE WHEN length({column}) <= 1 THEN length({column}) ELSE CAST(2 ** CEIL(log2(length({column}))) AS BIGINT) END) AS c{i}_lengths"
+            )
+    for j, expression in enumerate((rules or {}).values()):
+        aggregates.append(f"COUNT(*) FILTER (WHERE NOT COALESCE(({expression}), FALSE)) AS r{j}_failed")
+    if unique_key:
+        key = ", ".join(_quote(column) for column in unique_key)
+        key = key if len(unique_key) == 1 else f"({key})"
+        aggregates.append(f"COUNT(*) - COUNT(DISTINCT {key}) AS unique_failed")
+    return "SELECT\n    " + ",\n    ".join(aggregates) + "\nFROM data"
+
+
+def profile_table(table_path: str, table_name: str, rules: dict | None = None, unique_key: list | None = None, top_k: int = TOP_K, threads: int | None = None) -> list:
+    """Perfil das colunas e resultado das regras de qualidade de uma tabela Delta em uma única leitura.
+
+    Args:
+        table_path (str): Caminho da tabela Delta
+        table_name (str): Nome da tabela nos registros
+        rules (dict): {nome da regra: expressão SQL que toda linha deve atender}
+        unique_key (list): Colunas que identificam a linha (nulos e repetições são violações)
+        top_k (int): Quantidade de valores mais frequentes por coluna
+        threads (int): Threads do DuckDB
+
+    Returns:
+        list: Registros no formato de QUALITY_SCHEMA (sem run_id/checked_at), um por coluna e um por regra
+    """
+    dt = DeltaTable(table_path)
+    dataset = dt.to_pyarrow_dataset()
+    with duckdb.connect() as conn:
+        if threads:
+            conn.execute(f"SET threads = {threads}")
+        conn.register("data", dataset)
+        result = conn.execute(profile_query(dataset.schema, rules, unique_key, top_k))
+        names = [description[0] for description in result.description]
+        row = dict(zip(names, result.fetchone()))
+
+    base = {"table_name": table_name, "table_version": dt.version(), "row_count": row["row_count"]}
+    records = []
+    for i, field in enumerate(dataset.schema):
+        lengths = row.get(f"c{i}_lengths")
+        records.append({
+            **base,
+            "check_type": "column",
+            "name": field.name,
+            "null_count": row[f"c{i}_nulls"],
+            "min_value": row[f"c{i}_min"],
+            "max_value": row[f"c{i}_max"],
+            "approx_distinct": row[f"c{i}_distinct"],
+            "top_values": json.dumps(row[f"c{i}_top"], ensure_ascii=False) if row[f"c{i}_top"] is not None else None,
+            "length_histogram": json.dumps({str(k): v for k, v in sorted(lengths.items(), key=lambda item: item[0] if item[0] is not None else -1)}) if lengths is not None else None,
+        })
+
+    checks = [(name, expression, row[f"r{j}_failed"]) for j, (name, expression) in enumerate((rules or {}).items())]
+    if unique_key:
+        checks.append((f"unique_{'_'.join(unique_key)}", f"UNIQUE ({', '.join(unique_key)})", row["unique_failed"]))
+    for name, expression, failed in checks:
+        records.append({**base, "check_type": "rule", "name": name, "expression": expression, "failed_rows": failed, "passed": failed == 0})
+        if failed:
+            logger.warning(f"\033[31m[QUALITY]\033[0m '{table_name}': regra '{name}' violada em {failed} de {row['row_count']} linhas.")
+    return records
+
+
+def run_quality_checks(tables: dict, quality_path: str, run_id: str, max_workers: int = 4) -> list:
+    """Perfila as tabelas em paralelo (uma leitura por tabela) e grava o resultado na tabela Delta de qualidade.
+
+    Args:
+        tables (dict): {nome da tabela: caminho Delta}; tabelas inexistentes são ignoradas
+        quality_path (str): Caminho da tabela Delta de qualidade (append a cada execução)
+        run_id (str): Identificador da execução da pipeline
+        max_workers (int): Tabelas perfiladas ao mesmo tempo
+
+    Returns:
+        list: Registros gravados
+    """
+    tables = {name: path for name, path in tables.items() if DeltaTable.is_deltatable(path)}
+    records = []
+    lock = threading.Lock()
+    threads = threads_per_worker(max_workers)
+
+    def run_table(name):
+        try:
+            table_records = profile_table(tables[name], name, QUALITY_RULES.get(name), QUALITY_UNIQUE_KEYS.get(name), threads=threads)
+        except Exception as e:
+            logger.error(f"\033[31m[ERROR]\033[0m Erro ao perfilar '{name}': {str(e)}")
+            return False
+        with lock:
+            records.extend(table_records)
+        failed = sum(1 for record in table_records if record["check_type"] == "rule" and not record["passed"])
+        logger.info(f"\033[32m[OK]\033[0m Perfil de '{name}': {table_records[0]['row_count'] if table_records else 0} linhas, {failed} regras violadas.")
+        return True
+
+    # tamanho em disco como estimativa: as maiores tabelas começam primeiro
+    sizes = {name: sum(DeltaTable(path).get_add_actions().column("size_bytes").to_pylist()) for name, path in tables.items()}
+    run_pool(sizes, run_table, max_workers=max_workers)
+
+    if records:
+        checked_at = datetime.now(timezone.utc)
+        data = pa.Table.from_pylist([{"run_id": run_id, "checked_at": checked_at, **record} for record in records], schema=QUALITY_SCHEMA)
+        write_deltalake(quality_path, data, mode="append")
+    return records
@@ -0,0 +1,149 @@
+import os
+import csv
+
+# registro de schemas dos arquivos .csv da Olist: colunas (na ordem do arquivo) e tipos DuckDB.
+# a leitura usa os tipos fixos (sem inferência a cada execução) e o cabeçalho do arquivo é
+# comparado com o registro antes da extração. Alterações de colunas/tipos incrementam a versão.
+CSV_SCHEMAS = {
+    "olist_customers_dataset.csv": {
+        "version": 1,
+        "columns": {
+            "customer_id": "VARCHAR",
+            "customer_unique_id": "VARCHAR",
+            "customer_zip_code_prefix": "VARCHAR", # CEP mantém os zeros à esquerda
+            "customer_city": "VARCHAR",
+            "customer_state": "VARCHAR",
+        },
+    },
+    "olist_geolocation_dataset.csv": {
+        "version": 1,
+        "columns": {
+            "geolocation_zip_code_prefix": "VARCHAR",
+            "geolocation_lat": "DOUBLE",
+            "geolocation_lng": "DOUBLE",
+            "geolocation_city": "VARCHAR",
+            "geolocation_state": "VARCHAR",
+        },
+    },
+    "olist_order_items_dataset.csv": {
+        "version": 1,
+        "columns": {
+            "order_id": "VARCHAR",
+            "order_item_id": "INTEGER",
+            "product_id": "VARCHAR",
+            "seller_id": "VARCHAR",
+            "shipping_limit_date": "TIMESTAMP",
+            "price": "DOUBLE",
+            "freight_value": "DOUBLE",
+        },
+    },
+    "olist_order_payments_dataset.csv": {
+        "version": 1,
+        "columns": {
+            "order_id": "VARCHAR",
+            "payment_sequential": "INTEGER",
+            "payment_type": "VARCHAR",
+            "payment_installments": "INTEGER",
+            "payment_value": "DOUBLE",
+        },
+    },
+    "olist_order_reviews_dataset.csv": {
+        "version": 1,
+        "columns": {
+            "review_id": "VARCHAR",
+            "order_id": "VARCHAR",
+            "review_score": "INTEGER",
+            "review_comment_title": "VARCHAR",
+            "review_comment_message": "VARCHAR",
+            "review_creation_date": "TIMESTAMP",
+            "review_answer_timestamp": "TIMESTAMP",
+        },
+    },
+    "olist_orders_dataset.csv": {
+        "version": 1,
+        "columns": {
+            "order_id": "VARCHAR",
+            "customer_id": "VARCHAR",
+            "order_status": "VARCHAR",
+            "order_purchase_timestamp": "TIMESTAMP",
+            "order_approved_at": "TIMESTAMP",
+            "order_delivered_carrier_date": "TIMESTAMP",
+            "order_delivered_customer_date": "TIMESTAMP",
+            "order_estimated_delivery_date": "TIMESTAMP",
+        },
+    },
+    "olist_products_dataset.csv": {
+        "version": 1,
+        "columns": {
+            "product_id": "VARCHAR",
+            "product_category_name": "VARCHAR",
+            "product_name_lenght": "INTEGER", # grafia do arquivo original
+            "product_description_lenght": "INTEGER",
+            "product_photos_qty": "INTEGER",
+            "product_weight_g": "INTEGER",
+            "product_length_cm": "INTEGER",
+            "product_height_cm": "INTEGER",
+            "product_width_cm": "INTEGER",
+        },
+    },
+    "olist_sellers_dataset.csv": {
+        "version": 1,
+        "columns": {
+            "seller_id": "VARCHAR",
+            "seller_zip_code_prefix": "VARCHAR",
+            "seller_city": "VARCHAR",
+            "seller_state": "VARCHAR",
+        },
+    },
+    "product_category_name_translation.csv": {
+        "version": 1,
+        "columns": {
+            "product_category_name": "VARCHAR",
+            "product_category_name_english": "VARCHAR",
+        },
+    },
+}
+
+
+def get_csv_schema(source_path_csv: str) -> dict | None:
+    """Schema registrado para o arquivo (pelo nome do arquivo) ou None se não houver registro."""
+    return CSV_SCHEMAS.get(os.path.basename(source_path_csv))
+
+
+def read_csv_header(source_path_csv: str) -> list:
+    """Nomes das colunas na primeira linha do arquivo (ignora o BOM do UTF-8)."""
+    with open(source_path_csv, "r", encoding="utf-8-sig", newline="") as file:
+        return next(csv.reader(file), [])
+
+
+def check_schema_drift(source_path_csv: str, schema: dict):
+    """Compara o cabeçalho do arquivo com o schema registrado. Levanta ValueError se divergirem."""
+    expected = list(schema["columns"])
+    found = [column.strip() for column in read_csv_header(source_path_csv)]
+    if found == expected:
+        return
+    missing = [column for column in expected if column not in found]
+    unexpected = [column for column in found if column not in expected]
+    details = []
+    if missing:
+        details.append(f"colunas ausentes: {', '.join(missing)}")
+    if unexpected:
+        details.append(f"colunas novas: {', '.join(unexpected)}")
+    if not details:
+        details.append(f"ordem das colunas alterada: {', '.join(found)}")
+    raise ValueError(
+        f"Schema de '{os.path.basename(source_path_csv)}' diverge do registro (v{schema['version']}): {'; '.join(details)}"
+    )
+
+
+def csv_source(source_path_csv: str) -> str:
+    """Expressão DuckDB de leitura do .csv: tipos fixos do registro ou inferência para arquivos sem registro."""
+    schema = get_csv_schema(source_path_csv)
+    if schema is None:
+        return f"read_csv_auto('{source_path_csv}')"
+    check_schema_drift(source_path_csv, schema)
+    columns = ", ".join(f"'{name}': '{dtype}'" for name, dtype in schema["columns"].items())
+    return (
+        f"read_csv('{source_path_csv}', header = true, auto_detect = false, delim = ',', quote = '\"', "
+        f"escape = '\"', parallel = true, columns = {{{columns}}})"
+    )
@@ -0,0 +1,156 @@
+import os
+import re
+import logging
+import threading
+import duckdb
+from collections import Counter
+from deltalake import DeltaTable
+from models import parse_refs, replace_refs
+from sketches import register_sketch_macros
+
+# Configuração do logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _relation_name(path: str) -> str:
+    """Nome da relação no DuckDB para um caminho Delta: '../delta_lake/silver/x' -> 'silver__x'"""
+    parts = [p for p in path.replace("\\", "/").split("/") if p]
+    return re.sub(r"\W", "_", "__".join(parts[-2:]))
+
+
+class LayerSession:
+    """Sessão DuckDB compartilhada por todos os modelos de uma camada.
+
+    Abre uma única instância do DuckDB e carrega o log de cada tabela Delta de entrada uma
+    única vez (registrada como dataset Arrow). Entradas lidas por vários modelos ("quentes")
+    podem ser copiadas para a memória do DuckDB, evitando decodificar os mesmos Parquet a
+    cada modelo. Modelos materializados como view (`views`) não têm tabela Delta: viram views
+    do DuckDB, criadas sobre as entradas da view no cursor de cada modelo que as lê.
+
+    Uso:
+        with LayerSession(models) as session:
+            conn, query = session.prepare(model.sql)
+            ...
+            conn.close()
+    """
+
+    def __init__(self, models: dict, threads: int | None = None, memory_limit: str | None = None, cache_hot_inputs: bool = True, cache_max_bytes: int = 512 * 1024 ** 2, views: dict | None = None):
+        self.conn = duckdb.connect()
+        # um único pool de threads do DuckDB é compartilhado pelos modelos que rodam em paralelo
+        self.conn.execute(f"SET threads = {threads or os.cpu_count() or 1}")
+        if memory_limit:
+            self.conn.execute(f"SET memory_limit = '{memory_limit}'")
+        # macros usadas pelos modelos (ex.: hll_sketch), visíveis nos cursores de todos os modelos
+        register_sketch_macros(self.conn)
+
+        self.cache_hot_inputs = cache_hot_inputs
+        self.cache_max_bytes = cache_max_bytes
+        readers = Counter(path for model in models.values() for _, _, path in model.refs)
+        self.hot_inputs = {self._key(path) for path, count in readers.items() if count > 1}
+        self.views = views or {}  # tabela -> SQL dos modelos materializados como view
+
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self._tables = {}    # caminho -> DeltaTable
+        self._datasets = {}  # caminho -> dataset Arrow
+        self._cached = {}    # caminho -> tabela em memória no DuckDB
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normpath(os.path.abspath(path))
+
+    def _path_lock(self, key: str) -> threading.RLock:
+        with self._lock:
+            return self._path_locks.setdefault(key, threading.RLock())
+
+    def table(self, path: str) -> DeltaTable:
+        """DeltaTable da entrada, carregada uma única vez por sessão."""
+        key = self._key(path)
+        with self._path_lock(key):
+            if key not in self._tables:
+                self._tables[key] = DeltaTable(path)
+            return self._tables[key]
+
+    def _dataset(self, path: str):
+        key = self._key(path)
+        table = self.table(path)
+        with self._path_lock(key):
+            if key not in self._datasets:
+                self._datasets[key] = table.to_pyarrow_dataset()
+            return self._datasets[key]
+
+    def _cache(self, path: str) -> str | None:
+        """Copia uma entrada quente para a memória do DuckDB (se couber no limite) e retorna o nome da tabela."""
+        key = self._key(path)
+        if not self.cache_hot_inputs or key not in self.hot_inputs:
+            return None
+        dataset = self._dataset(path)
+        with self._path_lock(key):
+            if key not in self._cached:
+                size = sum(action["size_bytes"] for action in self.table(path).get_add_actions().to_pylist())
+                if size > self.cache_max_bytes:
+                    self._cached[key] = None
+                else:
+                    name = f"cache__{_relation_name(path)}"
+                    cursor = self.conn.cursor()
+                    cursor.register("input_dataset", dataset)
+                    cursor.execute(f"CREATE OR REPLACE TABLE {name} AS SELECT * FROM input_dataset")
+                    cursor.close()
+                    self._cached[key] = name
+                    logger.info(f"Entrada '{path}' carregada em memória ({size / 1024 ** 2:.1f} MB).")
+            return self._cached[key]
+
+    def resolve(self, query: str) -> tuple:
+        """Tabelas Delta lidas pela query, seguindo as views: ([caminhos], {tabela: SQL das views lidas})"""
+        paths, views = [], {}
+        for _, table, path in parse_refs(query):
+            if table not in self.views:
+                if path not in paths:
+                    paths.append(path)
+            elif table not in views:
+                views[table] = self.views[table]
+                view_paths, view_views = self.resolve(self.views[table])
+                paths += [p for p in view_paths if p not in paths]
+                views.update(view_views)
+        return paths, views
+
+    def _bind(self, cursor, query: str) -> str:
+        relations = {}
+        for _, table, path in parse_refs(query):
+            if table in self.views:
+                name = _relation_name(path)
+                cursor.execute(f"CREATE OR REPLACE TEMP VIEW {name} AS {self._bind(cursor, self.views[table])}")
+            else:
+                name = self._cache(path)
+                if name is None:
+                    name = _relation_name(path)
+                    cursor.register(name, self._dataset(path))
+            relations[path] = name
+        return replace_refs(query, relations)
+
+    def prepare(self, query: str):
+        """Abre um cursor com as entradas da query registradas e retorna (cursor, query reescrita)."""
+        cursor = self.conn.cursor()
+        return cursor, self._bind(cursor, query)
+
+    def invalidate(self, path: str):
+        """Descarta o que foi carregado de uma tabela após ela ser reescrita por um modelo da sessão."""
+        key = self._key(path)
+        with self._path_lock(key):
+            self._tables.pop(key, None)
+            self._datasets.pop(key, None)
+            name = self._cached.pop(key, None)
+        if name:
+            cursor = self.conn.cursor()
+            cursor.execute(f"DROP TABLE IF EXISTS {name}")
+            cursor.close()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
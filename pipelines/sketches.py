@@ -0,0 +1,43 @@
+# Sketches HyperLogLog para contagens distintas que podem ser somadas em qualquer nível de agregação.
+#
+# O sketch é uma lista ordenada de registradores codificados como índice * 64 + rho, apenas os
+# registradores não vazios e com o maior rho de cada índice (2^12 registradores, erro padrão ~1,6%).
+# Para juntar sketches basta concatenar as listas e manter o maior rho por índice; a estimativa
+# é feita no dashboard (app/services/sketches.py). Os sketches de uma tabela devem ser gerados
+# pela mesma versão do DuckDB (a função hash pode mudar entre versões).
+#
+# Uso nos modelos: hll_sketch(coluna) é uma agregação, como COUNT(DISTINCT coluna).
+
+HLL_PRECISION = 12  # bits do hash usados como índice do registrador
+
+_RHO_BITS = 64 - HLL_PRECISION
+_RHO_MASK = 2 ** _RHO_BITS - 1
+
+SKETCH_MACROS = [
+    # índice = bits mais altos do hash; rho = posição do primeiro bit 1 nos bits restantes
+    f"""
+    CREATE OR REPLACE MACRO _hll_encode(h, w) AS
+        CAST((h >> {_RHO_BITS}) * 64 + CASE WHEN w = 0 THEN {_RHO_BITS + 1} ELSE CAST(log2(w & -w) AS INTEGER) + 1 END AS INTEGER)
+    """,
+    f"""
+    CREATE OR REPLACE MACRO hll_register(value) AS
+        CASE WHEN value IS NOT NULL THEN _hll_encode(hash(value), CAST(hash(value) & {_RHO_MASK} AS BIGINT)) END
+    """,
+    # lista ordenada: o último registrador de cada índice tem o maior rho
+    # (list_zip completa a lista vazia com NULL: grupos só com nulos geram o sketch [])
+    """
+    CREATE OR REPLACE MACRO _hll_compact(registers) AS list_filter(list_transform(
+        list_filter(list_zip(registers, list_concat(registers[2:], [NULL])), pair -> pair[2] IS NULL OR pair[2] // 64 <> pair[1] // 64),
+        pair -> pair[1]
+    ), register -> register IS NOT NULL)
+    """,
+    """
+    CREATE OR REPLACE MACRO hll_sketch(value) AS _hll_compact(list_sort(list_distinct(list(hll_register(value)))))
+    """,
+]
+
+
+def register_sketch_macros(conn):
+    """Cria as macros de sketch (hll_sketch, hll_register) na conexão DuckDB."""
+    for macro in SKETCH_MACROS:
+        conn.execute(macro)
@@ -0,0 +1,51 @@
+import os
+import logging
+from datetime import datetime, timezone
+from deltalake import DeltaTable
+from state import read_state, write_state
+
+# Configuração do logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# geração publicada de uma camada: conjunto consistente de versões das tabelas lido pelo dashboard
+# (app/services/snapshot.py). Gravada ao fim da camada; durante a execução os leitores continuam
+# nas versões da geração anterior (leitura por time travel), então o vacuum deve reter os arquivos
+# por mais tempo que a vida das sessões do dashboard.
+#   {"generation": run_id, "published_at": ..., "tables": {tabela: versão}}
+SNAPSHOT_FILE = "_snapshot.json"
+
+
+def layer_versions(layer_path: str) -> dict:
+    """Versão atual de cada tabela Delta da camada ({tabela: versão})."""
+    versions = {}
+    for table_name in sorted(os.listdir(layer_path)):
+        table_path = os.path.join(layer_path, table_name)
+        if os.path.isdir(table_path) and DeltaTable.is_deltatable(table_path):
+            versions[table_name] = DeltaTable(table_path).version()
+    return versions
+
+
+def read_snapshot(layer_path: str) -> dict:
+    """Última geração publicada da camada ({} se nenhuma)."""
+    return read_state(os.path.join(layer_path, SNAPSHOT_FILE))
+
+
+def publish_snapshot(layer_path: str, generation: str) -> dict:
+    """Publica as versões atuais das tabelas da camada como uma nova geração (substituição atômica do arquivo).
+
+    Args:
+        layer_path (str): Diretório da camada (ex.: gold)
+        generation (str): Identificador da geração (run_id da pipeline)
+
+    Returns:
+        dict: Geração publicada
+    """
+    snapshot = {
+        "generation": generation,
+        "published_at": datetime.now(timezone.utc).isoformat(),
+        "tables": layer_versions(layer_path),
+    }
+    write_state(os.path.join(layer_path, SNAPSHOT_FILE), snapshot)
+    logger.info(f"\033[32m[OK]\033[0m Geração '{generation}' publicada com {len(snapshot['tables'])} tabelas.")
+    return snapshot
@@ -0,0 +1,36 @@
+import os
+import json
+import threading
+
+# um único lock por processo: os extratores/modelos podem rodar em threads paralelas
+_state_lock = threading.Lock()
+
+
+def read_state(state_path: str) -> dict:
+    """Lê o arquivo JSON de estado da pipeline. Retorna {} se ainda não existir."""
+    if not os.path.exists(state_path):
+        return {}
+    with open(state_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write(state_path: str, state: dict):
+    os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(state, file, indent=2, default=str)
+    os.replace(tmp_path, state_path)
+
+
+def write_state(state_path: str, state: dict):
+    """Substitui todo o arquivo de estado de forma atômica (leitores veem o arquivo antigo ou o novo, nunca um parcial)."""
+    with _state_lock:
+        _write(state_path, state)
+
+
+def update_state(state_path: str, key: str, value):
+    """Atualiza uma chave do arquivo de estado de forma atômica (escrita em arquivo temporário + rename)."""
+    with _state_lock:
+        state = read_state(state_path)
+        state[key] = value
+        _write(state_path, state)
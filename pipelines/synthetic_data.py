@@ -0,0 +1,385 @@
+import os
+import sys
+import shutil
+import sqlite3
+import logging
+import duckdb
+
+# Configuração do logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# volumes do dataset público da Olist (fator de escala 1)
+BASE_ROWS = {
+    "orders": 99_441,
+    "geolocation": 1_000_163,
+    "products": 32_951,
+    "sellers": 3_095,
+    "leads_qualified": 8_000,
+    "leads_closed": 842,
+}
+
+# UF, peso dos clientes, faixa de CEP (prefixo de 5 dígitos), capital e centroide aproximado
+STATES = [
+    ("SP", 41.9, 1000, 19999, "sao paulo", -23.55, -46.63),
+    ("RJ", 12.9, 20000, 28999, "rio de janeiro", -22.91, -43.17),
+    ("MG", 11.7, 30000, 39999, "belo horizonte", -19.92, -43.94),
+    ("RS", 5.5, 90000, 99999, "porto alegre", -30.03, -51.23),
+    ("PR", 5.1, 80000, 87999, "curitiba", -25.43, -49.27),
+    ("SC", 3.7, 88000, 89999, "florianopolis", -27.59, -48.55),
+    ("BA", 3.4, 40000, 48999, "salvador", -12.97, -38.50),
+    ("DF", 2.2, 70000, 72799, "brasilia", -15.79, -47.88),
+    ("ES", 2.0, 29000, 29999, "vitoria", -20.32, -40.34),
+    ("GO", 2.0, 72800, 76799, "goiania", -16.68, -49.25),
+    ("PE", 1.7, 50000, 56999, "recife", -8.05, -34.88),
+    ("CE", 1.3, 60000, 63999, "fortaleza", -3.73, -38.52),
+    ("PA", 1.0, 66000, 68899, "belem", -1.46, -48.50),
+    ("MT", 0.9, 78000, 78899, "cuiaba", -15.60, -56.10),
+    ("MA", 0.7, 65000, 65999, "sao luis", -2.53, -44.30),
+    ("MS", 0.7, 79000, 79999, "campo grande", -20.47, -54.62),
+    ("PB", 0.5, 58000, 58999, "joao pessoa", -7.12, -34.86),
+    ("PI", 0.5, 64000, 64999, "teresina", -5.09, -42.80),
+    ("RN", 0.5, 59000, 59999, "natal", -5.79, -35.21),
+    ("AL", 0.4, 57000, 57999, "maceio", -9.67, -35.74),
+    ("SE", 0.3, 49000, 49999, "aracaju", -10.91, -37.07),
+    ("TO", 0.3, 77000, 77999, "palmas", -10.18, -48.33),
+    ("RO", 0.3, 76800, 76999, "porto velho", -8.76, -63.90),
+    ("AM", 0.2, 69000, 69299, "manaus", -3.12, -60.02),
+    ("AC", 0.1, 69900, 69999, "rio branco", -9.97, -67.81),
+    ("AP", 0.1, 68900, 68999, "macapa", 0.03, -51.07),
+    ("RR", 0.05, 69300, 69399, "boa vista", 2.82, -60.67),
+]
+ZIP_PREFIXES = 19_000 # prefixos de CEP distintos no dataset original
+
+ORDER_STATUS = [("delivered", 97.0), ("shipped", 1.1), ("canceled", 0.6), ("unavailable", 0.6), ("invoiced", 0.3), ("processing", 0.3), ("created", 0.05), ("approved", 0.05)]
+PAYMENT_TYPES = [("credit_card", 73.9), ("boleto", 19.0), ("voucher", 5.6), ("debit_card", 1.5)]
+REVIEW_SCORES = [(5, 57.8), (4, 19.3), (1, 11.5), (3, 8.2), (2, 3.2)]
+LEAD_ORIGINS = [("organic_search", 28.7), ("paid_search", 19.9), ("social", 16.9), ("unknown", 14.1), ("direct_traffic", 6.2), ("email", 6.1), ("referral", 3.7), ("other", 2.1), ("display", 1.5), (None, 0.8)]
+BUSINESS_SEGMENTS = [("home_decor", 12.0), ("health_beauty", 11.0), ("car_accessories", 9.0), ("household_utilities", 8.0), ("construction_tools_house_garden", 8.0), ("audio_video_electronics", 7.0), ("computers", 4.0), ("pet", 4.0), ("food_supplement", 3.0), ("food_drink", 3.0), ("sports", 3.0), ("toys", 3.0), ("fashion_accessories", 2.0), ("bags_backpacks", 2.0), ("stationery", 2.0), ("other", 17.0)]
+LEAD_TYPES = [("online_medium", 39.0), ("online_big", 15.0), ("industry", 15.0), ("offline", 12.0), ("online_small", 9.0), ("online_beginner", 7.0), ("online_top", 2.0), ("other", 1.0)]
+BEHAVIOUR_PROFILES = [("cat", 48.0), ("eagle", 15.0), ("wolf", 11.0), ("shark", 3.0), (None, 23.0)]
+BUSINESS_TYPES = [("reseller", 70.0), ("manufacturer", 29.0), ("other", 1.0)]
+
+LEADS_QUALIFIED_COLUMNS = ["mql_id", "first_contact_date", "landing_page_id", "origin"]
+LEADS_CLOSED_COLUMNS = [
+    "mql_id", "seller_id", "sdr_id", "sr_id", "won_date", "business_segment", "lead_type", "lead_behaviour_profile",
+    "has_company", "has_gtin", "average_stock", "business_type", "declared_product_catalog_size", "declared_monthly_revenue",
+]
+
+
+def _weights_table(conn, name: str, values: list):
+    """Cria a tabela de uma distribuição categórica com o limite inferior acumulado de cada valor (0..1)."""
+    total = sum(weight for _, weight in values)
+    conn.execute(f"CREATE OR REPLACE TEMP TABLE {name} (value VARCHAR, lower DOUBLE)")
+    lower = 0.0
+    for value, weight in values:
+        conn.execute(f"INSERT INTO {name} VALUES (?, ?)", [None if value is None else str(value), lower])
+        lower += weight / total
+
+
+def _pick(table: str, u: str) -> str:
+    """Expressão SQL que sorteia um valor da distribuição `table` a partir do número uniforme `u`."""
+    return f"(SELECT value FROM {table} WHERE lower <= {u} ORDER BY lower DESC LIMIT 1)"
+
+
+def _copy_csv(conn, query: str, path: str) -> int:
+    conn.execute(f"COPY ({query}) TO '{path}' (HEADER, DELIMITER ',')")
+    return conn.execute(f"SELECT COUNT(*) FROM read_csv('{path}', header = true, all_varchar = true)").fetchone()[0]
+
+
+def _write_sqlite(conn, db_path: str, table: str, columns: list, query: str, batch_rows: int = 50_000):
+    """Grava o resultado da query em uma tabela do banco SQLite (leads)."""
+    result = conn.execute(query)
+    with sqlite3.connect(db_path) as sqlite_conn:
+        sqlite_conn.execute(f"DROP TABLE IF EXISTS {table}")
+        sqlite_conn.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+        while rows := result.fetchmany(batch_rows):
+            sqlite_conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' for _ in columns)})", rows)
+
+
+def generate_dataset(output_path: str, scale_factor: float = 1.0, source_path: str = "../data", seed: int = 42) -> dict:
+    """Gera os .csv e o banco olist.sqlite da Olist em um fator de escala (1 = volume do dataset público).
+
+    Os dados seguem o schema original e são referencialmente consistentes (pedidos -> clientes,
+    itens -> produtos/vendedores, pagamentos e avaliações -> pedidos, CEPs -> geolocalização),
+    com distribuições assimétricas como as reais: concentração de clientes em SP/RJ/MG, poucos
+    vendedores e produtos concentrando a maior parte das vendas e crescimento dos pedidos no tempo.
+    Produtos, vendedores e a tradução de categorias partem dos arquivos reais em `source_path`.
+    A geração é determinística para o mesmo `seed` (números aleatórios derivados de hash).
+
+    Args:
+        output_path (str): Diretório de saída
+        scale_factor (float): Fator de escala dos volumes (ex.: 1, 10, 100)
+        source_path (str): Diretório com os .csv reais de produtos, vendedores e tradução
+        seed (int): Semente da geração
+
+    Returns:
+        dict: Quantidade de linhas gerada por arquivo/tabela
+    """
+    os.makedirs(output_path, exist_ok=True)
+    rows = {name: max(1, round(count * scale_factor)) for name, count in BASE_ROWS.items()}
+    counts = {}
+
+    with duckdb.connect() as conn:
+        # número uniforme em [0, 1) determinístico a partir de uma chave e de um "sal"
+        conn.execute(f"CREATE MACRO rnd(key, salt) AS (hash(key, salt, {int(seed)}) % 1000000007) / 1000000007.0")
+        # aproximação da normal padrão (Box-Muller)
+        conn.execute("CREATE MACRO randn(key, salt) AS sqrt(-2 * ln(greatest(rnd(key, salt || '_a'), 1e-9))) * cos(2 * pi() * rnd(key, salt || '_b'))")
+
+        for name, values in [
+            ("order_status", ORDER_STATUS), ("payment_types", PAYMENT_TYPES), ("review_scores", REVIEW_SCORES),
+            ("lead_origins", LEAD_ORIGINS), ("business_segments", BUSINESS_SEGMENTS), ("lead_types", LEAD_TYPES),
+            ("behaviour_profiles", BEHAVIOUR_PROFILES), ("business_types", BUSINESS_TYPES),
+        ]:
+            _weights_table(conn, name, values)
+
+        conn.execute("CREATE TEMP TABLE states (uf VARCHAR, weight DOUBLE, cep_min INTEGER, cep_max INTEGER, capital VARCHAR, lat DOUBLE, lng DOUBLE)")
+        conn.executemany("INSERT INTO states VALUES (?, ?, ?, ?, ?, ?, ?)", STATES)
+        conn.execute("""
+            CREATE TEMP TABLE state_weights AS
+            SELECT uf, SUM(weight) OVER (ORDER BY weight DESC, uf) / SUM(weight) OVER () - weight / SUM(weight) OVER () AS lower
+            FROM states
+        """)
+
+        # produtos e vendedores: arquivos reais replicados (novos ids) até o volume da escala
+        conn.execute(f"""
+            CREATE TEMP TABLE products AS
+            SELECT * EXCLUDE (copy, source_rank) REPLACE (CASE WHEN copy = 0 THEN product_id ELSE md5(product_id || copy) END AS product_id)
+            FROM (
+                SELECT p.*, c.copy, ROW_NUMBER() OVER (ORDER BY c.copy, p.product_id) AS source_rank
+                FROM read_csv('{source_path}/olist_products_dataset.csv', header = true, all_varchar = true) AS p,
+                     range({int(scale_factor) + 1}) AS c(copy)
+            )
+            WHERE source_rank <= {rows['products']}
+        """)
+        conn.execute(f"""
+            CREATE TEMP TABLE sellers AS
+            SELECT * EXCLUDE (copy, source_rank) REPLACE (CASE WHEN copy = 0 THEN seller_id ELSE md5(seller_id || copy) END AS seller_id)
+            FROM (
+                SELECT s.*, c.copy, ROW_NUMBER() OVER (ORDER BY c.copy, s.seller_id) AS source_rank
+                FROM read_csv('{source_path}/olist_sellers_dataset.csv', header = true, all_varchar = true) AS s,
+                     range({int(scale_factor) + 1}) AS c(copy)
+            )
+            WHERE source_rank <= {rows['sellers']}
+        """)
+        # popularidade: o rank é embaralhado por hash e os sorteios usam potência de u (lei de potência)
+        conn.execute("CREATE TEMP TABLE product_ranks AS SELECT product_id, ROW_NUMBER() OVER (ORDER BY hash(product_id)) - 1 AS rank FROM products")
+        conn.execute("CREATE TEMP TABLE seller_ranks AS SELECT seller_id, ROW_NUMBER() OVER (ORDER BY hash(seller_id)) - 1 AS rank FROM sellers")
+        n_products = conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+        n_sellers = conn.execute("SELECT COUNT(*) FROM sellers").fetchone()[0]
+
+        # prefixos de CEP por UF (proporcionais ao peso) com a cidade tirada dos vendedores da UF
+        conn.execute(f"""
+            CREATE TEMP TABLE zips AS
+            WITH cities AS (
+                SELECT UPPER(seller_state) AS uf, list(DISTINCT LOWER(seller_city) ORDER BY LOWER(seller_city)) AS names
+                FROM sellers GROUP BY 1
+            ),
+            prefixes AS (
+                SELECT uf, cep_min, cep_max, capital, unnest(range(CAST(greatest(1, round(weight / 100 * {ZIP_PREFIXES})) AS BIGINT))) AS k,
+                       CAST(greatest(1, round(weight / 100 * {ZIP_PREFIXES})) AS BIGINT) AS n
+                FROM states
+            )
+            SELECT
+                p.uf,
+                p.k,
+                p.n,
+                lpad(CAST(p.cep_min + (p.k * (p.cep_max - p.cep_min)) // p.n AS VARCHAR), 5, '0') AS zip_code_prefix,
+                CASE WHEN p.k = 0 OR c.names IS NULL THEN p.capital ELSE c.names[1 + p.k % len(c.names)] END AS city
+            FROM prefixes AS p
+            LEFT JOIN cities AS c USING (uf)
+        """)
+
+        # pedidos (um cliente por pedido, ~3% de clientes recorrentes) com crescimento ao longo do período
+        conn.execute(f"""
+            CREATE TEMP TABLE orders AS
+            WITH picks AS (
+                SELECT
+                    i,
+                    (SELECT uf FROM state_weights WHERE lower <= rnd(i, 'state') ORDER BY lower DESC LIMIT 1) AS uf,
+                    TIMESTAMP '2016-09-04' + to_seconds(CAST(sqrt(rnd(i, 'purchase')) * 66355200 AS BIGINT)) AS purchase,
+                    {_pick('order_status', "rnd(i, 'status')")} AS status
+                FROM range({rows['orders']}) AS t(i)
+            ),
+            base AS (
+                SELECT picks.*, CAST(floor(rnd(i, 'zip') * zip_counts.n) AS BIGINT) AS zip_k
+                FROM picks
+                JOIN (SELECT DISTINCT uf, n FROM zips) AS zip_counts USING (uf)
+            )
+            SELECT
+                md5('order' || i) AS order_id,
+                md5('customer' || i) AS customer_id,
+                md5('unique' || CASE WHEN rnd(i, 'repeat') < 0.03 THEN CAST(floor(rnd(i, 'repeat_of') * i) AS BIGINT) ELSE i END) AS customer_unique_id,
+                base.uf,
+                z.zip_code_prefix,
+                z.city,
+                status,
+                date_trunc('second', purchase) AS order_purchase_timestamp,
+                CASE WHEN status <> 'created' THEN date_trunc('second', purchase + to_seconds(CAST(rnd(i, 'approved') * 86400 AS BIGINT))) END AS order_approved_at,
+                CASE WHEN status IN ('delivered', 'shipped') THEN date_trunc('second', purchase + to_seconds(CAST((1 + rnd(i, 'carrier') * 4) * 86400 AS BIGINT))) END AS order_delivered_carrier_date,
+                CASE WHEN status = 'delivered' THEN date_trunc('second', purchase + to_seconds(CAST((3 + exp(2.2 + 0.5 * randn(i, 'delivery'))) * 86400 AS BIGINT))) END AS order_delivered_customer_date,
+                date_trunc('day', purchase + to_days(CAST(15 + rnd(i, 'estimated') * 30 AS INTEGER))) AS order_estimated_delivery_date
+            FROM base
+            JOIN zips AS z ON z.uf = base.uf AND z.k = base.zip_k
+        """)
+
+        # itens: ~90% dos pedidos com 1 item, produtos e vendedores sorteados com concentração
+        conn.execute(f"""
+            CREATE TEMP TABLE order_items AS
+            WITH items AS (
+                SELECT
+                    order_id,
+                    order_purchase_timestamp,
+                    unnest(range(1, 1 + CASE
+                        WHEN rnd(order_id, 'items') < 0.90 THEN 1
+                        WHEN rnd(order_id, 'items') < 0.975 THEN 2
+                        WHEN rnd(order_id, 'items') < 0.99 THEN 3
+                        ELSE 4 + CAST(floor(rnd(order_id, 'many') * 3) AS INTEGER)
+                    END)) AS order_item_id
+                FROM orders
+            )
+            SELECT
+                i.order_id,
+                i.order_item_id,
+                p.product_id,
+                s.seller_id,
+                date_trunc('second', i.order_purchase_timestamp + to_days(6)) AS shipping_limit_date,
+                round(greatest(0.85, exp(4.3 + 0.9 * randn(i.order_id || i.order_item_id, 'price'))), 2) AS price,
+                round(greatest(0.0, 8 + 0.08 * exp(4.3 + 0.9 * randn(i.order_id || i.order_item_id, 'price')) + 12 * rnd(i.order_id || i.order_item_id, 'freight')), 2) AS freight_value
+            FROM items AS i
+            JOIN product_ranks AS p ON p.rank = CAST(floor(pow(rnd(i.order_id || i.order_item_id, 'product'), 2.5) * {n_products}) AS BIGINT)
+            JOIN seller_ranks AS s ON s.rank = CAST(floor(pow(rnd(i.order_id || i.order_item_id, 'seller'), 3) * {n_sellers}) AS BIGINT)
+        """)
+
+        # pagamentos: valor do pedido, ~3% dividido entre voucher e outro meio de pagamento
+        conn.execute(f"""
+            CREATE TEMP TABLE payments AS
+            WITH totals AS (
+                SELECT order_id, SUM(price + freight_value) AS total, rnd(order_id, 'split') < 0.03 AS split
+                FROM order_items GROUP BY order_id
+            ),
+            payments AS (
+                SELECT order_id, total, split, unnest(range(1, CASE WHEN split THEN 3 ELSE 2 END)) AS payment_sequential
+                FROM totals
+            )
+            SELECT
+                order_id,
+                payment_sequential,
+                payment_type,
+                CASE WHEN payment_type = 'credit_card' THEN 1 + CAST(floor(pow(rnd(order_id, 'installments'), 2) * 10) AS INTEGER) ELSE 1 END AS payment_installments,
+                round(CASE
+                    WHEN NOT split THEN total
+                    WHEN payment_sequential = 1 THEN total * 0.3
+                    ELSE total * 0.7
+                END, 2) AS payment_value
+            FROM (
+                SELECT *, CASE WHEN split AND payment_sequential = 1 THEN 'voucher' ELSE {_pick('payment_types', "rnd(order_id, 'payment')")} END AS payment_type
+                FROM payments
+            )
+        """)
+
+        # avaliações: ~99% dos pedidos, criadas após a entrega (ou a data estimada)
+        conn.execute(f"""
+            CREATE TEMP TABLE reviews AS
+            SELECT
+                md5('review' || order_id) AS review_id,
+                order_id,
+                CAST({_pick('review_scores', "rnd(order_id, 'score')")} AS INTEGER) AS review_score,
+                CASE WHEN rnd(order_id, 'title') < 0.12 THEN 'recomendo' END AS review_comment_title,
+                CASE WHEN rnd(order_id, 'message') < 0.41 THEN 'produto chegou dentro do prazo' END AS review_comment_message,
+                date_trunc('day', coalesce(order_delivered_customer_date, order_estimated_delivery_date) + to_days(1)) AS review_creation_date,
+                date_trunc('second', coalesce(order_delivered_customer_date, order_estimated_delivery_date) + to_seconds(CAST((1 + rnd(order_id, 'answer') * 4) * 86400 AS BIGINT))) AS review_answer_timestamp
+            FROM orders
+            WHERE rnd(order_id, 'reviewed') < 0.992
+        """)
+
+        # geolocalização: várias coordenadas por prefixo, cobrindo os CEPs de clientes e vendedores
+        conn.execute(f"""
+            CREATE TEMP TABLE geolocation AS
+            WITH geo_zips AS (
+                SELECT ROW_NUMBER() OVER (ORDER BY zip_code_prefix, uf) - 1 AS zip_rank, *
+                FROM (
+                    SELECT zip_code_prefix, uf, city FROM zips
+                    UNION
+                    SELECT lpad(seller_zip_code_prefix, 5, '0'), UPPER(seller_state), LOWER(seller_city) FROM sellers
+                )
+            ),
+            n AS (SELECT COUNT(*) AS total FROM geo_zips)
+            SELECT
+                z.zip_code_prefix AS geolocation_zip_code_prefix,
+                round(s.lat + (rnd(i, 'lat') - 0.5) * 3, 6) AS geolocation_lat,
+                round(s.lng + (rnd(i, 'lng') - 0.5) * 3, 6) AS geolocation_lng,
+                z.city AS geolocation_city,
+                z.uf AS geolocation_state
+            FROM (
+                SELECT i, CASE WHEN i < n.total THEN i ELSE CAST(floor(rnd(i, 'geo_zip') * n.total) AS BIGINT) END AS zip_rank
+                FROM range({rows['geolocation']}) AS t(i) CROSS JOIN n
+            ) AS g
+            JOIN geo_zips AS z ON z.zip_rank = g.zip_rank
+            JOIN states AS s ON s.uf = z.uf
+        """)
+
+        # leads do funil de marketing; ~10% dos leads qualificados são fechados
+        conn.execute(f"""
+            CREATE TEMP TABLE leads_qualified AS
+            SELECT
+                md5('mql' || i) AS mql_id,
+                strftime(DATE '2017-06-14' + CAST(floor(rnd(i, 'contact') * 351) AS INTEGER), '%Y-%m-%d') AS first_contact_date,
+                md5('landing_page' || CAST(floor(pow(rnd(i, 'landing'), 2) * 495) AS INTEGER)) AS landing_page_id,
+                {_pick('lead_origins', "rnd(i, 'origin')")} AS origin
+            FROM range({rows['leads_qualified']}) AS t(i)
+        """)
+        conn.execute(f"""
+            CREATE TEMP TABLE leads_closed AS
+            SELECT
+                mql_id,
+                md5('lead_seller' || mql_id) AS seller_id,
+                md5('sdr' || CAST(floor(rnd(mql_id, 'sdr') * 32) AS INTEGER)) AS sdr_id,
+                md5('sr' || CAST(floor(rnd(mql_id, 'sr') * 22) AS INTEGER)) AS sr_id,
+                strftime(CAST(first_contact_date AS DATE) + to_seconds(CAST(exp(2.5 + randn(mql_id, 'won')) * 86400 AS BIGINT)), '%Y-%m-%d %H:%M:%S') AS won_date,
+                {_pick('business_segments', "rnd(mql_id, 'segment')")} AS business_segment,
+                {_pick('lead_types', "rnd(mql_id, 'lead_type')")} AS lead_type,
+                {_pick('behaviour_profiles', "rnd(mql_id, 'behaviour')")} AS lead_behaviour_profile,
+                CASE WHEN rnd(mql_id, 'company') < 0.09 THEN CAST(rnd(mql_id, 'has_company') < 0.9 AS INTEGER) END AS has_company,
+                CASE WHEN rnd(mql_id, 'gtin') < 0.09 THEN CAST(rnd(mql_id, 'has_gtin') < 0.8 AS INTEGER) END AS has_gtin,
+                CASE WHEN rnd(mql_id, 'stock') < 0.08 THEN ['1-5', '5-20', '20-50', '50-200', '200+', 'unknown'][1 + CAST(floor(rnd(mql_id, 'stock_range') * 6) AS INTEGER)] END AS average_stock,
+                {_pick('business_types', "rnd(mql_id, 'business_type')")} AS business_type,
+                CASE WHEN rnd(mql_id, 'catalog') < 0.08 THEN round(exp(4 + randn(mql_id, 'catalog_size')), 0) END AS declared_product_catalog_size,
+                CASE WHEN rnd(mql_id, 'revenue') < 0.06 THEN round(exp(11 + randn(mql_id, 'revenue_value')), 0) ELSE 0.0 END AS declared_monthly_revenue
+            FROM leads_qualified
+            WHERE rnd(mql_id, 'closed') < {BASE_ROWS['leads_closed'] / BASE_ROWS['leads_qualified']}
+        """)
+
+        files = {
+            "olist_customers_dataset.csv": "SELECT customer_id, customer_unique_id, zip_code_prefix AS customer_zip_code_prefix, city AS customer_city, uf AS customer_state FROM orders",
+            "olist_geolocation_dataset.csv": "SELECT * FROM geolocation",
+            "olist_orders_dataset.csv": "SELECT order_id, customer_id, status AS order_status, order_purchase_timestamp, order_approved_at, order_delivered_carrier_date, order_delivered_customer_date, order_estimated_delivery_date FROM orders",
+            "olist_order_items_dataset.csv": "SELECT * FROM order_items",
+            "olist_order_payments_dataset.csv": "SELECT * FROM payments",
+            "olist_order_reviews_dataset.csv": "SELECT * FROM reviews",
+            "olist_products_dataset.csv": "SELECT * FROM products",
+            "olist_sellers_dataset.csv": "SELECT * FROM sellers",
+        }
+        for file_name, query in files.items():
+            counts[file_name] = _copy_csv(conn, query, os.path.join(output_path, file_name))
+            logger.info(f"\033[32m[OK]\033[0m {file_name}: {counts[file_name]} linhas")
+
+        shutil.copy(os.path.join(source_path, "product_category_name_translation.csv"), output_path)
+
+        db_path = os.path.join(output_path, "olist.sqlite")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        for table, columns in [("leads_qualified", LEADS_QUALIFIED_COLUMNS), ("leads_closed", LEADS_CLOSED_COLUMNS)]:
+            _write_sqlite(conn, db_path, table, columns, f"SELECT {', '.join(columns)} FROM {table}")
+            counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            logger.info(f"\033[32m[OK]\033[0m olist.sqlite/{table}: {counts[table]} linhas")
+
+    return counts
+
+
+if __name__ == "__main__":
+    # python synthetic_data.py <diretorio_de_saida> [fator_de_escala] [seed]
+    output_path = sys.argv[1]
+    scale_factor = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 42
+    generate_dataset(output_path, scale_factor, seed=seed)
@@ -1,32 +1,111 @@
 import os
+import json
+import hashlib
 import logging
 import duckdb
-from deltalake import write_deltalake
+from deltalake import DeltaTable
+from models import replace_refs
+from state import read_state, update_state
+from incremental import read_changes, merge_delta, CDF_CONFIGURATION
+from writer import write_query
+from sketches import register_sketch_macros
+from lineage import record_lineage
+from profiler import RunProfiler, read_input_versions
 
 # Configuração do logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-def transform_pipeline_sql(query: str, table_name: str, mode: str = "overwrite", silver_path_out: str = "../delta_lake/silver/"):
-    """Executa uma query SQL sobre um Delta Table e salva o resultado na camada Silver."""
+INCREMENTAL_STATE_FILE = "_incremental_state.json"
+
+def _incremental_state(query: str, partition_by: list | None, input_versions: dict) -> dict:
+    """Estado salvo após cada execução de um modelo incremental: definição do modelo + versões consumidas"""
+    definition = json.dumps({"query": query, "partition_by": partition_by or []}, sort_keys=True)
+    return {"definition": hashlib.sha256(definition.encode("utf-8")).hexdigest(), "inputs": input_versions}
+
+def _transform_incremental(conn, query: str, table_name: str, silver_path_delta: str, unique_key: list, state: dict, state_path: str) -> bool:
+    """Transforma apenas as linhas da bronze alteradas desde a última execução e aplica MERGE na tabela Silver.
+
+    Retorna False quando o modelo precisa ser reconstruído por completo (primeira execução,
+    SQL ou partições alteradas, mais de uma tabela de entrada ou origem reescrita).
+    """
+    last_state = read_state(state_path).get(table_name)
+    input_versions = state["inputs"]
+    if (
+        not last_state
+        or last_state.get("definition") != state["definition"]
+        or len(input_versions) != 1
+        or not DeltaTable.is_deltatable(silver_path_delta)
+    ):
+        return False
+
+    input_path, current_version = next(iter(input_versions.items()))
+    last_version = last_state["inputs"].get(input_path)
+    if last_version is None:
+        return False
+    if last_version == current_version:
+        logger.info(f"Nenhuma alteração na origem de '{table_name}'.")
+        return True
+
+    changes = read_changes(input_path, last_version, current_version, unique_key)
+    if changes is None:
+        return False
+
+    if changes.num_rows:
+        conn.register("bronze_changes", changes)
+        df_changes = conn.sql(replace_refs(query, {input_path: "bronze_changes"})).arrow()
+        merge_delta(silver_path_delta, df_changes, unique_key)
+    logger.info(f"MERGE incremental em '{table_name}': {changes.num_rows} linhas alteradas na origem.")
+    update_state(state_path, table_name, state)
+    return True
+
+def transform_pipeline_sql(query: str, table_name: str, mode: str = "overwrite", silver_path_out: str = "../delta_lake/silver/", threads: int | None = None, unique_key: list | None = None, session=None, partition_by: list | None = None) -> bool:
+    """Executa uma query SQL sobre um Delta Table e salva o resultado na camada Silver.
+
+    Com `unique_key` o modelo é materializado de forma incremental: somente as linhas da
+    bronze alteradas desde a última execução são transformadas e aplicadas com MERGE.
+    Com `session` (LayerSession) a query roda na sessão DuckDB compartilhada da camada.
+    `partition_by` define as colunas de partição da tabela (modelos incrementais particionados
+    aplicam as mudanças com MERGE; não há overwrite parcial na silver).
+    """
     
     silver_path = silver_path_out
     silver_path_delta = f"{silver_path}{table_name}"
+    state_path = os.path.join(silver_path, INCREMENTAL_STATE_FILE)
     os.makedirs(silver_path, exist_ok=True) # cria o diretório se não existir
 
     try:
-        with duckdb.connect() as conn:
+        # versões lidas antes da transformação: commits concorrentes na origem são reaplicados na próxima execução
+        input_versions = read_input_versions(query, session)
+        conn, session_query = session.prepare(query) if session else (duckdb.connect(), query)
+        with conn, RunProfiler("silver", table_name, silver_path_delta, input_versions) as run:
             logger.info(f"Executando transformação na tabela '{table_name}'")
-            df_transformed = conn.sql(query).arrow()
-            write_deltalake(silver_path_delta, df_transformed, mode=mode) # gravando o resultado em uma delta table
+            if threads and not session:
+                conn.execute(f"SET threads = {threads}") # limita o paralelismo interno quando há vários modelos rodando
+            if not session:
+                register_sketch_macros(conn) # a sessão já cria as macros na conexão compartilhada
+            run.attach(conn)
+
+            state = _incremental_state(query, partition_by, input_versions) if unique_key else None
+            if unique_key and _transform_incremental(conn, query, table_name, silver_path_delta, unique_key, state, state_path):
+                record_lineage(silver_path_delta, input_versions)
+                logger.info(f"\033[32m[OK]\033[0m Tabela '{table_name}' processada com sucesso.")
+                return True
+
+            write_query(conn, session_query, silver_path_delta, mode=mode, configuration=CDF_CONFIGURATION, partition_by=partition_by) # gravando o resultado em uma delta table
+            if unique_key:
+                update_state(state_path, table_name, state)
+            record_lineage(silver_path_delta, input_versions) # base para o refresh por partição da gold
             logger.info(f"\033[32m[OK]\033[0m Tabela '{table_name}' processada com sucesso.")
+            return True
 
     except Exception as e:
         logger.error(f"\033[31m[ERROR]\033[0m Erro inesperado ao processar '{table_name}': {str(e)}")
+        return False
 
     finally:
-        if conn:
-            conn.close()
+        if session:
+            session.invalidate(silver_path_delta) # modelos seguintes da camada devem ler a nova versão
 
 
 if __name__ == "__main__":
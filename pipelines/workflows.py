@@ -1,8 +1,21 @@
 from extract import extract_func_csv, extract_func_sqlite
 from transform import transform_pipeline_sql
 from gold_transform import gold_pipeline_sql
+from models import load_models, compile_model, compile_sql
+from dag import run_dag, run_pool, select_models, threads_per_worker
+from session import LayerSession
+from build_cache import model_fingerprint, is_up_to_date, record_fingerprint
+from catalog import catalog_version, record_catalog
+from snapshot import publish_snapshot
+from maintenance import optimize_layer
+from profiler import write_runs, slowest_models_report
+from quality import run_quality_checks
+from deltalake import DeltaTable
 from dotenv import load_dotenv
+import argparse
 import logging
+import psutil
+import uuid
 import os
 
 load_dotenv()
@@ -13,132 +26,248 @@ logger = logging.getLogger(__name__)
 
 # Configuration paths
 class Config:
+    DATA_PATH = "../data" # arquivos .csv e banco olist.sqlite de origem
     BRONZE_PATH_OUT = "../tests/bronze"
     SILVER_PATH_OUT = "../tests/silver/"
     GOLD_PATH_OUT = "../tests/gold/"
+    METRICS_PATH_OUT = "../tests/metrics/pipeline_runs" # tempo, memória e linhas de cada extração/modelo
+    QUALITY_PATH_OUT = "../tests/metrics/data_quality" # perfil das colunas e regras de qualidade das tabelas bronze
+    MODELS_PATH = "./models"
+    MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", os.cpu_count() or 1)) # modelos executados em paralelo
+    DUCKDB_THREADS = int(os.getenv("DUCKDB_THREADS", os.cpu_count() or 1)) # pool de threads compartilhado pela camada
+    DUCKDB_MEMORY_LIMIT = os.getenv("DUCKDB_MEMORY_LIMIT") # ex.: "8GB"
+    EXTRACT_MAX_WORKERS = int(os.getenv("EXTRACT_MAX_WORKERS", os.cpu_count() or 1)) # fontes extraídas em paralelo
+    EXTRACT_MEMORY_BUDGET = int(os.getenv("EXTRACT_MEMORY_BUDGET_MB", psutil.virtual_memory().total // 2 // 1024 ** 2)) * 1024 ** 2 # memória total das extrações simultâneas
+    EXTRACT_MEMORY_FACTOR = float(os.getenv("EXTRACT_MEMORY_FACTOR", 3)) # memória estimada por byte do arquivo de origem
+    EXTRACT_MIN_MEMORY = 256 * 1024 ** 2 # reserva mínima (e memory_limit mínimo do DuckDB) por extração
+    EXTRACT_RETRIES = int(os.getenv("EXTRACT_RETRIES", 2)) # novas tentativas por fonte em caso de erro
+    CACHE_HOT_INPUTS = os.getenv("CACHE_HOT_INPUTS", "true").lower() == "true" # entradas lidas por vários modelos ficam em memória
+    # a fonte de pedidos não tem coluna de alteração: a carga incremental relê (merge) os pedidos comprados
+    # nos últimos N dias antes do watermark para pegar mudanças de status/entrega; mudanças em pedidos
+    # mais antigos só entram em uma carga completa
+    ORDERS_LOOKBACK_DAYS = int(os.getenv("ORDERS_LOOKBACK_DAYS", 90))
+    VACUUM_RETENTION_HOURS = int(os.getenv("VACUUM_RETENTION_HOURS")) if os.getenv("VACUUM_RETENTION_HOURS") else None # None: não executa o vacuum; deve cobrir a duração das sessões do dashboard (leem versões fixadas)
+    # colunas de Z-order das tabelas bronze (silver e gold declaram `-- @zorder_by:` no modelo)
+    BRONZE_ZORDER_BY = {
+        "order_items_bronze": ["seller_id", "order_id"],
+        "customers_bronze": ["customer_zip_code_prefix"],
+        "sellers_bronze": ["seller_id"],
+        "orders_bronze": ["order_id"],
+    }
 
 class OlistPipeline:
 
-    def __init__(self):
-        pass
+    def __init__(self, incremental: bool = False, force: bool = False, select: list | None = None):
+        # incremental=True: as fontes com watermark carregam apenas as linhas novas na bronze
+        self.incremental = incremental
+        # force=True: ignora o cache de build e recalcula todos os modelos (inclusive por completo os com refresh por partição)
+        self.force = force
+        # identifica as métricas gravadas por esta execução da pipeline
+        self.run_id = uuid.uuid4().hex
+        # seletores de modelos (ex.: +gold_customers_segmented, orders_full_data_silver+, tag:vendas)
+        self.select = select
+
+    def _write_metrics(self):
+        """Persist the profiling records of the extractions/models executed so far"""
+        try:
+            write_runs(Config.METRICS_PATH_OUT, self.run_id)
+        except Exception as e:
+            logger.error(f"\033[31m[ERROR]\033[0m Erro ao gravar as métricas da execução: {str(e)}")
+
+    def _layer_session(self, models: dict) -> LayerSession:
+        """Sessão DuckDB única para os modelos da camada (entradas registradas uma vez)"""
+        all_models = load_models(Config.MODELS_PATH)
+        return LayerSession(
+            models,
+            threads=Config.DUCKDB_THREADS,
+            memory_limit=Config.DUCKDB_MEMORY_LIMIT,
+            cache_hot_inputs=Config.CACHE_HOT_INPUTS,
+            # views de qualquer camada podem ser lidas pelos modelos desta camada
+            views={name: compile_sql(model.sql, all_models) for name, model in all_models.items() if model.materialized == "view"},
+        )
+
+    def _run_cached(self, model, output_path: str, write_options: dict, session, run) -> bool:
+        """Executa o modelo apenas se o SQL, as versões das entradas ou as opções de escrita mudaram"""
+        if model.virtual:
+            logger.info(f"\033[32m[OK]\033[0m Modelo '{model.name}' materializado como {model.materialized} (sem gravação).")
+            return True
+        fingerprint = model_fingerprint(model, write_options, session)
+        if not self.force and is_up_to_date(output_path, model, fingerprint, f"{output_path}{model.name}"):
+            logger.info(f"[SKIP] Modelo '{model.name}' sem alterações desde a última execução.")
+            # tabelas gravadas antes do catálogo existir (ou alteradas por manutenção) são catalogadas sem recalcular
+            if catalog_version(output_path, model.name) != DeltaTable(f"{output_path}{model.name}").version():
+                record_catalog(output_path, model.name, model.config_list("domains"), threads=Config.DUCKDB_THREADS)
+            return True
+
+        success = run()
+        if success:
+            record_fingerprint(output_path, model, fingerprint)
+            # estatísticas e domínios dos filtros do dashboard, lidos sem consultar a tabela
+            record_catalog(output_path, model.name, model.config_list("domains"), threads=Config.DUCKDB_THREADS)
+        return success
+
+    def _layer_models(self, layer: str) -> dict:
+        """Models of the layer with the ephemeral models inlined, restricted to the selectors when the pipeline runs a selection"""
+        all_models = load_models(Config.MODELS_PATH)
+        models = {name: compile_model(model, all_models) for name, model in all_models.items() if model.layer == layer}
+        if self.select:
+            selected = select_models(all_models, self.select)
+            models = {name: model for name, model in models.items() if name in selected}
+            logger.info(f"Seleção {' '.join(self.select)}: {len(models)} modelos na camada {layer}")
+        return models
+
+    def _incremental_options(self, watermark_column: str, merge_keys: list | None = None, lookback_days: int | None = None) -> dict:
+        """Parâmetros de carga de uma fonte com watermark (no modo completo a tabela é reescrita e o watermark regravado)"""
+        if not self.incremental:
+            return {"mode": "overwrite", "watermark_column": watermark_column}
+        options = {
+            "mode": "merge" if merge_keys else "append",
+            "watermark_column": watermark_column,
+            "merge_keys": merge_keys,
+        }
+        if lookback_days:
+            options["lookback_days"] = lookback_days
+        return options
+
+    def _bronze_sources(self) -> dict:
+        """Bronze sources: {table name: (extraction function, parameters)}"""
+        csv = lambda file_name: {"source_path_csv": f"{Config.DATA_PATH}/{file_name}"}
+        sqlite = lambda table: {"db_path": f"{Config.DATA_PATH}/olist.sqlite", "sqlite_table": table}
+        return {
+            # extração de dados .csv para camada bronze
+            "customers_bronze": (extract_func_csv, csv("olist_customers_dataset.csv")),
+            "geolocation_bronze": (extract_func_csv, csv("olist_geolocation_dataset.csv")),
+            "order_items_bronze": (extract_func_csv, csv("olist_order_items_dataset.csv")),
+            "payments_bronze": (extract_func_csv, csv("olist_order_payments_dataset.csv")),
+            "reviews_bronze": (extract_func_csv, {**csv("olist_order_reviews_dataset.csv"), **self._incremental_options("review_answer_timestamp", ["review_id", "order_id"])}),
+            "orders_bronze": (extract_func_csv, {**csv("olist_orders_dataset.csv"), **self._incremental_options("order_purchase_timestamp", ["order_id"], Config.ORDERS_LOOKBACK_DAYS)}),
+            "products_bronze": (extract_func_csv, csv("olist_products_dataset.csv")),
+            "sellers_bronze": (extract_func_csv, csv("olist_sellers_dataset.csv")),
+            "product_category_name_translation_bronze": (extract_func_csv, csv("product_category_name_translation.csv")),
+            # extração de dados sqlite, tabelas: leads_closed e leads_qualified
+            "leads_qualified_bronze": (extract_func_sqlite, {**sqlite("leads_qualified"), **self._incremental_options("first_contact_date", ["mql_id"])}),
+            "leads_closed_bronze": (extract_func_sqlite, {**sqlite("leads_closed"), **self._incremental_options("rowid")}),
+        }
 
     def extract_bronze(self):
         """Extract all bronze layer data"""
         logger.info("Starting Bronze layer extraction")
 
-        # extração de dados .csv para camada bronze
-        extract_func_csv(source_path_csv="../data/olist_customers_dataset.csv", name_table="customers_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
-        extract_func_csv(source_path_csv="../data/olist_geolocation_dataset.csv", name_table="geolocation_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
-        extract_func_csv(source_path_csv="../data/olist_order_items_dataset.csv", name_table="order_items_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
-        extract_func_csv(source_path_csv="../data/olist_order_payments_dataset.csv", name_table="payments_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
-        extract_func_csv(source_path_csv="../data/olist_order_reviews_dataset.csv", name_table="reviews_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
-        extract_func_csv(source_path_csv="../data/olist_orders_dataset.csv", name_table="orders_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
-        extract_func_csv(source_path_csv="../data/olist_products_dataset.csv", name_table="products_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
-        extract_func_csv(source_path_csv="../data/olist_sellers_dataset.csv", name_table="sellers_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
-        extract_func_csv(source_path_csv="../data/product_category_name_translation.csv", name_table="product_category_name_translation_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
-
-        # extração de dados sqlite, tabelas: leads_closed e leads_qualified
-        extract_func_sqlite(db_path="../data/olist.sqlite", sqlite_table="leads_qualified", name_table="leads_qualified_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
-        extract_func_sqlite(db_path="../data/olist.sqlite", sqlite_table="leads_closed", name_table="leads_closed_bronze", bronze_delta_path=Config.BRONZE_PATH_OUT)
+        # as fontes são extraídas em paralelo: as maiores começam primeiro e só entram em
+        # execução enquanto a memória estimada das extrações em andamento couber no orçamento
+        sources = self._bronze_sources()
+        estimates = {}
+        for name_table, (_, params) in sources.items():
+            source_path = params.get("source_path_csv") or params["db_path"]
+            source_size = os.path.getsize(source_path) if os.path.exists(source_path) else 0
+            estimates[name_table] = max(int(source_size * Config.EXTRACT_MEMORY_FACTOR), Config.EXTRACT_MIN_MEMORY)
+        threads = threads_per_worker(Config.EXTRACT_MAX_WORKERS)
+
+        def run_source(name_table):
+            extract, params = sources[name_table]
+            return extract(
+                name_table=name_table, bronze_delta_path=Config.BRONZE_PATH_OUT, threads=threads,
+                memory_limit=f"{estimates[name_table] // 1024 ** 2}MB", **params,
+            )
 
+        results = run_pool(
+            estimates, run_source, max_workers=Config.EXTRACT_MAX_WORKERS,
+            memory_budget=Config.EXTRACT_MEMORY_BUDGET, retries=Config.EXTRACT_RETRIES,
+        )
+        failed = sorted(name for name, success in results.items() if not success)
+        if failed:
+            logger.error(f"\033[31m[ERROR]\033[0m Extração falhou após {Config.EXTRACT_RETRIES + 1} tentativas: {', '.join(failed)}")
+
+        self._write_metrics()
         logging.info("Bronze layer extraction completed")
 
     def transform_silver(self):
         """Transform data from bronze layer to silver layer"""
         logger.info("Starting Silver layer transformation")
 
-        def read_sql(file_path: str):
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content_sql = file.read()
-            return content_sql
-        
-        silver_sql_files = {
-            'customers_sql': read_sql('./models/silver/customers_silver.sql'),
-            'geolocation_sql': read_sql('./models/silver/geolocation_silver.sql'),
-            'leads_closed_sql': read_sql('./models/silver/leads_closed_silver.sql'),
-            'leads_qualified_sql': read_sql('./models/silver/leads_qualified_silver.sql'),
-            'order_items_sql': read_sql('./models/silver/order_items_silver.sql'),
-            'orders_full_data_sql': read_sql('./models/silver/orders_full_data_silver.sql'),
-            'orders_only_delivered_sql': read_sql('./models/silver/orders_only_delivered_silver.sql'),
-            'payments_sql': read_sql('./models/silver/payments_silver.sql'),
-            'products_sql': read_sql('./models/silver/products_silver.sql'),
-            'reviews_sql': read_sql('./models/silver/reviews_silver.sql'),
-            'sellers_sql': read_sql('./models/silver/sellers_silver.sql'),
-            'agg_customers_sql': read_sql('./models/silver/aggregated_customers_silver.sql'),
-            'agg_leads_sql': read_sql('./models/silver/aggregated_leads_silver.sql'),
-        }
+        # os modelos independentes rodam em paralelo, respeitando as dependências entre as tabelas
+        silver_models = self._layer_models("silver")
+        if not silver_models:
+            return
 
-        # transformação SQL na camada silver do respectivas tabelas
-        transform_pipeline_sql(query=silver_sql_files['customers_sql'], table_name="customers_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['geolocation_sql'], table_name="geolocation_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['leads_closed_sql'], table_name="leads_closed_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['leads_qualified_sql'], table_name="leads_qualified_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['order_items_sql'], table_name="order_items_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['orders_full_data_sql'], table_name="orders_full_data_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['orders_only_delivered_sql'], table_name="orders_only_delivered_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['payments_sql'], table_name="payments_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['products_sql'], table_name="products_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['reviews_sql'], table_name="reviews_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['sellers_sql'], table_name="sellers_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['agg_customers_sql'], table_name="aggregated_customers_silver", silver_path_out=Config.SILVER_PATH_OUT)
-        transform_pipeline_sql(query=silver_sql_files['agg_leads_sql'], table_name="aggregated_leads_silver", silver_path_out=Config.SILVER_PATH_OUT)
+        with self._layer_session(silver_models) as session:
+            def run_model(model):
+                unique_key = model.config_list("unique_key") if model.materialized == "incremental" else None
+                return self._run_cached(
+                    model, Config.SILVER_PATH_OUT, {"mode": "overwrite", **model.config}, session,
+                    lambda: transform_pipeline_sql(query=model.sql, table_name=model.name, silver_path_out=Config.SILVER_PATH_OUT, unique_key=unique_key, session=session, partition_by=model.config_list("partition_by")),
+                )
 
+            run_dag(silver_models, run_model, max_workers=Config.MAX_WORKERS)
 
+        self._write_metrics()
         logger.info("Silver layer transformation completed")
 
     def transform_gold(self):
         """Transform data from silver layer with business rules to gold layer"""
         logger.info("Starting Gold layer transformation")
 
-        def read_sql(file_path: str):
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content_sql = file.read()
-            return content_sql
-        
-        gold_sql_files = {
-            'agg_sellers_cancellation_rate_sql': read_sql('./models/gold/agg_sellers_cancellation_rate.sql'),
-            'agg_sellers_cancellation_rate_v2_sql': read_sql('./models/gold/agg_sellers_cancellation_rate_v2.sql'),
-            'freight_analysis_sql': read_sql('./models/gold/freight_analysis.sql'),
-            'geo_sales_sql': read_sql('./models/gold/geo_sales.sql'),
-            'gold_customers_segmented_sql': read_sql('./models/gold/gold_customers_segmented.sql'),
-            'gold_payment_performance_sql': read_sql('./models/gold/gold_payment_performance.sql'),
-            'gold_product_inventory_priority_sql': read_sql('./models/gold/gold_product_inventory_priority.sql'),
-            'gold_product_profitability_analysis_sql': read_sql('./models/gold/gold_product_profitability_analysis.sql'),
-            'gold_qualified_leads_priority_sql': read_sql('./models/gold/gold_qualified_leads_priority.sql'),
-            'gold_sellers_order_reviews_score_sql': read_sql('./models/gold/gold_sellers_order_reviews_score.sql'),
-            'gold_sellers_shipment_metrics_sql': read_sql('./models/gold/gold_sellers_shipment_metrics.sql'),
-            'regional_demand_supply_balance_sql': read_sql('./models/gold/regional_demand_supply_balance.sql'),
-            'sales_by_category_sql': read_sql('./models/gold/sales_by_category.sql'),
-            'seller_performance_sql': read_sql('./models/gold/seller_performance.sql'),
-        }
-
         # aplicando regra de negócios aos dados: silver -> gold layer
-        gold_pipeline_sql(query=gold_sql_files['agg_sellers_cancellation_rate_sql'], gold_table_name="agg_sellers_cancellation_rate", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['agg_sellers_cancellation_rate_v2_sql'], gold_table_name="agg_sellers_cancellation_rate_v2", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['freight_analysis_sql'], gold_table_name="freight_analysis", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['geo_sales_sql'], gold_table_name="geo_sales", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['gold_customers_segmented_sql'], gold_table_name="gold_customers_segmented", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['gold_payment_performance_sql'], gold_table_name="gold_payment_performance", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['gold_product_inventory_priority_sql'], gold_table_name="gold_product_inventory_priority", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['gold_product_profitability_analysis_sql'], gold_table_name="gold_product_profitability_analysis", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['gold_qualified_leads_priority_sql'], gold_table_name="gold_qualified_leads_priority", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['gold_sellers_order_reviews_score_sql'], gold_table_name="gold_sellers_order_reviews_score", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['gold_sellers_shipment_metrics_sql'], gold_table_name="gold_sellers_shipment_metrics", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['regional_demand_supply_balance_sql'], gold_table_name="regional_demand_supply_balance", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['sales_by_category_sql'], gold_table_name="sales_by_category", gold_path_out=Config.GOLD_PATH_OUT)
-        gold_pipeline_sql(query=gold_sql_files['seller_performance_sql'], gold_table_name="seller_performance", gold_path_out=Config.GOLD_PATH_OUT)
+        gold_models = self._layer_models("gold")
+        if not gold_models:
+            return
 
+        with self._layer_session(gold_models) as session:
+            def run_model(model):
+                refresh_source = model.config.get("refresh_source") if model.materialized == "incremental" else None
+                return self._run_cached(
+                    model, Config.GOLD_PATH_OUT, {"mode": "overwrite", **model.config}, session,
+                    lambda: gold_pipeline_sql(query=model.sql, gold_table_name=model.name, gold_path_out=Config.GOLD_PATH_OUT, session=session, partition_by=model.config_list("partition_by"), refresh_source=refresh_source, full_refresh=self.force),
+                )
+
+            run_dag(gold_models, run_model, max_workers=Config.MAX_WORKERS)
+
+        # o dashboard passa a ler as novas versões só agora, todas juntas (modelos com erro mantêm a versão anterior)
+        try:
+            publish_snapshot(Config.GOLD_PATH_OUT, self.run_id)
+        except Exception as e:
+            logger.error(f"\033[31m[ERROR]\033[0m Erro ao publicar a geração da camada gold: {str(e)}")
+
+        self._write_metrics()
         logging.info("Gold layer extraction completed")
 
+    def check_quality(self) -> list:
+        """Profile every bronze table and evaluate its quality rules in a single scan per table"""
+        logger.info("Starting bronze data quality checks")
+        tables = {name: os.path.join(Config.BRONZE_PATH_OUT, name) for name in self._bronze_sources()}
+        records = run_quality_checks(tables, Config.QUALITY_PATH_OUT, self.run_id, max_workers=Config.MAX_WORKERS)
+        logger.info("Bronze data quality checks completed")
+        return records
+
+    def optimize_tables(self) -> dict:
+        """Compact small files and Z-order every Delta table of the lake"""
+        logger.info("Starting Delta tables maintenance")
+
+        models = load_models(Config.MODELS_PATH)
+        report = {
+            "bronze": optimize_layer(Config.BRONZE_PATH_OUT, Config.BRONZE_ZORDER_BY, vacuum_retention_hours=Config.VACUUM_RETENTION_HOURS),
+        }
+        for layer, layer_path in [("silver", Config.SILVER_PATH_OUT), ("gold", Config.GOLD_PATH_OUT)]:
+            zorder_by = {name: model.config_list("zorder_by") for name, model in models.items() if model.layer == layer}
+            report[layer] = optimize_layer(layer_path, zorder_by, vacuum_retention_hours=Config.VACUUM_RETENTION_HOURS)
+
+        logger.info("Delta tables maintenance completed")
+        return report
 
     def run_pipeline(self, mode='full'):
         """Run the data pipeline
         
         Args:
-            mode: 'full', 'bronze', or 'silver'
+            mode: 'full', 'bronze', 'silver', 'gold', 'quality' or 'maintenance'
+
+        With selectors only the selected silver/gold models run; the bronze sources are not models
+        and are not extracted.
         """
         if mode in ['full', 'bronze']:
-            self.extract_bronze()
+            if self.select:
+                logger.info("Seleção de modelos: extração da camada bronze ignorada")
+            else:
+                self.extract_bronze()
             
         if mode in ['full', 'silver']:
             self.transform_silver()
@@ -146,6 +275,12 @@ class OlistPipeline:
         if mode in ['full', 'gold']:
             self.transform_gold()
 
+        if mode == 'quality':
+            self.check_quality()
+
+        if mode == 'maintenance':
+            self.optimize_tables()
+
 def run_bronze():
     """Run only bronze layer extraction"""
     OlistPipeline().run_pipeline('bronze')
@@ -162,7 +297,43 @@ def run_full():
     """Run complete pipeline"""
     OlistPipeline().run_pipeline('full')
 
-# if __name__ == "__main__":
-#     run_full()
+def run_incremental():
+    """Run complete pipeline loading only new rows into the bronze layer"""
+    OlistPipeline(incremental=True).run_pipeline('full')
+
+def run_metrics_report(limit: int = 10):
+    """Print the slowest models of the last run and their trend across previous runs"""
+    print(slowest_models_report(Config.METRICS_PATH_OUT, limit).to_string(index=False))
+
+def run_quality():
+    """Profile the bronze tables and write the data quality results"""
+    OlistPipeline().run_pipeline('quality')
+
+def run_maintenance():
+    """Compact and Z-order the Delta tables of all layers"""
+    OlistPipeline().run_pipeline('maintenance')
+
+if __name__ == "__main__":
+    # python workflows.py [modo] [--select +gold_customers_segmented orders_full_data_silver+ tag:vendas] [--force]
+    parser = argparse.ArgumentParser(description="Pipeline de dados Olist")
+    parser.add_argument("mode", nargs="?", default="full", choices=["full", "bronze", "silver", "gold", "quality", "maintenance"])
+    parser.add_argument("-s", "--select", nargs="+", help="modelos a executar: nome, +nome (com as dependências), nome+ (com os dependentes) ou tag:<tag>")
+    parser.add_argument("--force", action="store_true", help="ignora o cache de build e recalcula os modelos")
+    parser.add_argument("--incremental", action="store_true", help="carrega apenas as linhas novas na camada bronze")
+    parser.add_argument("--list", action="store_true", help="lista os modelos selecionados sem executar")
+    args = parser.parse_args()
+    if args.select:
+        try:
+            select_models(load_models(Config.MODELS_PATH), args.select)
+        except ValueError as e:
+            parser.error(str(e))
+
+    pipeline = OlistPipeline(incremental=args.incremental, force=args.force, select=args.select)
+    if args.list:
+        for layer in ["silver", "gold"]:
+            for name in pipeline._layer_models(layer):
+                print(f"{layer}.{name}")
+    else:
+        pipeline.run_pipeline(args.mode)
     
     
\ No newline at end of file
@@ -0,0 +1,79 @@
+import os
+import itertools
+import pyarrow as pa
+import pyarrow.compute as pc
+from deltalake import DeltaTable, Schema, write_deltalake
+
+# escrita em streaming: o resultado do DuckDB é entregue ao writer do Delta em lotes
+# (RecordBatchReader), mantendo o pico de memória constante independente do tamanho da tabela
+STREAMING_WRITES = os.getenv("DELTA_STREAMING_WRITES", "true").lower() == "true"
+WRITE_BATCH_ROWS = int(os.getenv("DELTA_WRITE_BATCH_ROWS", 100_000))
+TARGET_FILE_SIZE = int(os.getenv("DELTA_TARGET_FILE_SIZE", 128 * 1024 ** 2)) # bytes por arquivo Parquet
+
+
+def _max_value(column):
+    return pc.max(column).as_py() if len(column) else None
+
+
+def _schema_mode(table_path: str, mode: str, partition_by: list | None, predicate: str | None, schema: pa.Schema) -> str | None:
+    """Permite reescrever o layout quando um overwrite completo muda as colunas de partição ou o schema da tabela."""
+    if mode != "overwrite" or predicate or not DeltaTable.is_deltatable(table_path):
+        return None
+    dt = DeltaTable(table_path)
+    if dt.metadata().partition_columns != list(partition_by or []) or dt.schema() != Schema.from_pyarrow(schema):
+        return "overwrite"
+    return None
+
+
+def write_query(conn, query: str, table_path: str, mode: str = "overwrite", params: list | None = None, configuration: dict | None = None, track_column: str | None = None, skip_empty: bool = False, partition_by: list | None = None, predicate: str | None = None) -> dict | None:
+    """Executa a query no DuckDB e grava o resultado na tabela Delta.
+
+    Args:
+        conn: Conexão (ou cursor) DuckDB
+        query (str): Query SQL cujo resultado será gravado
+        table_path (str): Caminho da tabela Delta de destino
+        mode (str): Modo de escrita do write_deltalake ('overwrite', 'append', ...)
+        params (list): Parâmetros da query
+        configuration (dict): Propriedades da tabela Delta (aplicadas na criação)
+        track_column (str): Coluna cujo valor máximo é calculado durante a escrita (ex.: watermark)
+        skip_empty (bool): Não grava nada quando a query não retorna linhas
+        partition_by (list): Colunas de partição da tabela Delta
+        predicate (str): replaceWhere do overwrite, reescreve apenas as partições/linhas que atendem ao predicado
+
+    Returns:
+        dict: {"rows": linhas gravadas, "max": máximo de track_column} ou None se nada foi gravado
+    """
+    result = conn.execute(query, params or [])
+    stats = {"rows": 0, "max": None}
+
+    if not STREAMING_WRITES:
+        data = result.arrow()
+        if skip_empty and data.num_rows == 0:
+            return None
+        stats["rows"] = data.num_rows
+        if track_column in data.column_names:
+            stats["max"] = _max_value(data[track_column])
+    else:
+        reader = result.fetch_record_batch(WRITE_BATCH_ROWS)
+        batches = iter(reader)
+        first = next((batch for batch in batches if batch.num_rows), None)
+        if skip_empty and first is None:
+            return None
+
+        def tracked_batches():
+            for batch in itertools.chain([first] if first is not None else [], batches):
+                stats["rows"] += batch.num_rows
+                if track_column in batch.schema.names:
+                    value = _max_value(batch.column(track_column))
+                    if value is not None and (stats["max"] is None or value > stats["max"]):
+                        stats["max"] = value
+                yield batch
+
+        data = pa.RecordBatchReader.from_batches(reader.schema, tracked_batches())
+
+    write_deltalake(
+        table_path, data, mode=mode, configuration=configuration, target_file_size=TARGET_FILE_SIZE,
+        partition_by=partition_by or None, predicate=predicate,
+        schema_mode=_schema_mode(table_path, mode, partition_by, predicate, data.schema),
+    )
+    return stats